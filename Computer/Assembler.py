@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import re
+from typing import NamedTuple
+
+from . import Cpu
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+CPU = Cpu.CPU
+
+LABEL = re.compile(r"\s*([A-Za-z_][\w]*):")
+CONSTANT = re.compile(r"\s*([A-Za-z_][\w]*)\s*(?:=|\.equ\s|equ\s)\s*(.+)", re.IGNORECASE)
+TERM = re.compile(r"\s*([+-]?)\s*(\$[0-9A-Fa-f]+|%[01]+|\d+|'.'|\*|[A-Za-z_][\w]*)\s*")
+INDEXED = re.compile(r"(.+?)\s*,\s*([XYxy])")
+INDIRECT_X = re.compile(r"\(\s*(.+?)\s*,\s*[Xx]\s*\)")
+INDIRECT_Y = re.compile(r"\(\s*(.+?)\s*\)\s*,\s*[Yy]")
+INDIRECT = re.compile(r"\(\s*(.+?)\s*\)")
+PADDING = "$EA"
+'''Operand of a bare NOP: CPU runs NOP as two bytes, and a real 6502 runs the pair as two NOPs'''
+
+class AssemblyError(Exception):
+    """Raised for a source line that cannot be assembled, the message starts with file:line."""
+
+class Statement(NamedTuple):
+    file: str
+    line: int
+    label: str
+    op: str
+    '''Upper-case mnemonic, lower-case directive, "=" for a constant or None for a bare label'''
+    operand: str
+
+class Program(NamedTuple):
+    segments: tuple
+    '''(address, bytes) for each .org block, in source order'''
+    symbols: dict
+
+    def load(self, memory):
+        for address, data in self.segments:
+            memory.load(address, data)
+
+def opcodeTable() -> dict:
+    """Mnemonic -> {addressing mode: opcode}, from the opcodes CPU implements (Cpu.OPCODES)."""
+    table = {}
+    for entry in Cpu.OPCODES:
+        table.setdefault(entry.mnemonic, {})[entry.mode] = entry.value
+    return table
+
+def stripComment(text: str) -> str:
+    quoted = None
+    for index, char in enumerate(text):
+        if quoted:
+            quoted = None if char == quoted else quoted
+        elif char in "\"'":
+            quoted = char
+        elif char == ";":
+            return text[:index]
+    return text
+
+def splitOperands(text: str) -> list:
+    """Split a .byte/.word operand list on commas outside quotes."""
+    parts, current, quoted = [], "", None
+    for char in text:
+        if quoted:
+            quoted = None if char == quoted else quoted
+        elif char in "\"'":
+            quoted = char
+        elif char == ",":
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += char
+    parts.append(current.strip())
+    return parts
+
+def parse(text: str, file: str = "<source>") -> list:
+    """Turn source text into Statements, without resolving anything."""
+    statements = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = stripComment(line).rstrip()
+        label = None
+        constant = CONSTANT.match(line)
+        if constant:
+            statements.append(Statement(file, number, constant.group(1), "=", constant.group(2).strip()))
+            continue
+        match = LABEL.match(line)
+        if match:
+            label, line = match.group(1), line[match.end():]
+        op, _, operand = line.strip().partition(" ")
+        if op:
+            op = op.lower() if op.startswith(".") else op.upper()
+        statements.append(Statement(file, number, label, op or None, operand.strip()))
+    return [statement for statement in statements if statement.label or statement.op]
+
+def digest(*parts) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else str(part).encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+class Assembler:
+    """Two-pass assembler for the instructions CPU implements, using its INS_* opcodes.
+
+    Syntax: "label:", "name = expr", mnemonics with the usual operand forms (#imm, zp, zp,X, abs,Y,
+    (zp,X), (zp),Y, (abs), A or nothing for the accumulator ...), and the directives .org, .byte/.db,
+    .word/.dw and .include "file". Numbers are $hex, %binary, decimal or 'c', expressions add and
+    subtract them, symbols and * (the current address), and a leading < or > takes the low or high
+    byte. Operands known to fit in a byte use the zero page form when there is one.
+
+    Parsed files are cached by content hash and assembled programs by the hashes of their source and
+    every file it includes, in memory and, with cache_dir, on disk as JSON. Editing an include only
+    reassembles the programs that include it, and unchanged programs are not even parsed again."""
+    def __init__(self, cache_dir: str = None):
+        self.Opcodes = opcodeTable()
+        self.Units = {}
+        '''Hash of file name and content -> parsed Statements'''
+        self.Programs = {}
+        '''Program key -> (dependencies as (path, content hash) pairs, Program)'''
+        self.CacheDir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # --- Caching ---
+    def parseUnit(self, text: str, file: str) -> list:
+        key = digest(file, text)
+        if key not in self.Units:
+            self.Units[key] = parse(text, file)
+        return self.Units[key]
+
+    def assembleFile(self, path: str, origin: Word = 0x0000) -> Program:
+        """Assemble a source file, reusing the cached program if neither it nor its includes changed."""
+        with open(path) as file:
+            text = file.read()
+        return self.assemble(text, origin, path, os.path.dirname(os.path.abspath(path)))
+
+    def assemble(self, source: str, origin: Word = 0x0000, name: str = "<source>", directory: str = ".") -> Program:
+        """Assemble source text, .include paths are taken relative to directory."""
+        key = digest(origin, os.path.abspath(directory), source)
+        cached = self.Programs.get(key) or self.loadCached(key)
+        if cached is not None and all(self.fileDigest(path) == content for path, content in cached[0]):
+            self.Programs[key] = cached
+            return cached[1]
+        dependencies = []
+        statements = self.expand(self.parseUnit(source, name), directory, dependencies, [])
+        program = self.build(statements, origin)
+        self.Programs[key] = (tuple(dependencies), program)
+        self.storeCached(key, dependencies, program)
+        return program
+
+    def fileDigest(self, path: str) -> str:
+        try:
+            with open(path) as file:
+                return digest(file.read())
+        except OSError:
+            return None
+
+    def loadCached(self, key: str):
+        if self.CacheDir is None:
+            return None
+        try:
+            with open(os.path.join(self.CacheDir, key + ".json")) as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        program = Program(tuple((address, bytes.fromhex(data)) for address, data in entry["segments"]), entry["symbols"])
+        return tuple(map(tuple, entry["dependencies"])), program
+
+    def storeCached(self, key: str, dependencies: list, program: Program):
+        if self.CacheDir is None:
+            return
+        entry = {"dependencies": dependencies, "symbols": program.symbols,
+                 "segments": [[address, data.hex()] for address, data in program.segments]}
+        with open(os.path.join(self.CacheDir, key + ".json"), "w") as file:
+            json.dump(entry, file)
+
+    def expand(self, statements: list, directory: str, dependencies: list, including: list) -> list:
+        """Replace .include statements with the statements of the included files, recording them in dependencies."""
+        result = []
+        for statement in statements:
+            if statement.op != ".include":
+                result.append(statement)
+                continue
+            if statement.label:
+                result.append(statement._replace(op=None, operand=""))
+            path = os.path.join(directory, statement.operand.strip().strip("\"'"))
+            if path in including:
+                self.error(statement, f"{path} includes itself")
+            try:
+                with open(path) as file:
+                    text = file.read()
+            except OSError as error:
+                self.error(statement, f"cannot include {path}: {error.strerror}")
+            dependencies.append((path, digest(text)))
+            result += self.expand(self.parseUnit(text, path), os.path.dirname(path), dependencies, including + [path])
+        return result
+
+    # --- Assembly ---
+    def error(self, statement: Statement, message: str):
+        raise AssemblyError(f"{statement.file}:{statement.line}: {message}")
+
+    def value(self, statement: Statement, text: str, symbols: dict, address: Word, final: bool):
+        """Evaluate an expression, None if it uses a symbol not defined yet (unless final)."""
+        text = text.strip()
+        part = None
+        if text[:1] in "<>":
+            part, text = text[0], text[1:]
+        total, position = 0, 0
+        while position < len(text):
+            match = TERM.match(text, position)
+            if match is None or (position and not match.group(1)):
+                self.error(statement, f"bad expression: {text!r}")
+            sign, term = match.groups()
+            position = match.end()
+            if term[0] == "$":
+                number = int(term[1:], 16)
+            elif term[0] == "%":
+                number = int(term[1:], 2)
+            elif term[0] == "'":
+                number = ord(term[1])
+            elif term == "*":
+                number = address
+            elif term.isdigit():
+                number = int(term)
+            elif term in symbols:
+                number = symbols[term]
+            elif final:
+                self.error(statement, f"undefined symbol: {term}")
+            else:
+                return None
+            total += -number if sign == "-" else number
+        if not text:
+            self.error(statement, "missing operand")
+        if part == "<":
+            return total & 0xFF
+        return (total >> 8) & 0xFF if part == ">" else total
+
+    def mode(self, statement: Statement, symbols: dict, address: Word) -> tuple:
+        """Pick (addressing mode, operand expression) for an instruction."""
+        modes = self.Opcodes.get(statement.op)
+        if modes is None:
+            self.error(statement, f"unknown instruction: {statement.op}")
+        operand = statement.operand
+        if not operand or operand.upper() == "A" and "ACC" in modes:
+            if "ACC" not in modes and "IMP" not in modes and "IM" in modes:
+                return "IM", PADDING
+            return ("ACC" if "ACC" in modes else "IMP"), None
+        if operand.startswith("#"):
+            return "IM", operand[1:]
+        for pattern, mode in ((INDIRECT_X, "INDX"), (INDIRECT_Y, "INDY")):
+            match = pattern.fullmatch(operand)
+            if match:
+                return mode, match.group(1)
+        if "REL" in modes:
+            return "REL", operand
+        match = INDIRECT.fullmatch(operand)
+        if match and "IND" in modes:
+            return "IND", match.group(1)
+        match = INDEXED.fullmatch(operand)
+        expression, index = (match.group(1), match.group(2).upper()) if match else (operand, "")
+        value = self.value(statement, expression, symbols, address, False)
+        zeroPage, absolute = "ZP" + index, "ABS" + index
+        if zeroPage in modes and (absolute not in modes or (value is not None and 0 <= value <= 0xFF)):
+            return zeroPage, expression
+        return absolute, expression
+
+    def build(self, statements: list, origin: Word) -> Program:
+        symbols, modes = {}, {}
+        for final in (False, True):
+            address = origin
+            segments = [[origin, bytearray()]]
+            for index, statement in enumerate(statements):
+                if statement.op == "=":
+                    value = self.value(statement, statement.operand, symbols, address, final)
+                    if value is not None:
+                        symbols[statement.label] = value
+                    continue
+                if statement.label:
+                    if not final and statement.label in symbols:
+                        self.error(statement, f"{statement.label} is defined twice")
+                    symbols[statement.label] = address
+                if statement.op is None:
+                    continue
+                if statement.op == ".org":
+                    address = self.value(statement, statement.operand, symbols, address, True)
+                    segments.append([address, bytearray()])
+                    continue
+                if statement.op in (".byte", ".db", ".word", ".dw"):
+                    data = self.data(statement, symbols, address, final)
+                elif statement.op.startswith("."):
+                    self.error(statement, f"unknown directive: {statement.op}")
+                else:
+                    if index not in modes:
+                        modes[index] = self.mode(statement, symbols, address)
+                    data = self.instruction(statement, modes[index], symbols, address, final)
+                segments[-1][1] += data
+                address += len(data)
+        return Program(tuple((start, bytes(data)) for start, data in segments if data), symbols)
+
+    def data(self, statement: Statement, symbols: dict, address: Word, final: bool) -> bytes:
+        size = 2 if statement.op in (".word", ".dw") else 1
+        data = bytearray()
+        for item in splitOperands(statement.operand):
+            if size == 1 and len(item) >= 2 and item[0] == item[-1] == '"':
+                data += item[1:-1].encode("latin-1")
+                continue
+            value = self.value(statement, item, symbols, address + len(data), final) or 0
+            data += self.number(statement, value, size)
+        return data
+
+    def instruction(self, statement: Statement, mode: tuple, symbols: dict, address: Word, final: bool) -> bytes:
+        name, expression = mode
+        opcode = self.Opcodes[statement.op].get(name)
+        if opcode is None:
+            self.error(statement, f"{statement.op} has no {name} addressing mode")
+        size = Cpu.ADDRESSING_MODES[name]
+        if size == 0:
+            if expression is not None:
+                self.error(statement, f"{statement.op} takes no operand")
+            return bytes([opcode])
+        value = self.value(statement, expression, symbols, address, final)
+        if name == "REL":
+            offset = 0 if value is None else value - (address + 2)
+            if final and not -128 <= offset <= 127:
+                self.error(statement, f"branch target {value:#x} is out of range")
+            return bytes([opcode, offset & 0xFF])
+        return bytes([opcode]) + self.number(statement, value or 0, size)
+
+    def number(self, statement: Statement, value: int, size: int) -> bytes:
+        if not -(1 << (8 * size - 1)) <= value < (1 << (8 * size)):
+            self.error(statement, f"{value:#x} does not fit in {size} byte(s)")
+        return (value & ((1 << (8 * size)) - 1)).to_bytes(size, "little")
+
+def assemble(source: str, origin: Word = 0x0000) -> Program:
+    """Assemble source text once, without a shared cache."""
+    return Assembler().assemble(source, origin)
@@ -0,0 +1,78 @@
+import asyncio
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+class AsyncRunner:
+    """Runs one machine as an asyncio task, a cooperative counterpart to CPU.exec for hosting many
+    machines in one event loop.
+
+    The machine runs quantum cycles at a time through engine.exec (the CPU itself, a Jit.JIT ...)
+    and yields to the event loop in between. With a frequency the quanta are also paced against the
+    loop clock, so idle machines sleep instead of spinning.
+
+    Device callbacks cannot await, since they run inside exec, but they can hand an awaitable to wait:
+    the machine then stops after the current instruction (the current block with the JIT) and resumes
+    once the awaitable is done, without holding up the other machines. A terminal device that finds no
+    input buffered when its status register is read, for example, waits for the next line to arrive."""
+    def __init__(self, cpu: CPU, memory: Mem, quantum: s32 = 10000, engine=None, frequency: float = None):
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        self.CPU = cpu
+        self.Memory = memory
+        self.Quantum = quantum
+        self.Engine = engine if engine is not None else cpu
+        self.Frequency = frequency
+        '''Clock rate to pace the machine at, None to run as fast as the loop allows'''
+        self.Waiting = []
+        '''Awaitables handed to wait during the current quantum'''
+        self.Running = False
+
+    def wait(self, awaitable):
+        """Suspend the machine after the current instruction until awaitable is done, from a device callback."""
+        self.CPU.stopRun()
+        self.Waiting.append(awaitable)
+
+    def stop(self):
+        """End the current run at the end of the quantum being executed."""
+        self.Running = False
+
+    async def exec(self, cycles: s32 = None) -> s32:
+        """Run for cycles (until stop is called when None) and return the cycles used.
+
+        A CPU hook that stops a quantum short (a breakpoint, for example) ends the run too."""
+        loop = asyncio.get_running_loop()
+        frequency = self.Frequency
+        base: float = loop.time() # loop time of emulated cycle 0, moved on by waits
+        done: s32 = 0
+        self.Running = True
+        try:
+            while self.Running and (cycles is None or done < cycles):
+                budget: s32 = self.Quantum if cycles is None else min(self.Quantum, cycles - done)
+                used: s32 = self.Engine.exec(self.Memory, budget)
+                done += used
+                if self.Waiting:
+                    started = loop.time()
+                    while self.Waiting:
+                        await self.Waiting.pop(0)
+                    base += loop.time() - started
+                elif used < budget:
+                    break
+                if frequency is None:
+                    await asyncio.sleep(0)
+                else:
+                    await asyncio.sleep(max(0.0, base + done / frequency - loop.time()))
+        finally:
+            self.Running = False
+        return done
+
+async def runAll(runners: list, cycles: s32 = None) -> list:
+    """Run several machines concurrently in the current loop, returning the cycles each used."""
+    return await asyncio.gather(*(runner.exec(cycles) for runner in runners))
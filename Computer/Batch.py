@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import Cpu
+from . import Memory
+from . import Pool
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+REGISTERS = ("PC", "SP", "A_reg", "X_reg", "Y_reg", "P_status")
+STOP_KEYS = ("cycles", "instructions", "pc")
+MAX_CYCLES = 10_000_000
+'''Cycle limit of jobs whose stop condition does not give one, so a pc that is never reached cannot hang a worker'''
+MACHINES = Pool.MachinePool()
+'''Machines reused by the jobs of this (worker) process'''
+
+def number(value) -> int:
+    """Manifest numbers may be JSON integers or strings such as "0xF000"."""
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+def runJob(job: dict) -> dict:
+    """Run one manifest job in a freshly reset machine (from MACHINES) and return its result record.
+
+    A job maps its "rom" image file at "address" (optionally "offset"/"size" into the image), sets
+    "registers" after reset, runs until the "stop" condition (keywords of CPU.run_until, "cycles" defaulting
+    to MAX_CYCLES) and reports
+    the final registers, cycles, instruction count and the hex contents of each "dump" [start, end] range.
+    Errors are reported in the record instead of raised, so one bad job does not stop a sweep."""
+    result = {"id": job.get("id")}
+    try:
+        with MACHINES.machine() as (cpu, memory):
+            rom = memory.mapRom(job["rom"], number(job["address"]), number(job.get("offset", 0)),
+                                None if job.get("size") is None else number(job["size"]))
+            try:
+                for name, value in job.get("registers", {}).items():
+                    if name not in REGISTERS:
+                        raise ValueError(f"Unknown register: {name!r}")
+                    setattr(cpu, name, number(value))
+                stop = {key: number(value) for key, value in job.get("stop", {}).items() if key in STOP_KEYS}
+                stop.setdefault("cycles", MAX_CYCLES)
+                run = cpu.run_until(memory, **stop)
+                result.update(reason=run.reason, cycles=run.cycles, instructions=run.instructions)
+                result["registers"] = {name: getattr(cpu, name) for name in REGISTERS}
+                result["memory"] = [{"start": number(start), "end": number(end), "data": memory.dump(number(start), number(end)).hex()}
+                                    for start, end in job.get("dump", [])]
+            finally:
+                memory.unmapRom(rom)
+                rom.close()
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+def loadManifest(path: str) -> list:
+    """Read jobs from a JSON list or a JSON Lines file, ROM paths are taken relative to the manifest."""
+    with open(path) as file:
+        text = file.read()
+    jobs = json.loads(text) if text.lstrip().startswith("[") else [json.loads(line) for line in text.splitlines() if line.strip()]
+    base = os.path.dirname(os.path.abspath(path))
+    for index, job in enumerate(jobs):
+        job.setdefault("id", index)
+        job["rom"] = os.path.join(base, job["rom"])
+    return jobs
+
+def runBatch(jobs: list, output, workers: int = None) -> int:
+    """Run jobs across a process pool (one worker per core by default), writing each result to
+    output as a JSON line as soon as it finishes. Returns the number of failed jobs."""
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for future in as_completed([pool.submit(runJob, job) for job in jobs]):
+            result = future.result()
+            failed += "error" in result
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    return failed
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Computer.Batch", description="Run a manifest of ROM jobs across all cores.")
+    parser.add_argument("manifest", help="JSON list or JSON Lines file of jobs")
+    parser.add_argument("output", nargs="?", default="-", help="JSON Lines results file (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+    jobs = loadManifest(args.manifest)
+    if args.output == "-":
+        return 1 if runBatch(jobs, sys.stdout, args.workers) else 0
+    with open(args.output, "w") as output:
+        return 1 if runBatch(jobs, output, args.workers) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,486 +1,1759 @@
-from sys import byteorder
-from . import Memory
-
-Byte = int
-Word = int
-u32 = int
-s32 = int
-Mem = Memory.Mem
-
-class CPU:
-    def __init__(self, PC: Word = 0x0000, SP: Word = 0x0000, A_reg: Byte = 0x00, X_reg: Byte = 0x00, Y_reg: Byte = 0x00):
-        self.PC = PC
-        self.SP = SP
-        self.A_reg, self.X_reg, self.Y_reg = A_reg, X_reg, Y_reg
-        self.P_status = 0b00100000
-        self.INS_LDA_IM: Byte = 0xA9
-        '''(Load A immediate) Loads a value into the A register,    Cycles: 2'''
-        self.INS_LDA_ZP: Byte = 0xA5
-        '''(Load A zero page) Loads a value into the A register from the zero page,    Cycles: 3'''
-        self.INS_LDA_ZPX: Byte = 0xB5
-        '''(Load A zero page, X) Loads a value into the A register from the ZP address + value in X register,    Cycles: 4'''
-        self.INS_LDA_ABS: Byte = 0xAD
-        '''(Load A absolute) Loads a value into the A register using a 16-bit address,    Cycles: 4'''
-        self.INS_LDA_ABSX: Byte = 0xBD
-        '''(Load A absolute, X) Loads a value into the A register using a 16-bit address + value in X register,    Cycles: 4 (+1 if page crossed)'''
-        self.INS_LDA_ABSY: Byte = 0xB9
-        '''(Load A absolute, Y) Loads a value into the A register using a 16-bit address + value in Y register,    Cycles: 4 (+1 if page crossed)'''
-        self.INS_LDA_INDX: Byte = 0xA1
-        '''(Load A indirect X) Loads a value into the A register using a ZP pointer = ZP address + value in X register, Cycles: 6'''
-        self.INS_LDA_INDY: Byte = 0xB1
-        '''(Load A indirect Y) Loads a value into the A register using a ZP pointer = ZP address + value in Y register, Cycles: 5 (+1 if page crossed)'''
-        self.INS_LDX_IM: Byte = 0xA2
-        '''(Load X immediate) Loads a value into the X register,    Cycles: 2'''
-        self.INS_LDX_ZP: Byte = 0xA6
-        '''(Load X zero page) Loads a value into the X register from the zero page,    Cycles: 3'''
-        self.INS_LDX_ZPY: Byte = 0xB6
-        '''(Load X zero page, Y) Loads a value into the X register from the ZP address + value in Y register,    Cycles: 4'''
-        self.INS_LDX_ABS: Byte = 0xAE
-        '''(Load X absolute) Loads a value into the X register using a 16-bit address,    Cycles: 4'''
-        self.INS_LDX_ABSY: Byte = 0xBE
-        '''(Load X absolute, Y) Loads a value into the X register using a 16-bit address + value in Y register,    Cycles: 4 (+1 if page crossed)'''
-        self.INS_LDY_IM: Byte = 0xA0
-        '''(Load Y immediate) Loads a value into the Y register,    Cycles: 2'''
-        self.INS_LDY_ZP: Byte = 0xA4
-        '''(Load Y zero page) Loads a value into the Y register from the zero page,    Cycles: 3'''
-        self.INS_LDY_ZPX: Byte = 0xB4
-        '''(Load Y zero page, X) Loads a value into the Y register from the ZP address + value in X register,    Cycles: 4'''
-        self.INS_LDY_ABS: Byte = 0xAC
-        '''(Load Y absolute) Loads a value into the Y register using a 16-bit address,    Cycles: 4'''
-        self.INS_LDY_ABSX: Byte = 0xBC
-        '''(Load Y absolute, X) Loads a value into the Y register using a 16-bit address + value in X register,    Cycles: 4 (+1 if page crossed)'''
-        self.INS_STA_ZP: Byte = 0x85
-        '''(Store A zero page) Stores the contents of the A register into zero page,    Cycles: 3'''
-        self.INS_STA_ZPX: Byte = 0x95
-        '''(Store A zero page, X) Stores the contents of the A register into zero page + value in X register,    Cycles: 4'''
-        self.INS_STA_ABS: Byte = 0x8D
-        '''(Store A absolute) Stores the contents of the A register into memory using a 16-bit address,    Cycles: 4'''
-        self.INS_STA_ABSX: Byte = 0x9D
-        '''(Store A absolute, X) Stores the contents of the A register into memory using a 16-bit address + value in X register,    Cycles: 5'''
-        self.INS_STA_ABSY: Byte = 0x99
-        '''(Store A absolute, Y) Stores the contents of the A register into memory using a 16-bit address + value in Y register,    Cycles: 5'''
-        self.INS_STA_INDX: Byte = 0x81
-        '''(Store A indirect X) Stores the contents of the A register into memory using a ZP pointer = ZP address + value in X register, Cycles: 6'''
-        self.INS_STA_INDY: Byte = 0x91
-        '''(Store A indirect Y) Stores the contents of the A register into memory using a ZP pointer = ZP address + value in Y register, Cycles: 5 (+1 if page crossed)'''
-        self.INS_STX_ZP: Byte = 0x86
-        '''(Store X zero page) Stores the contents of the X register into zero page,    Cycles: 3'''
-        self.INS_STX_ZPY: Byte = 0x96
-        '''(Store X zero page, Y) Stores the contents of the X register into zero page + value in Y register,    Cycles: 4'''
-        self.INS_STX_ABS: Byte = 0x8E
-        '''(Store X absolute) Stores the contents of the X register into memory using a 16-bit address,    Cycles: 4'''
-        self.INS_STY_ZP: Byte = 0x84
-        '''(Store Y zero page) Stores the contents of the Y register into zero page,    Cycles: 3'''
-        self.INS_STY_ZPX: Byte = 0x94
-        '''(Store Y zero page, X) Stores the contents of the Y register into zero page + value in X register,    Cycles: 4'''
-        self.INS_STY_ABS: Byte = 0x8C
-        '''(Store Y absolute) Stores the contents of the Y register into memory using a 16-bit address,    Cycles: 4'''
-        self.INS_TAX_IMP: Byte = 0xAA
-        '''(Transfer A to X) Transfers the value in A register to X register, Cycles: 2'''
-        self.INS_TAY_IMP: Byte = 0xA8
-        '''(Transfer A to Y) Transfers the value in A register to Y register, Cycles: 2'''
-        self.INS_TSX_IMP: Byte = 0xBA
-        '''(Transfer stack to X) Transfers the value in the stack to X register, Cycles: 2'''
-        self.INS_TXA_IMP: Byte = 0x8A
-        '''(Transfer X to A) Transfers the value in X register to A register, Cycles: 2'''
-        self.INS_TXS_IMP: Byte = 0x9A
-        '''(Transfer X to stack) Transfers the value in X register to the stack, Cycles: 2'''
-        self.INS_TYA_IMP: Byte = 0x98
-        '''(Transfer Y to A) Transfers the value in Y register to A register, Cycles: 2'''
-        self.INS_JSR: Byte = 0x20
-        '''(Jump to subroutine) Pushes an address to the stack then jumps to that address in memory    Cycles: 4'''
-        self.INS_NOP: Byte = 0xEA
-        '''(No operation) Increments the program counter and does nothing,    Cycles: 2'''
-        self.INS_PHA: Byte = 0x48
-        '''(Push A) Pushes a copy of A register on to the stack,    Cycles: 3'''
-        self.INS_PHP: Byte = 0x08
-        '''(Push PS) Pushes status flags on to the stack,    Cycles: 3'''
-        self.INS_PLA: Byte = 0x68
-        '''(Pull A) Pulls a byte from stack and into A register,    Cycles: 4'''
-        self.INS_PLP: Byte = 0x28
-        '''(Pull PS) Pulls a byte from stack and into the processor status,    Cycles: 4'''
-        self.INS_AND_IM: Byte = 0x29
-        '''(AND immediate) logical AND operation performed on the A register and an address in memory,    Cycles: 2'''
-        self.INS_AND_ZP: Byte = 0x25
-        '''(AND zero page) logical AND operation performed on the A register and an address in zero page,    Cycles: 3'''
-        self.PLATFORM_BIG_ENDIAN = (False if byteorder == "little" else True)
-
-    def get_flag(self, bit: int) -> int:
-        """Get the value of a specific flag (0 or 1)."""
-        return (self.P_status >> bit) & 1
-
-    def set_flag(self, bit: int, value: bool):
-        """Set (1) or clear (0) a specific flag."""
-        if value:
-            self.P_status |= (1 << bit)
-        else:
-            self.P_status &= ~(1 << bit)
-
-    # --- Properties for flags ---
-    @property
-    def C_flag(self): return self.get_flag(0)  # Carry
-    @C_flag.setter
-    def C_flag(self, value): self.set_flag(0, value)
-
-    @property
-    def Z_flag(self): return self.get_flag(1)  # Zero
-    @Z_flag.setter
-    def Z_flag(self, value): self.set_flag(1, value)
-
-    @property
-    def I_flag(self): return self.get_flag(2)  # Interrupt Disable
-    @I_flag.setter
-    def I_flag(self, value): self.set_flag(2, value)
-
-    @property
-    def D_flag(self): return self.get_flag(3)  # Decimal Mode
-    @D_flag.setter
-    def D_flag(self, value): self.set_flag(3, value)
-
-    @property
-    def B_flag(self): return self.get_flag(4)  # Break
-    @B_flag.setter
-    def B_flag(self, value): self.set_flag(4, value)
-
-    @property
-    def V_flag(self): return self.get_flag(6)  # Overflow
-    @V_flag.setter
-    def V_flag(self, value): self.set_flag(6, value)
-
-    @property
-    def N_flag(self): return self.get_flag(7)  # Negative
-    @N_flag.setter
-    def N_flag(self, value): self.set_flag(7, value)
-
-    '''
-    def test(self):
-        """Print all flag values in order: C_flag, Z_flag, I_flag, D_flag, B_flag, V_flag, N_flag."""
-        print(self.C_flag, self.Z_flag, self.I_flag, self.D_flag, self.B_flag, self.V_flag, self.N_flag)
-    '''
-
-    def reset(self, memory: Mem):
-        self.PC = 0xFFFC
-        self.SP = 0x0100
-        self.C_flag = self.Z_flag = self.I_flag = self.D_flag = self.B_flag = self.V_flag = self.N_flag = 0
-        self.A_reg = self.X_reg = self.Y_reg = 0
-        memory.init()
-
-    def swapBytesInWord(self, Data: Word):
-        return ((Data & 0xFF) << 8) | ((Data >> 8) & 0xFF)
-
-    def fetchByte(self, memory: Mem, cycles: list) -> Byte:
-        Data: Byte = memory[self.PC]
-        self.PC += 1
-        cycles[0] -= 1
-
-        return Data
-    
-    def fetchWord(self, memory: Mem, cycles: list) -> Word:
-        low_byte: Word = memory[self.PC]
-        self.PC += 1
-
-        high_byte: Word = memory[self.PC]
-        self.PC += 1
-
-        Data: Word = (high_byte << 8) | low_byte
-        cycles[0] -= 2
-
-        if self.PLATFORM_BIG_ENDIAN:
-            Data = self.swapBytesInWord(Data)
-
-        return Data
-    
-    def readByte(self, memory: Mem, address: u32, cycles: list) -> Byte:
-        Data: Byte = memory[address]
-        cycles[0] -= 1
-
-        return Data
-
-    def ASetStatus(self):
-        self.Z_flag = (True if self.A_reg == 0 else False)
-        self.N_flag = (True if self.A_reg & 0b10000000 else False)
-    
-    def XSetStatus(self):
-        self.Z_flag = (True if self.X_reg == 0 else False)
-        self.N_flag = (True if self.X_reg & 0b10000000 else False)
-
-    def YSetStatus(self):
-        self.Z_flag = (True if self.Y_reg == 0 else False)
-        self.N_flag = (True if self.Y_reg & 0b10000000 else False)
-
-    def exec(self, memory: Mem, cycles: s32) -> s32:
-        start_cycles: s32 = cycles
-        while cycles > 0:
-            cycles_lst = [cycles]
-            Ins: Byte = self.fetchByte( memory, cycles_lst )
-            match Ins:
-                #LDA (load into A register) instruction
-                case self.INS_LDA_IM:
-                    Value: Byte = self.fetchByte( memory, cycles_lst )
-                    self.A_reg = Value
-                    self.ASetStatus()
-                case self.INS_LDA_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    self.A_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.ASetStatus()
-                case self.INS_LDA_ZPX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZeroPageAddress = (ZeroPageAddress + self.X_reg) & 0xFF
-                    cycles_lst[0] -= 1
-                    self.A_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.ASetStatus()
-                case self.INS_LDA_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    self.A_reg = self.readByte( memory, Address, cycles_lst )
-                    self.ASetStatus()
-                case self.INS_LDA_ABSX:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.X_reg
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    Value: Byte = self.readByte( memory, Address, cycles_lst )
-                    self.A_reg = Value
-                    self.ASetStatus()
-                case self.INS_LDA_ABSY:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.Y_reg
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    Value: Byte = self.readByte( memory, Address, cycles_lst )
-                    self.A_reg = Value
-                    self.ASetStatus()
-                case self.INS_LDA_INDX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZP_Pointer: Byte = (ZeroPageAddress + self.X_reg) & 0xFF
-                    cycles_lst[0] -= 1
-                    LSB_Byte: Byte = self.readByte( memory, ZP_Pointer, cycles_lst )
-                    MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF, cycles_lst )
-                    Address: Word = (MSB_Byte << 8) | LSB_Byte
-                    Value: Byte = self.readByte( memory, Address, cycles_lst )
-                    self.A_reg = Value
-                    self.ASetStatus()
-                case self.INS_LDA_INDY:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    LSB_Byte: Byte = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    MSB_Byte: Byte = self.readByte( memory, (ZeroPageAddress + 1) & 0xFF, cycles_lst )
-                    BaseAddress: Word = (MSB_Byte << 8) | LSB_Byte
-                    Address: Word = BaseAddress + self.Y_reg
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    Value: Byte = self.readByte( memory, Address, cycles_lst )
-                    self.A_reg = Value
-                    self.ASetStatus()
-                #LDX (load into X register) instruction
-                case self.INS_LDX_IM:
-                    Value: Byte = self.fetchByte( memory, cycles_lst )
-                    self.X_reg = Value
-                    self.XSetStatus()
-                case self.INS_LDX_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    self.X_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.XSetStatus()
-                case self.INS_LDX_ZPY:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZeroPageAddress = (ZeroPageAddress + self.Y_reg) & 0xFF
-                    cycles_lst[0] -= 1
-                    self.X_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.XSetStatus()
-                case self.INS_LDX_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    self.X_reg = self.readByte( memory, Address, cycles_lst )
-                    self.XSetStatus()
-                case self.INS_LDX_ABSY:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.Y_reg
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    self.X_reg = self.readByte( memory, Address, cycles_lst )
-                    self.XSetStatus()
-                #LDY (load into Y register) instruction
-                case self.INS_LDY_IM:
-                    Value: Byte = self.fetchByte( memory, cycles_lst )
-                    self.Y_reg = Value
-                    self.YSetStatus()
-                case self.INS_LDY_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    self.Y_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.YSetStatus()
-                case self.INS_LDY_ZPX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZeroPageAddress = (ZeroPageAddress + self.X_reg) & 0xFF
-                    cycles_lst[0] -= 1
-                    self.Y_reg = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.YSetStatus()
-                case self.INS_LDY_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    self.Y_reg = self.readByte( memory, Address, cycles_lst )
-                    self.YSetStatus()
-                case self.INS_LDY_ABSX:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.X_reg
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    self.Y_reg = self.readByte( memory, Address, cycles_lst )
-                    self.YSetStatus()
-                #JSR (jump to subroutine) instruction
-                case self.INS_JSR:
-                    SubAddr: Word = self.fetchWord( memory, cycles_lst )
-                    self.SP -= 2
-                    memory.WriteWord( cycles_lst, self.SP, self.PC - 1 )
-                    self.PC = SubAddr
-                    cycles_lst[0] -= 1
-                #NOP (no operation) instruction
-                case self.INS_NOP:
-                    self.PC += 1
-                    cycles_lst[0] -= 1
-                #STA store into A register instruction
-                case self.INS_STA_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    memory.WriteByte( cycles_lst, ZeroPageAddress & 0xFF, self.A_reg )
-                case self.INS_STA_ZPX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Byte = ZeroPageAddress + self.X_reg
-                    cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address & 0xFF, self.A_reg )
-                case self.INS_STA_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    memory.WriteByte( cycles_lst, Address & 0xFFFF, self.A_reg )
-                case self.INS_STA_ABSX:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.X_reg
-                    cycles_lst[0] -= 1
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address, self.A_reg )
-                case self.INS_STA_ABSY:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    BaseAddress: Word = LSB_Byte | (MSB_Byte << 8)
-                    Address: Word = BaseAddress + self.Y_reg
-                    cycles_lst[0] -= 1
-                    if (BaseAddress & 0xFF00) != (Address & 0xFF00):
-                        cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address, self.A_reg )
-                case self.INS_STA_INDX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZP_Pointer: Byte = (ZeroPageAddress + self.X_reg) & 0xFF
-                    cycles_lst[0] -= 1
-                    LSB_Byte: Byte = self.readByte( memory, ZP_Pointer, cycles_lst )
-                    MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF, cycles_lst )
-                    Address: Word = (MSB_Byte << 8) | LSB_Byte
-                    memory.WriteByte( cycles_lst, Address, self.A_reg )
-                case self.INS_STA_INDY:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    ZP_Pointer: Word = (ZeroPageAddress + self.Y_reg) & 0xFF
-                    LSB_Byte: Byte = self.readByte( memory, ZP_Pointer, cycles_lst )
-                    MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF, cycles_lst )
-                    Address: Word = (MSB_Byte << 8) | LSB_Byte
-                    cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address, self.A_reg )
-                #STX store into X register instruction
-                case self.INS_STX_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    memory.WriteByte( cycles_lst, ZeroPageAddress & 0xFF, self.X_reg )
-                case self.INS_STX_ZPY:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Byte = ZeroPageAddress + self.Y_reg
-                    cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address & 0xFF, self.X_reg )
-                case self.INS_STX_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    memory.WriteByte( cycles_lst, Address & 0xFFFF, self.X_reg )
-                #STY store into Y register instruction
-                case self.INS_STY_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    memory.WriteByte( cycles_lst, ZeroPageAddress & 0xFF, self.Y_reg )
-                case self.INS_STY_ZPX:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Byte = ZeroPageAddress + self.X_reg
-                    cycles_lst[0] -= 1
-                    memory.WriteByte( cycles_lst, Address & 0xFF, self.Y_reg )
-                case self.INS_STY_ABS:
-                    LSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    MSB_Byte: Byte = self.fetchByte( memory, cycles_lst )
-                    Address: Word = LSB_Byte | (MSB_Byte << 8)
-                    memory.WriteByte( cycles_lst, Address & 0xFFFF, self.Y_reg )
-                #Transfer instructions
-                case self.INS_TAX_IMP:
-                    self.X_reg = self.A_reg
-                    self.XSetStatus()
-                    cycles_lst[0] -= 1
-                case self.INS_TAY_IMP:
-                    self.Y_reg = self.A_reg
-                    self.YSetStatus()
-                    cycles_lst[0] -= 1
-                case self.INS_TSX_IMP:
-                    self.X_reg = self.SP & 0xFF
-                    self.XSetStatus()
-                    cycles_lst[0] -= 1
-                case self.INS_TXA_IMP:
-                    self.A_reg = self.X_reg
-                    self.ASetStatus()
-                    cycles_lst[0] -= 1
-                case self.INS_TXS_IMP:
-                    self.SP = self.X_reg & 0xFF
-                    cycles_lst[0] -= 1
-                case self.INS_TYA_IMP:
-                    self.A_reg = self.Y_reg
-                    self.ASetStatus()
-                    cycles_lst[0] -= 1
-                #Push instructions
-                case self.INS_PHA:
-                    memory.WriteByte( cycles_lst, 0x0100 + self.SP, self.A_reg )
-                    self.SP = (self.SP - 1) & 0xFF
-                    cycles_lst[0] -= 1
-                case self.INS_PHP:
-                    Status = self.P_status | 0b00110000
-                    memory.WriteByte( cycles_lst, 0x0100 + self.SP, Status )
-                    self.SP = (self.SP - 1) & 0xFF
-                    cycles_lst[0] -= 1
-                #Pull instructions
-                case self.INS_PLA:
-                    self.SP = (self.SP + 1) & 0xFF
-                    self.A_reg = memory[0x0100 + self.SP]
-                    self.ASetStatus()
-                    cycles_lst[0] -= 3
-                case self.INS_PLP:
-                    self.SP = (self.SP + 1) & 0xFF
-                    self.P_status = (memory[0x0100 + self.SP] & 0b11001111) | 0b00100000
-                    cycles_lst[0] -= 3
-                #Logical instructions
-                case self.INS_AND_IM:
-                    Value: Byte = self.fetchByte( memory, cycles_lst )
-                    self.A_reg = self.A_reg & Value
-                    self.ASetStatus()
-                case self.INS_AND_ZP:
-                    ZeroPageAddress: Byte = self.fetchByte( memory, cycles_lst )
-                    Value: Byte = self.readByte( memory, ZeroPageAddress, cycles_lst )
-                    self.A_reg = self.A_reg & Value
-                    self.ASetStatus()
-                case _:
-                    print(f"Instruction not handled: {Ins}")
-                    
-            cycles = cycles_lst[0]
-
-        CYCLES_USED: s32 = start_cycles - cycles
-        return CYCLES_USED
\ No newline at end of file
+from array import array
+from sys import byteorder
+from typing import NamedTuple
+from . import Memory
+from . import Timeline
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+
+STOP_CYCLES = "cycles"
+STOP_INSTRUCTIONS = "instructions"
+STOP_PC = "pc"
+STOP_HOOK = "hook"
+STOP_NEVER: s32 = 1 << 62
+'''Cycle budget used by run_until when no cycle limit is given'''
+
+ADDRESSING_MODES = {"IMP": 0, "ACC": 0, "IM": 1, "ZP": 1, "ZPX": 1, "ZPY": 1, "INDX": 1, "INDY": 1, "REL": 1,
+                    "ABS": 2, "ABSX": 2, "ABSY": 2, "IND": 2}
+'''Operand bytes taken by each addressing mode, named as in the INS_* suffixes'''
+BRANCHES = ("BPL", "BMI", "BVC", "BVS", "BCC", "BCS", "BNE", "BEQ")
+BARE_MODES = {"JSR": "ABS", "NOP": "IM", **{branch: "REL" for branch in BRANCHES}}
+'''Addressing mode of the INS_* names without a mode suffix, any other one is implied (IMP).
+NOP skips the byte after it, so it is decoded like an immediate operand'''
+IDLE_SAFE = frozenset(("LDA", "LDX", "LDY", "AND", "ORA", "EOR", "ADC", "SBC", "CMP", "CPX", "CPY", "BIT",
+                       "TAX", "TAY", "TXA", "TYA", "TSX", "INX", "INY", "DEX", "DEY",
+                       "CLC", "SEC", "CLD", "SED", "CLV") + BRANCHES)
+'''Mnemonics allowed in the body of an idle loop (shifts of A too): none of them writes memory, the stack or I_flag'''
+IDLE_LOOP_BYTES = 32
+'''Longest idle loop looked for, from the branch target to the branch'''
+IDLE_LOOP_STEPS = 64
+'''Most instructions one iteration of an idle loop may take'''
+INDEX_WRITES = {"LDX": "X", "TAX": "X", "TSX": "X", "INX": "X", "DEX": "X", "LDY": "Y", "TAY": "Y", "INY": "Y", "DEY": "Y"}
+'''Index register each IDLE_SAFE instruction changes'''
+
+def staticPage(page) -> bool:
+    """True for a Mem page that only changes when the CPU writes to it (RAM) or never does (a Rom)."""
+    return page is None or isinstance(page, Memory.Rom)
+
+def splitInstructionName(name: str) -> tuple:
+    """Split an INS_* name into (mnemonic, addressing mode), for example INS_LDA_ZPX -> ("LDA", "ZPX")."""
+    mnemonic, _, mode = name[4:].partition("_")
+    return mnemonic, mode or BARE_MODES.get(mnemonic, "IMP")
+
+class Opcode(NamedTuple):
+    """An opcode CPU implements, as listed in OPCODES."""
+    name: str
+    '''INS_* name, the CPU constant holding the opcode and (without INS) its _op_* handler'''
+    value: Byte
+    mnemonic: str
+    mode: str
+    cycles: int
+    '''Base cycles, before any page-crossing or branch-taken extra (given in the description)'''
+    description: str
+
+def opcode(name: str, value: Byte, cycles: int, description: str) -> Opcode:
+    return Opcode(name, value, *splitInstructionName(name), cycles, description)
+
+OPCODES: tuple = tuple(opcode(*entry) for entry in (
+    ("INS_LDA_IM", 0xA9, 2, "(Load A immediate) Loads a value into the A register"),
+    ("INS_LDA_ZP", 0xA5, 3, "(Load A zero page) Loads a value into the A register from the zero page"),
+    ("INS_LDA_ZPX", 0xB5, 4, "(Load A zero page, X) Loads a value into the A register from the ZP address + value in X register"),
+    ("INS_LDA_ABS", 0xAD, 4, "(Load A absolute) Loads a value into the A register using a 16-bit address"),
+    ("INS_LDA_ABSX", 0xBD, 4, "(Load A absolute, X) Loads a value into the A register using a 16-bit address + value in X register (+1 if page crossed)"),
+    ("INS_LDA_ABSY", 0xB9, 4, "(Load A absolute, Y) Loads a value into the A register using a 16-bit address + value in Y register (+1 if page crossed)"),
+    ("INS_LDA_INDX", 0xA1, 6, "(Load A indirect X) Loads a value into the A register using a ZP pointer = ZP address + value in X register"),
+    ("INS_LDA_INDY", 0xB1, 5, "(Load A indirect Y) Loads a value into the A register using a ZP pointer = ZP address + value in Y register (+1 if page crossed)"),
+    ("INS_LDX_IM", 0xA2, 2, "(Load X immediate) Loads a value into the X register"),
+    ("INS_LDX_ZP", 0xA6, 3, "(Load X zero page) Loads a value into the X register from the zero page"),
+    ("INS_LDX_ZPY", 0xB6, 4, "(Load X zero page, Y) Loads a value into the X register from the ZP address + value in Y register"),
+    ("INS_LDX_ABS", 0xAE, 4, "(Load X absolute) Loads a value into the X register using a 16-bit address"),
+    ("INS_LDX_ABSY", 0xBE, 4, "(Load X absolute, Y) Loads a value into the X register using a 16-bit address + value in Y register (+1 if page crossed)"),
+    ("INS_LDY_IM", 0xA0, 2, "(Load Y immediate) Loads a value into the Y register"),
+    ("INS_LDY_ZP", 0xA4, 3, "(Load Y zero page) Loads a value into the Y register from the zero page"),
+    ("INS_LDY_ZPX", 0xB4, 4, "(Load Y zero page, X) Loads a value into the Y register from the ZP address + value in X register"),
+    ("INS_LDY_ABS", 0xAC, 4, "(Load Y absolute) Loads a value into the Y register using a 16-bit address"),
+    ("INS_LDY_ABSX", 0xBC, 4, "(Load Y absolute, X) Loads a value into the Y register using a 16-bit address + value in X register (+1 if page crossed)"),
+    ("INS_STA_ZP", 0x85, 3, "(Store A zero page) Stores the contents of the A register into zero page"),
+    ("INS_STA_ZPX", 0x95, 4, "(Store A zero page, X) Stores the contents of the A register into zero page + value in X register"),
+    ("INS_STA_ABS", 0x8D, 4, "(Store A absolute) Stores the contents of the A register into memory using a 16-bit address"),
+    ("INS_STA_ABSX", 0x9D, 5, "(Store A absolute, X) Stores the contents of the A register into memory using a 16-bit address + value in X register"),
+    ("INS_STA_ABSY", 0x99, 5, "(Store A absolute, Y) Stores the contents of the A register into memory using a 16-bit address + value in Y register"),
+    ("INS_STA_INDX", 0x81, 6, "(Store A indirect X) Stores the contents of the A register into memory using a ZP pointer = ZP address + value in X register"),
+    ("INS_STA_INDY", 0x91, 5, "(Store A indirect Y) Stores the contents of the A register into memory using a ZP pointer = ZP address + value in Y register (+1 if page crossed)"),
+    ("INS_STX_ZP", 0x86, 3, "(Store X zero page) Stores the contents of the X register into zero page"),
+    ("INS_STX_ZPY", 0x96, 4, "(Store X zero page, Y) Stores the contents of the X register into zero page + value in Y register"),
+    ("INS_STX_ABS", 0x8E, 4, "(Store X absolute) Stores the contents of the X register into memory using a 16-bit address"),
+    ("INS_STY_ZP", 0x84, 3, "(Store Y zero page) Stores the contents of the Y register into zero page"),
+    ("INS_STY_ZPX", 0x94, 4, "(Store Y zero page, X) Stores the contents of the Y register into zero page + value in X register"),
+    ("INS_STY_ABS", 0x8C, 4, "(Store Y absolute) Stores the contents of the Y register into memory using a 16-bit address"),
+    ("INS_TAX_IMP", 0xAA, 2, "(Transfer A to X) Transfers the value in A register to X register"),
+    ("INS_TAY_IMP", 0xA8, 2, "(Transfer A to Y) Transfers the value in A register to Y register"),
+    ("INS_TSX_IMP", 0xBA, 2, "(Transfer stack to X) Transfers the value in the stack to X register"),
+    ("INS_TXA_IMP", 0x8A, 2, "(Transfer X to A) Transfers the value in X register to A register"),
+    ("INS_TXS_IMP", 0x9A, 2, "(Transfer X to stack) Transfers the value in X register to the stack"),
+    ("INS_TYA_IMP", 0x98, 2, "(Transfer Y to A) Transfers the value in Y register to A register"),
+    ("INS_JSR", 0x20, 4, "(Jump to subroutine) Pushes an address to the stack then jumps to that address in memory"),
+    ("INS_NOP", 0xEA, 2, "(No operation) Skips the byte after it and does nothing"),
+    ("INS_PHA", 0x48, 3, "(Push A) Pushes a copy of A register on to the stack"),
+    ("INS_PHP", 0x08, 3, "(Push PS) Pushes status flags on to the stack"),
+    ("INS_PLA", 0x68, 4, "(Pull A) Pulls a byte from stack and into A register"),
+    ("INS_PLP", 0x28, 4, "(Pull PS) Pulls a byte from stack and into the processor status"),
+    ("INS_AND_IM", 0x29, 2, "(AND immediate) logical AND operation performed on the A register and an address in memory"),
+    ("INS_AND_ZP", 0x25, 3, "(AND zero page) logical AND operation performed on the A register and an address in zero page"),
+    ("INS_ADC_IM", 0x69, 2, "(Add with carry immediate) Adds a value and the carry flag to the A register (BCD when D_flag is set)"),
+    ("INS_ADC_ZP", 0x65, 3, "(Add with carry zero page) Adds a value and the carry flag to the A register (BCD when D_flag is set)"),
+    ("INS_ADC_ZPX", 0x75, 4, "(Add with carry zero page, X) Adds a value and the carry flag to the A register (BCD when D_flag is set)"),
+    ("INS_ADC_ABS", 0x6D, 4, "(Add with carry absolute) Adds a value and the carry flag to the A register (BCD when D_flag is set)"),
+    ("INS_ADC_ABSX", 0x7D, 4, "(Add with carry absolute, X) Adds a value and the carry flag to the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_ADC_ABSY", 0x79, 4, "(Add with carry absolute, Y) Adds a value and the carry flag to the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_ADC_INDX", 0x61, 6, "(Add with carry indexed indirect) Adds a value and the carry flag to the A register (BCD when D_flag is set)"),
+    ("INS_ADC_INDY", 0x71, 5, "(Add with carry indirect indexed) Adds a value and the carry flag to the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_SBC_IM", 0xE9, 2, "(Subtract with carry immediate) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set)"),
+    ("INS_SBC_ZP", 0xE5, 3, "(Subtract with carry zero page) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set)"),
+    ("INS_SBC_ZPX", 0xF5, 4, "(Subtract with carry zero page, X) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set)"),
+    ("INS_SBC_ABS", 0xED, 4, "(Subtract with carry absolute) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set)"),
+    ("INS_SBC_ABSX", 0xFD, 4, "(Subtract with carry absolute, X) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_SBC_ABSY", 0xF9, 4, "(Subtract with carry absolute, Y) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_SBC_INDX", 0xE1, 6, "(Subtract with carry indexed indirect) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set)"),
+    ("INS_SBC_INDY", 0xF1, 5, "(Subtract with carry indirect indexed) Subtracts a value and the borrow (inverted carry) from the A register (BCD when D_flag is set) (+1 if page crossed)"),
+    ("INS_AND_ZPX", 0x35, 4, "(AND zero page, X) Logical AND operation performed on the A register and a value"),
+    ("INS_AND_ABS", 0x2D, 4, "(AND absolute) Logical AND operation performed on the A register and a value"),
+    ("INS_AND_ABSX", 0x3D, 4, "(AND absolute, X) Logical AND operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_AND_ABSY", 0x39, 4, "(AND absolute, Y) Logical AND operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_AND_INDX", 0x21, 6, "(AND indexed indirect) Logical AND operation performed on the A register and a value"),
+    ("INS_AND_INDY", 0x31, 5, "(AND indirect indexed) Logical AND operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_ORA_IM", 0x09, 2, "(OR with A immediate) Logical OR operation performed on the A register and a value"),
+    ("INS_ORA_ZP", 0x05, 3, "(OR with A zero page) Logical OR operation performed on the A register and a value"),
+    ("INS_ORA_ZPX", 0x15, 4, "(OR with A zero page, X) Logical OR operation performed on the A register and a value"),
+    ("INS_ORA_ABS", 0x0D, 4, "(OR with A absolute) Logical OR operation performed on the A register and a value"),
+    ("INS_ORA_ABSX", 0x1D, 4, "(OR with A absolute, X) Logical OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_ORA_ABSY", 0x19, 4, "(OR with A absolute, Y) Logical OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_ORA_INDX", 0x01, 6, "(OR with A indexed indirect) Logical OR operation performed on the A register and a value"),
+    ("INS_ORA_INDY", 0x11, 5, "(OR with A indirect indexed) Logical OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_EOR_IM", 0x49, 2, "(Exclusive OR immediate) Logical exclusive OR operation performed on the A register and a value"),
+    ("INS_EOR_ZP", 0x45, 3, "(Exclusive OR zero page) Logical exclusive OR operation performed on the A register and a value"),
+    ("INS_EOR_ZPX", 0x55, 4, "(Exclusive OR zero page, X) Logical exclusive OR operation performed on the A register and a value"),
+    ("INS_EOR_ABS", 0x4D, 4, "(Exclusive OR absolute) Logical exclusive OR operation performed on the A register and a value"),
+    ("INS_EOR_ABSX", 0x5D, 4, "(Exclusive OR absolute, X) Logical exclusive OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_EOR_ABSY", 0x59, 4, "(Exclusive OR absolute, Y) Logical exclusive OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_EOR_INDX", 0x41, 6, "(Exclusive OR indexed indirect) Logical exclusive OR operation performed on the A register and a value"),
+    ("INS_EOR_INDY", 0x51, 5, "(Exclusive OR indirect indexed) Logical exclusive OR operation performed on the A register and a value (+1 if page crossed)"),
+    ("INS_CMP_IM", 0xC9, 2, "(Compare A immediate) Compares the A register with a value, setting C, Z and N"),
+    ("INS_CMP_ZP", 0xC5, 3, "(Compare A zero page) Compares the A register with a value, setting C, Z and N"),
+    ("INS_CMP_ZPX", 0xD5, 4, "(Compare A zero page, X) Compares the A register with a value, setting C, Z and N"),
+    ("INS_CMP_ABS", 0xCD, 4, "(Compare A absolute) Compares the A register with a value, setting C, Z and N"),
+    ("INS_CMP_ABSX", 0xDD, 4, "(Compare A absolute, X) Compares the A register with a value, setting C, Z and N (+1 if page crossed)"),
+    ("INS_CMP_ABSY", 0xD9, 4, "(Compare A absolute, Y) Compares the A register with a value, setting C, Z and N (+1 if page crossed)"),
+    ("INS_CMP_INDX", 0xC1, 6, "(Compare A indexed indirect) Compares the A register with a value, setting C, Z and N"),
+    ("INS_CMP_INDY", 0xD1, 5, "(Compare A indirect indexed) Compares the A register with a value, setting C, Z and N (+1 if page crossed)"),
+    ("INS_CPX_IM", 0xE0, 2, "(Compare X immediate) Compares the X register with a value, setting C, Z and N"),
+    ("INS_CPX_ZP", 0xE4, 3, "(Compare X zero page) Compares the X register with a value, setting C, Z and N"),
+    ("INS_CPX_ABS", 0xEC, 4, "(Compare X absolute) Compares the X register with a value, setting C, Z and N"),
+    ("INS_CPY_IM", 0xC0, 2, "(Compare Y immediate) Compares the Y register with a value, setting C, Z and N"),
+    ("INS_CPY_ZP", 0xC4, 3, "(Compare Y zero page) Compares the Y register with a value, setting C, Z and N"),
+    ("INS_CPY_ABS", 0xCC, 4, "(Compare Y absolute) Compares the Y register with a value, setting C, Z and N"),
+    ("INS_BIT_ZP", 0x24, 3, "(Bit test zero page) Sets Z from A AND a value, and N and V from bits 7 and 6 of the value"),
+    ("INS_BIT_ABS", 0x2C, 4, "(Bit test absolute) Sets Z from A AND a value, and N and V from bits 7 and 6 of the value"),
+    ("INS_ASL_ACC", 0x0A, 2, "(Arithmetic shift left accumulator) Shifts a value left one bit, bit 7 goes into the carry"),
+    ("INS_ASL_ZP", 0x06, 5, "(Arithmetic shift left zero page) Shifts a value left one bit, bit 7 goes into the carry"),
+    ("INS_ASL_ZPX", 0x16, 6, "(Arithmetic shift left zero page, X) Shifts a value left one bit, bit 7 goes into the carry"),
+    ("INS_ASL_ABS", 0x0E, 6, "(Arithmetic shift left absolute) Shifts a value left one bit, bit 7 goes into the carry"),
+    ("INS_ASL_ABSX", 0x1E, 7, "(Arithmetic shift left absolute, X) Shifts a value left one bit, bit 7 goes into the carry"),
+    ("INS_LSR_ACC", 0x4A, 2, "(Logical shift right accumulator) Shifts a value right one bit, bit 0 goes into the carry"),
+    ("INS_LSR_ZP", 0x46, 5, "(Logical shift right zero page) Shifts a value right one bit, bit 0 goes into the carry"),
+    ("INS_LSR_ZPX", 0x56, 6, "(Logical shift right zero page, X) Shifts a value right one bit, bit 0 goes into the carry"),
+    ("INS_LSR_ABS", 0x4E, 6, "(Logical shift right absolute) Shifts a value right one bit, bit 0 goes into the carry"),
+    ("INS_LSR_ABSX", 0x5E, 7, "(Logical shift right absolute, X) Shifts a value right one bit, bit 0 goes into the carry"),
+    ("INS_ROL_ACC", 0x2A, 2, "(Rotate left accumulator) Rotates a value left one bit through the carry"),
+    ("INS_ROL_ZP", 0x26, 5, "(Rotate left zero page) Rotates a value left one bit through the carry"),
+    ("INS_ROL_ZPX", 0x36, 6, "(Rotate left zero page, X) Rotates a value left one bit through the carry"),
+    ("INS_ROL_ABS", 0x2E, 6, "(Rotate left absolute) Rotates a value left one bit through the carry"),
+    ("INS_ROL_ABSX", 0x3E, 7, "(Rotate left absolute, X) Rotates a value left one bit through the carry"),
+    ("INS_ROR_ACC", 0x6A, 2, "(Rotate right accumulator) Rotates a value right one bit through the carry"),
+    ("INS_ROR_ZP", 0x66, 5, "(Rotate right zero page) Rotates a value right one bit through the carry"),
+    ("INS_ROR_ZPX", 0x76, 6, "(Rotate right zero page, X) Rotates a value right one bit through the carry"),
+    ("INS_ROR_ABS", 0x6E, 6, "(Rotate right absolute) Rotates a value right one bit through the carry"),
+    ("INS_ROR_ABSX", 0x7E, 7, "(Rotate right absolute, X) Rotates a value right one bit through the carry"),
+    ("INS_INC_ZP", 0xE6, 5, "(Increment memory zero page) Adds one to a value in memory"),
+    ("INS_INC_ZPX", 0xF6, 6, "(Increment memory zero page, X) Adds one to a value in memory"),
+    ("INS_INC_ABS", 0xEE, 6, "(Increment memory absolute) Adds one to a value in memory"),
+    ("INS_INC_ABSX", 0xFE, 7, "(Increment memory absolute, X) Adds one to a value in memory"),
+    ("INS_DEC_ZP", 0xC6, 5, "(Decrement memory zero page) Subtracts one from a value in memory"),
+    ("INS_DEC_ZPX", 0xD6, 6, "(Decrement memory zero page, X) Subtracts one from a value in memory"),
+    ("INS_DEC_ABS", 0xCE, 6, "(Decrement memory absolute) Subtracts one from a value in memory"),
+    ("INS_DEC_ABSX", 0xDE, 7, "(Decrement memory absolute, X) Subtracts one from a value in memory"),
+    ("INS_INX_IMP", 0xE8, 2, "(Increment X) Adds one to the X register"),
+    ("INS_INY_IMP", 0xC8, 2, "(Increment Y) Adds one to the Y register"),
+    ("INS_DEX_IMP", 0xCA, 2, "(Decrement X) Subtracts one from the X register"),
+    ("INS_DEY_IMP", 0x88, 2, "(Decrement Y) Subtracts one from the Y register"),
+    ("INS_CLC_IMP", 0x18, 2, "(Clear carry) Clears the carry flag"),
+    ("INS_SEC_IMP", 0x38, 2, "(Set carry) Sets the carry flag"),
+    ("INS_CLD_IMP", 0xD8, 2, "(Clear decimal) Clears the decimal mode flag"),
+    ("INS_SED_IMP", 0xF8, 2, "(Set decimal) Sets the decimal mode flag"),
+    ("INS_CLV_IMP", 0xB8, 2, "(Clear overflow) Clears the overflow flag"),
+    ("INS_SEI_IMP", 0x78, 2, "(Set interrupt disable) Sets the interrupt disable flag, masking IRQ"),
+    ("INS_CLI_IMP", 0x58, 2, "(Clear interrupt disable) Clears the interrupt disable flag, taking IRQ again"),
+    ("INS_BRK", 0x00, 7, "(Break) Pushes PC + 2 and the processor status (B set) and jumps through the IRQ/BRK vector at 0xFFFE"),
+    ("INS_RTI", 0x40, 6, "(Return from interrupt) Pulls the processor status and PC from stack"),
+    ("INS_JMP_ABS", 0x4C, 3, "(Jump absolute) Sets PC to the address"),
+    ("INS_JMP_IND", 0x6C, 5, "(Jump indirect) Sets PC to the address stored at the operand (the high byte is read from the same page)"),
+    ("INS_BPL", 0x10, 2, "(Branch if plus) Adds the signed offset to PC when N_flag is clear (+1 if taken, +2 to another page)"),
+    ("INS_BMI", 0x30, 2, "(Branch if minus) Adds the signed offset to PC when N_flag is set (+1 if taken, +2 to another page)"),
+    ("INS_BVC", 0x50, 2, "(Branch if overflow clear) Adds the signed offset to PC when V_flag is clear (+1 if taken, +2 to another page)"),
+    ("INS_BVS", 0x70, 2, "(Branch if overflow set) Adds the signed offset to PC when V_flag is set (+1 if taken, +2 to another page)"),
+    ("INS_BCC", 0x90, 2, "(Branch if carry clear) Adds the signed offset to PC when C_flag is clear (+1 if taken, +2 to another page)"),
+    ("INS_BCS", 0xB0, 2, "(Branch if carry set) Adds the signed offset to PC when C_flag is set (+1 if taken, +2 to another page)"),
+    ("INS_BNE", 0xD0, 2, "(Branch if not equal) Adds the signed offset to PC when Z_flag is clear (+1 if taken, +2 to another page)"),
+    ("INS_BEQ", 0xF0, 2, "(Branch if equal) Adds the signed offset to PC when Z_flag is set (+1 if taken, +2 to another page)"),
+))
+'''Every implemented opcode, shared by all CPUs: the INS_* constants, the dispatch table, the assembler and
+the disassembler are all built from it'''
+OPCODE_TABLE: tuple = tuple(next((entry for entry in OPCODES if entry.value == value), None) for value in range(256))
+'''OPCODES indexed by opcode value, None for the opcodes CPU does not implement'''
+OPERAND_BYTES: bytes = bytes(0 if entry is None else ADDRESSING_MODES[entry.mode] for entry in OPCODE_TABLE)
+'''Operand length of every opcode as the CPU decodes it, 0 for the ones it does not implement'''
+
+def addWithCarry(A: Byte, M: Byte, C: int, D: int) -> tuple:
+    """(result, C, Z, V, N) of ADC on an NMOS 6502, in BCD when D is set.
+
+    Decimal mode follows the NMOS chip: the result and carry come from the BCD sum, N and V from
+    the sum with only the low digit adjusted, and Z from the plain binary sum."""
+    Binary: int = A + M + C
+    if not D:
+        Result: Byte = Binary & 0xFF
+        return Result, Binary >> 8, int(Result == 0), (~(A ^ M) & (A ^ Result) & 0x80) >> 7, Result >> 7
+    Low: int = (A & 0x0F) + (M & 0x0F) + C
+    if Low >= 0x0A:
+        Low = ((Low + 0x06) & 0x0F) + 0x10
+    Sum: int = (A & 0xF0) + (M & 0xF0) + Low
+    Signed: int = (A & 0xF0) - (A & 0x80) * 2 + (M & 0xF0) - (M & 0x80) * 2 + Low
+    if Sum >= 0xA0:
+        Sum += 0x60
+    return Sum & 0xFF, int(Sum >= 0x100), int((Binary & 0xFF) == 0), int(not -128 <= Signed <= 127), (Signed >> 7) & 1
+
+def subtractWithCarry(A: Byte, M: Byte, C: int, D: int) -> tuple:
+    """(result, C, Z, V, N) of SBC on an NMOS 6502, in BCD when D is set (the flags are those of the binary subtraction)."""
+    Result, Carry, Zero, Overflow, Negative = addWithCarry(A, M ^ 0xFF, C, 0)
+    if D:
+        Low: int = (A & 0x0F) - (M & 0x0F) + C - 1
+        if Low < 0:
+            Low = ((Low - 0x06) & 0x0F) - 0x10
+        Difference: int = (A & 0xF0) - (M & 0xF0) + Low
+        if Difference < 0:
+            Difference -= 0x60
+        Result = Difference & 0xFF
+    return Result, Carry, Zero, Overflow, Negative
+
+def arithmeticTable(operation) -> array:
+    """Every result of operation(A, M, C, D) packed as result | flags << 8, the flags in their P_status bits (C, Z, V, N).
+
+    The table is indexed by D << 17 | C << 16 | A << 8 | M."""
+    table = array("H", bytes(2 * 0x40000))
+    for D in (0, 1):
+        for C in (0, 1):
+            base = (D << 17) | (C << 16)
+            for A in range(256):
+                for M in range(256):
+                    Result, Carry, Zero, Overflow, Negative = operation(A, M, C, D)
+                    table[base | (A << 8) | M] = Result | (Carry | Zero << 1 | Overflow << 6 | Negative << 7) << 8
+    return table
+
+class RunResult(NamedTuple):
+    """What CPU.run_until stopped on, and how much it executed getting there."""
+    reason: str
+    cycles: s32
+    instructions: int
+
+class Snapshot(NamedTuple):
+    """Machine state captured by CPU.snapshot, RAM as an immutable image (bytes or Memory.MemoryDelta) and the page table (ROM windows and devices) by reference."""
+    PC: Word
+    SP: Word
+    A_reg: Byte
+    X_reg: Byte
+    Y_reg: Byte
+    P_status: Byte
+    Memory: object
+    Pages: tuple
+
+class DecodeCache(dict):
+    """Predecoded instructions keyed by PC, as (handler, operand, next PC, length in bytes).
+
+    The cache registers with the Mem it decodes from, which reports writes to the pages holding
+    decoded bytes, so entries are dropped as soon as (self-modifying) code overwrites them."""
+    def __init__(self, cpu: "CPU", memory: Mem):
+        super().__init__()
+        self.Memory = memory
+        self.Dispatch, self.OperandBytes = cpu.decodeTables()
+        memory.CodeWatchers.append(self.invalidate)
+
+    def fill(self, pc: Word) -> tuple:
+        memory = self.Memory
+        Ins: Byte = memory[pc]
+        Size: int = self.OperandBytes[Ins]
+        Operand: Word = 0 if Size == 0 else memory[pc + 1] if Size == 1 else memory[pc + 1] | (memory[pc + 2] << 8)
+        Entry = (self.Dispatch[Ins], Operand, (pc + 1 + Size) & 0xFFFF, 1 + Size)
+        memory.watchCode(pc, pc + 1 + Size)
+        self[pc] = Entry
+        return Entry
+
+    def invalidate(self, start: u32, end: u32):
+        """Drop every entry that decoded a byte in start..end-1."""
+        if end - start <= 16:
+            for pc in range(start - 2, end):
+                self.pop(pc & 0xFFFF, None)
+            return
+        for pc in [pc for pc, Entry in self.items() if any(start <= (pc + i) & 0xFFFF < end for i in range(Entry[3]))]:
+            del self[pc]
+
+    def close(self):
+        self.Memory.CodeWatchers.remove(self.invalidate)
+        self.clear()
+
+class CPU:
+    """The 6502. The opcodes are the class constants INS_* (set from OPCODES) and the state lives in
+    __slots__, so a CPU is cheap to construct and its registers are read without a dict lookup."""
+    __slots__ = ("PC", "SP", "A_reg", "X_reg", "Y_reg", "_P", "_NZ", "Cycles", "Predecode", "Decoded", "Clock",
+                 "SliceCycles", "Slicing", "Stopped", "FastForward", "IdleCycles", "IdleState", "IdleSince", "IdleRejected",
+                 "Timeline", "IRQLines", "NMIPending", "Hooks")
+    PLATFORM_BIG_ENDIAN: bool = byteorder != "little"
+    _DISPATCH = None
+    '''Opcode -> handler table, built once per class on first exec (see buildDispatchTable)'''
+    _OPERAND_BYTES = None
+    '''Opcode -> number of operand bytes, built alongside _DISPATCH'''
+    _ADC_TABLE = None
+    '''Precomputed ADC results and flags (see arithmeticTable), built on first use and shared by every CPU'''
+    _SBC_TABLE = None
+    '''Precomputed SBC results and flags, built alongside _ADC_TABLE'''
+
+    def __init__(self, PC: Word = 0x0000, SP: Word = 0x0000, A_reg: Byte = 0x00, X_reg: Byte = 0x00, Y_reg: Byte = 0x00, predecode: bool = False):
+        self.PC = PC
+        self.SP = SP
+        self.A_reg, self.X_reg, self.Y_reg = A_reg, X_reg, Y_reg
+        self.P_status = 0b00100000
+        self.Cycles: s32 = 0
+        '''Cycles left in the current exec/run_until budget, instructions decrement it as they go'''
+        self.Predecode = predecode
+        '''Run from a DecodeCache of already decoded instructions instead of decoding every fetch'''
+        self.Decoded: DecodeCache = None
+        self.Clock: int = 0
+        '''Cycles executed before the current exec slice, cycle() adds the slice's own'''
+        self.SliceCycles: s32 = 0
+        '''Cycle budget of the running slice (less what endSlice cut off), equal to Cycles between slices'''
+        self.Slicing = False
+        '''True while exec runs a slice, interrupts and earlier events then end the slice with endSlice'''
+        self.Stopped = False
+        '''Set by stopRun to make exec return after the current instruction'''
+        self.FastForward = True
+        '''Let exec skip through idle loops (see idleLoop) instead of executing every iteration'''
+        self.IdleCycles: int = 0
+        '''Cycles credited to idle loops without executing them'''
+        self.IdleState: tuple = None
+        '''(origin, target, A, X, Y, SP, P) the last backward jump was taken with'''
+        self.IdleSince: int = 0
+        '''Absolute cycle of that jump, an arrival with the same state measures one iteration from it'''
+        self.IdleRejected: tuple = None
+        '''Last such state whose loop could not idle, not looked at again until the next slice'''
+        self.Timeline = Timeline.Timeline(self)
+        '''Device events keyed by absolute cycle, looked at only when the first one is due'''
+        self.IRQLines: int = 0
+        '''IRQ is level triggered: one bit per device holding the line asserted (see irq)'''
+        self.NMIPending = False
+        self.Hooks = []
+        '''hook(cpu, memory, cycles) callbacks run before every instruction, cycles being those used so far in the run.
+        A true result stops the run before the instruction. exec and run_until only take the slower hooked path while this is non-empty'''
+
+    @property
+    def P_status(self) -> Byte:
+        """Processor status, with N and Z worked out from the last recorded result byte."""
+        if self._NZ >= 0:
+            Result: Byte = self._NZ
+            self._P = (self._P & 0b01111101) | (Result & 0b10000000) | (0 if Result else 0b00000010)
+            self._NZ = -1
+        return self._P
+    @P_status.setter
+    def P_status(self, value: Byte):
+        self._P = value
+        self._NZ = -1
+
+    def get_flag(self, bit: int) -> int:
+        """Get the value of a specific flag (0 or 1)."""
+        return (self.P_status >> bit) & 1
+
+    def set_flag(self, bit: int, value: bool):
+        """Set (1) or clear (0) a specific flag."""
+        if value:
+            self.P_status |= (1 << bit)
+        else:
+            self.P_status &= ~(1 << bit)
+
+    # --- Properties for flags ---
+    @property
+    def C_flag(self): return self.get_flag(0)  # Carry
+    @C_flag.setter
+    def C_flag(self, value): self.set_flag(0, value)
+
+    @property
+    def Z_flag(self): return self.get_flag(1)  # Zero
+    @Z_flag.setter
+    def Z_flag(self, value): self.set_flag(1, value)
+
+    @property
+    def I_flag(self): return self.get_flag(2)  # Interrupt Disable
+    @I_flag.setter
+    def I_flag(self, value): self.set_flag(2, value)
+
+    @property
+    def D_flag(self): return self.get_flag(3)  # Decimal Mode
+    @D_flag.setter
+    def D_flag(self, value): self.set_flag(3, value)
+
+    @property
+    def B_flag(self): return self.get_flag(4)  # Break
+    @B_flag.setter
+    def B_flag(self, value): self.set_flag(4, value)
+
+    @property
+    def V_flag(self): return self.get_flag(6)  # Overflow
+    @V_flag.setter
+    def V_flag(self, value): self.set_flag(6, value)
+
+    @property
+    def N_flag(self): return self.get_flag(7)  # Negative
+    @N_flag.setter
+    def N_flag(self, value): self.set_flag(7, value)
+
+    '''
+    def test(self):
+        """Print all flag values in order: C_flag, Z_flag, I_flag, D_flag, B_flag, V_flag, N_flag."""
+        print(self.C_flag, self.Z_flag, self.I_flag, self.D_flag, self.B_flag, self.V_flag, self.N_flag)
+    '''
+
+    def reset(self, memory: Mem):
+        self.PC = 0xFFFC
+        self.SP = 0x0100
+        self.C_flag = self.Z_flag = self.I_flag = self.D_flag = self.B_flag = self.V_flag = self.N_flag = 0
+        self.A_reg = self.X_reg = self.Y_reg = 0
+        memory.init()
+
+    def snapshot(self, memory: Mem) -> "Snapshot":
+        """Capture the registers and memory, to be put back later with restore."""
+        return Snapshot(self.PC, self.SP, self.A_reg, self.X_reg, self.Y_reg, self.P_status, *memory.snapshot())
+
+    def restore(self, memory: Mem, snapshot: "Snapshot"):
+        """Put the registers and memory back the way snapshot captured them."""
+        self.PC, self.SP = snapshot.PC, snapshot.SP
+        self.A_reg, self.X_reg, self.Y_reg = snapshot.A_reg, snapshot.X_reg, snapshot.Y_reg
+        self.P_status = snapshot.P_status
+        memory.restore(snapshot.Memory, snapshot.Pages)
+
+    def revert(self, memory: Mem, snapshot: "Snapshot", predecode: bool = False):
+        """Put the machine back the way snapshot captured it, for reuse: like restore, but only the RAM pages
+        written since then are copied (see Mem.revert), the run state (clock, timeline, pending interrupts,
+        hooks, idle loop statistics) is cleared as well and FastForward and Predecode go back to what a new
+        CPU(predecode=predecode) starts with."""
+        self.PC, self.SP = snapshot.PC, snapshot.SP
+        self.A_reg, self.X_reg, self.Y_reg = snapshot.A_reg, snapshot.X_reg, snapshot.Y_reg
+        self.P_status = snapshot.P_status
+        memory.revert(snapshot.Memory, snapshot.Pages)
+        self.Cycles = self.Clock = self.SliceCycles = self.IRQLines = self.IdleCycles = 0
+        self.Slicing = self.Stopped = self.NMIPending = False
+        self.IdleState = self.IdleRejected = None
+        self.FastForward, self.Predecode = True, predecode
+        self.Timeline.clear()
+        self.Hooks.clear()
+
+    def fork(self, memory: Mem) -> tuple:
+        """Return a new (CPU, Mem) pair that carries on from the current state independently.
+
+        RAM is copied up front (one 64K memcpy), ROM windows and devices are shared."""
+        child = CPU(self.PC, self.SP, self.A_reg, self.X_reg, self.Y_reg, predecode=self.Predecode)
+        child.P_status = self.P_status
+        return child, memory.fork()
+
+    def swapBytesInWord(self, Data: Word):
+        return ((Data & 0xFF) << 8) | ((Data >> 8) & 0xFF)
+
+    def fetchByte(self, memory: Mem) -> Byte:
+        Data: Byte = memory[self.PC]
+        self.PC += 1
+        self.Cycles -= 1
+
+        return Data
+    
+    def fetchWord(self, memory: Mem) -> Word:
+        low_byte: Word = memory[self.PC]
+        self.PC += 1
+
+        high_byte: Word = memory[self.PC]
+        self.PC += 1
+
+        Data: Word = (high_byte << 8) | low_byte
+        self.Cycles -= 2
+
+        if self.PLATFORM_BIG_ENDIAN:
+            Data = self.swapBytesInWord(Data)
+
+        return Data
+    
+    def readByte(self, memory: Mem, address: u32) -> Byte:
+        Data: Byte = memory[address]
+        self.Cycles -= 1
+
+        return Data
+
+    def writeByte(self, memory: Mem, address: u32, data: Byte):
+        memory[address] = data
+        self.Cycles -= 1
+
+    def writeWord(self, memory: Mem, address: u32, data: Word):
+        memory[address]     = data
+        memory[address + 1] = data >> 8
+        self.Cycles -= 2
+
+    # N and Z are evaluated lazily: loads and transfers only record the result byte in _NZ,
+    # and P_status folds it into the N/Z bits the next time it is read.
+    def ASetStatus(self):
+        self._NZ = self.A_reg
+
+    def XSetStatus(self):
+        self._NZ = self.X_reg
+
+    def YSetStatus(self):
+        self._NZ = self.Y_reg
+
+    # --- Effective addresses, charging the indexing cycles ---
+    def zeroPageX(self, operand: Word) -> Word:
+        self.Cycles -= 1
+        return (operand + self.X_reg) & 0xFF
+
+    def absoluteIndexed(self, operand: Word, index: Byte) -> u32:
+        """operand + index, one extra cycle when that crosses a page (reads only, writes always pay it)."""
+        Address: u32 = operand + index
+        if (operand & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        return Address
+
+    def indirectX(self, memory: Mem, operand: Word) -> Word:
+        ZP_Pointer: Byte = (operand + self.X_reg) & 0xFF
+        self.Cycles -= 1
+        LSB_Byte: Byte = self.readByte( memory, ZP_Pointer )
+        MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF )
+        return (MSB_Byte << 8) | LSB_Byte
+
+    def indirectY(self, memory: Mem, operand: Word) -> u32:
+        LSB_Byte: Byte = self.readByte( memory, operand )
+        MSB_Byte: Byte = self.readByte( memory, (operand + 1) & 0xFF )
+        return self.absoluteIndexed( (MSB_Byte << 8) | LSB_Byte, self.Y_reg )
+
+    # --- ALU ---
+    # ADC and SBC look their result and C/Z/V/N up in the shared tables, so decimal mode costs the
+    # same as binary. The other operations set C directly and leave N and Z to _NZ.
+    @classmethod
+    def arithmeticTables(cls) -> tuple:
+        """Return (ADC table, SBC table), building them on first use (it takes a fraction of a second)."""
+        if CPU._ADC_TABLE is None:
+            CPU._ADC_TABLE = arithmeticTable(addWithCarry)
+            CPU._SBC_TABLE = arithmeticTable(subtractWithCarry)
+        return CPU._ADC_TABLE, CPU._SBC_TABLE
+
+    def addWithCarry(self, value: Byte):
+        table = self._ADC_TABLE or self.arithmeticTables()[0]
+        P: Byte = self.P_status
+        Entry: int = table[((P & 0x08) << 14) | ((P & 0x01) << 16) | (self.A_reg << 8) | value]
+        self.A_reg = Entry & 0xFF
+        self._P = (P & 0b00111100) | (Entry >> 8)
+
+    def subtractWithCarry(self, value: Byte):
+        table = self._SBC_TABLE or self.arithmeticTables()[1]
+        P: Byte = self.P_status
+        Entry: int = table[((P & 0x08) << 14) | ((P & 0x01) << 16) | (self.A_reg << 8) | value]
+        self.A_reg = Entry & 0xFF
+        self._P = (P & 0b00111100) | (Entry >> 8)
+
+    def compare(self, register: Byte, value: Byte):
+        Difference: int = register - value
+        self._P = (self._P & 0xFE) | (Difference >= 0)
+        self._NZ = Difference & 0xFF
+
+    def bitTest(self, value: Byte):
+        P: Byte = self.P_status
+        self._P = (P & 0b00111101) | (value & 0b11000000) | (0 if self.A_reg & value else 0b00000010)
+
+    def shiftLeft(self, value: Byte) -> Byte:
+        self._P = (self._P & 0xFE) | (value >> 7)
+        self._NZ = Result = (value << 1) & 0xFF
+        return Result
+
+    def shiftRight(self, value: Byte) -> Byte:
+        self._P = (self._P & 0xFE) | (value & 1)
+        self._NZ = Result = value >> 1
+        return Result
+
+    def rotateLeft(self, value: Byte) -> Byte:
+        Result: Byte = ((value << 1) | (self._P & 1)) & 0xFF
+        self._P = (self._P & 0xFE) | (value >> 7)
+        self._NZ = Result
+        return Result
+
+    def rotateRight(self, value: Byte) -> Byte:
+        Result: Byte = (value >> 1) | ((self._P & 1) << 7)
+        self._P = (self._P & 0xFE) | (value & 1)
+        self._NZ = Result
+        return Result
+
+    def increment(self, value: Byte) -> Byte:
+        self._NZ = Result = (value + 1) & 0xFF
+        return Result
+
+    def decrement(self, value: Byte) -> Byte:
+        self._NZ = Result = (value - 1) & 0xFF
+        return Result
+
+    @classmethod
+    def buildDispatchTable(cls) -> list:
+        """Build the 256-entry opcode -> handler table shared by every instance of the class.
+
+        Each opcode of OPCODES is routed to the matching _op_* method, every other slot points
+        at _op_NotHandled. The operand lengths (OPERAND_BYTES) go into _OPERAND_BYTES."""
+        table = [cls._op_NotHandled] * 256
+        for entry in OPCODES:
+            table[entry.value] = getattr(cls, "_op_" + entry.name[4:])
+        cls._DISPATCH, cls._OPERAND_BYTES = table, OPERAND_BYTES
+        return table
+
+    def decodeTables(self) -> tuple:
+        """Return (handler table, operand length table) for this CPU's class."""
+        cls = type(self)
+        if cls.__dict__.get("_DISPATCH") is None:
+            cls.buildDispatchTable()
+        return cls._DISPATCH, cls._OPERAND_BYTES
+
+    def decodeCache(self, memory: Mem) -> "DecodeCache":
+        """Return the predecode cache for memory, replacing the one kept for a previous Mem."""
+        if self.Decoded is None or self.Decoded.Memory is not memory:
+            if self.Decoded is not None:
+                self.Decoded.close()
+            self.Decoded = DecodeCache(self, memory)
+        return self.Decoded
+
+    # --- Timeline and interrupts ---
+    # exec runs in slices that end at the next timeline event, so events and interrupts cost nothing
+    # per instruction: they are handled between slices, and anything that has to happen sooner
+    # (an interrupt being raised, an earlier event being scheduled) ends the running slice.
+    def cycle(self) -> int:
+        """Absolute number of cycles this CPU has executed, the time base of Timeline."""
+        return self.Clock + self.SliceCycles - self.Cycles
+
+    def endSlice(self):
+        """End the running exec slice after the current instruction, it still counts its cycles."""
+        if self.Cycles > 0:
+            self.SliceCycles -= self.Cycles
+            self.Cycles = 0
+
+    def stopRun(self):
+        """Make the running exec return after the current instruction (run_until stops with STOP_CYCLES)."""
+        self.Stopped = True
+        self.endSlice()
+
+    def eventScheduled(self, cycle: int):
+        if self.Slicing and cycle < self.Clock + self.SliceCycles:
+            self.endSlice()
+
+    def irq(self, asserted: bool = True, line: int = 1):
+        """Assert (or release) an IRQ line. Devices sharing the IRQ each drive their own line bit, and the
+        interrupt is taken between instructions for as long as any line is asserted and I_flag is clear."""
+        if asserted:
+            self.IRQLines |= line
+            self.checkIRQ()
+        else:
+            self.IRQLines &= ~line
+
+    def nmi(self):
+        """Signal an NMI (edge triggered), taken before the next instruction whatever I_flag is."""
+        self.NMIPending = True
+        if self.Slicing:
+            self.endSlice()
+
+    def checkIRQ(self):
+        """End the slice if an asserted IRQ has just become takeable (raised, or I_flag cleared)."""
+        if self.IRQLines and not self._P & 0b00000100 and self.Slicing:
+            self.endSlice()
+
+    def pushInterrupt(self, memory: Mem, vector: Word, status: Byte):
+        """Push PC and status, set I_flag and jump through vector,    Cycles: 5"""
+        for Value in (self.PC >> 8, self.PC & 0xFF, status):
+            self.writeByte( memory, 0x0100 + self.SP, Value )
+            self.SP = (self.SP - 1) & 0xFF
+        self._P |= 0b00000100
+        LSB_Byte: Byte = self.readByte( memory, vector )
+        MSB_Byte: Byte = self.readByte( memory, vector + 1 )
+        self.PC = (MSB_Byte << 8) | LSB_Byte
+
+    def interrupt(self, memory: Mem) -> bool:
+        """Enter a pending NMI, or the IRQ if it is asserted and I_flag is clear,    Cycles: 7"""
+        if self.NMIPending:
+            self.NMIPending = False
+            Vector: Word = 0xFFFA
+        elif self.IRQLines and not self._P & 0b00000100:
+            Vector: Word = 0xFFFE
+        else:
+            return False
+        self.Cycles -= 2
+        self.pushInterrupt( memory, Vector, (self.P_status | 0b00100000) & 0b11101111 )
+        return True
+
+    def runSliced(self, memory: Mem, cycles: s32, run) -> s32:
+        """Drive run(memory, budget), an exec loop that sets Cycles to budget and runs while it is positive,
+        for cycles in slices ending at timeline events. Due events and pending interrupts are handled between
+        slices. Returns the cycles used, interrupt entries included."""
+        timeline = self.Timeline
+        self.Stopped = False
+        used: s32 = 0
+        while used < cycles and not self.Stopped:
+            Now: int = self.Clock
+            if timeline.Next <= Now:
+                timeline.run(Now)
+            if self.NMIPending or self.IRQLines:
+                self.SliceCycles = self.Cycles = 0
+                if self.interrupt(memory):
+                    Spent: s32 = -self.Cycles
+                    self.Clock += Spent
+                    self.SliceCycles = self.Cycles
+                    used += Spent
+                    continue
+            Budget: s32 = min(cycles - used, timeline.Next - Now)
+            self.SliceCycles = Budget
+            self.IdleRejected = None
+            self.Slicing = True
+            try:
+                run(memory, Budget)
+            finally:
+                self.Slicing = False
+                Spent: s32 = self.SliceCycles - self.Cycles
+                self.Clock += Spent
+                self.SliceCycles = self.Cycles
+            used += Spent
+        return used
+
+    # --- Idle loops ---
+    # Firmware waiting for an interrupt spins in loops such as "JMP *" or "LDA flag / BEQ loop". A loop
+    # that writes nothing and reads only RAM and ROM comes back to the same state every iteration until
+    # an interrupt or device event changes something, and those only happen between exec slices. So once
+    # a backward jump is taken twice in a row with the same registers, one more iteration is run to check
+    # that it is such a loop, and the iterations left in the slice are credited without running them.
+    def idleLoop(self, memory: Mem, target: Word, origin: Word):
+        """Called when the jump at origin has gone back to target during an exec slice."""
+        State: tuple = (origin, target, self.A_reg, self.X_reg, self.Y_reg, self.SP, self.P_status)
+        Now: int = self.cycle()
+        if State != self.IdleState:
+            self.IdleState, self.IdleSince = State, Now
+            return
+        Iteration: s32 = Now - self.IdleSince
+        self.IdleSince = Now
+        # The confirming iteration must fit in what is left of the slice, or it would run past the budget
+        if State == self.IdleRejected or self.Cycles < Iteration:
+            return
+        Starts: set = self.idleBody(memory, target, origin)
+        if Starts is None:
+            self.IdleRejected = State
+            return
+        Before: s32 = self.Cycles
+        self.FastForward = False
+        try:
+            for _ in range(IDLE_LOOP_STEPS):
+                self.step(memory)
+                if self.PC == target or self.PC not in Starts or self.Cycles <= 0:
+                    break
+        finally:
+            self.FastForward = True
+        Iteration = Before - self.Cycles
+        self.IdleSince = self.cycle()
+        if self.PC != target or State[2:] != (self.A_reg, self.X_reg, self.Y_reg, self.SP, self.P_status):
+            return
+        if self.Cycles > Iteration:
+            Skipped: s32 = (self.Cycles - 1) // Iteration * Iteration
+            self.Cycles -= Skipped
+            self.IdleCycles += Skipped
+
+    def idleBody(self, memory: Mem, target: Word, origin: Word) -> set:
+        """Addresses of the instructions from target to the jump at origin if they can make an idle loop:
+        only IDLE_SAFE instructions reading RAM or ROM (at the addresses the current registers give),
+        with branches that stay in the loop. None if they cannot, or if the body changes an index register
+        it also indexes with, as the addresses are then not the ones worked out here."""
+        pages = memory.Pages
+        if origin - target >= IDLE_LOOP_BYTES or not all(staticPage(pages[page]) for page in range(target >> 8, ((origin + 2) >> 8) + 1)):
+            return None
+        Starts: set = {origin}
+        Changed, Indexes = set(), set()
+        PC: Word = target
+        while PC < origin:
+            Entry: Opcode = OPCODE_TABLE[memory[PC]]
+            if Entry is None or Entry.mnemonic not in IDLE_SAFE and Entry.mode != "ACC":
+                return None
+            mode: str = Entry.mode
+            if Entry.mnemonic in INDEX_WRITES:
+                Changed.add(INDEX_WRITES[Entry.mnemonic])
+            if mode in ("ZPX", "ABSX", "INDX", "ZPY", "ABSY", "INDY"):
+                Indexes.add(mode[-1])
+            Operand: Word = memory[PC + 1] if ADDRESSING_MODES[mode] == 1 else memory[PC + 1] | (memory[PC + 2] << 8)
+            Address = None
+            if mode == "REL":
+                if not target <= (PC + 2 + Operand - ((Operand & 0x80) << 1)) & 0xFFFF <= origin:
+                    return None
+            elif mode in ("ZP", "ABS"):
+                Address = Operand
+            elif mode in ("ZPX", "ZPY"):
+                Address = (Operand + (self.X_reg if mode == "ZPX" else self.Y_reg)) & 0xFF
+            elif mode in ("ABSX", "ABSY"):
+                Address = Operand + (self.X_reg if mode == "ABSX" else self.Y_reg)
+            elif mode in ("INDX", "INDY"):
+                if not staticPage(pages[0]):
+                    return None
+                Pointer: Byte = (Operand + self.X_reg) & 0xFF if mode == "INDX" else Operand
+                Address = (memory[Pointer] | (memory[(Pointer + 1) & 0xFF] << 8)) + (self.Y_reg if mode == "INDY" else 0)
+            if Address is not None and not staticPage(pages[(Address & 0xFFFF) >> 8]):
+                return None
+            Starts.add(PC)
+            PC += 1 + ADDRESSING_MODES[mode]
+        return Starts if PC == origin and not Changed & Indexes else None
+
+    def exec(self, memory: Mem, cycles: s32) -> s32:
+        if self.Hooks:
+            return self.run_until(memory, cycles=cycles).cycles
+        return self.runSliced(memory, cycles, self.execSlice)
+
+    # Instructions are decoded here rather than in the handlers: the opcode and its operand
+    # bytes are fetched (one cycle each), PC moves past them and the handler gets the operand.
+    def execSlice(self, memory: Mem, cycles: s32) -> s32:
+        dispatch, sizes = self.decodeTables()
+        self.Cycles = cycles
+        if self.Predecode:
+            decoded = self.decodeCache(memory)
+            while self.Cycles > 0:
+                Handler, Operand, NextPC, Length = decoded.get(self.PC) or decoded.fill(self.PC)
+                self.PC = NextPC
+                self.Cycles -= Length
+                Handler(self, memory, Operand)
+        else:
+            while self.Cycles > 0:
+                PC: Word = self.PC
+                Ins: Byte = memory[PC]
+                Size: int = sizes[Ins]
+                if Size == 0:
+                    Operand: Word = 0
+                elif Size == 1:
+                    Operand: Word = memory[PC + 1]
+                else:
+                    Operand: Word = memory[PC + 1] | (memory[PC + 2] << 8)
+                self.PC = (PC + 1 + Size) & 0xFFFF
+                self.Cycles -= 1 + Size
+                dispatch[Ins](self, memory, Operand)
+
+        CYCLES_USED: s32 = cycles - self.Cycles
+        return CYCLES_USED
+
+    def run_until(self, memory: Mem, *, cycles: s32 = None, instructions: int = None, pc: Word = None) -> "RunResult":
+        """Run until the first stop condition is met and report which one it was.
+
+        cycles stops once that many cycles are used (the last instruction always completes, as in exec),
+        instructions stops after that many instructions, and pc stops before executing the instruction at
+        that address, so a run that starts on pc returns straight away. A hook that returns a true value
+        stops the run before the instruction too, with that value as the reason (STOP_HOOK if it is just True).
+
+        Unlike exec, this loop checks for due timeline events and interrupts before every instruction."""
+        if cycles is None and instructions is None and pc is None:
+            raise ValueError("run_until needs at least one of cycles, instructions or pc")
+        dispatch, sizes = self.decodeTables()
+        decoded = self.decodeCache(memory) if self.Predecode else None
+        budget: s32 = cycles if cycles is not None else STOP_NEVER
+        limit: int = instructions if instructions is not None else -1
+        target: int = pc if pc is not None else -1
+        self.SliceCycles = self.Cycles = budget
+        self.Stopped = False
+        count: int = 0
+        hooks: list = self.Hooks
+        timeline = self.Timeline
+        while True:
+            if self.Clock + self.SliceCycles - self.Cycles >= timeline.Next:
+                timeline.run(self.Clock + self.SliceCycles - self.Cycles)
+            if (self.NMIPending or self.IRQLines) and self.Cycles > 0:
+                self.interrupt(memory)
+            PC: Word = self.PC
+            if (PC & 0xFFFF) == target:
+                reason = STOP_PC
+                break
+            if count == limit:
+                reason = STOP_INSTRUCTIONS
+                break
+            if self.Cycles <= 0:
+                reason = STOP_CYCLES
+                break
+            if hooks and (stop := self.callHooks(memory, self.SliceCycles - self.Cycles)):
+                reason = STOP_HOOK if stop is True else stop
+                break
+            if decoded is not None:
+                Handler, Operand, NextPC, Length = decoded.get(PC) or decoded.fill(PC)
+            else:
+                Ins: Byte = memory[PC]
+                Handler, Length = dispatch[Ins], 1 + sizes[Ins]
+                Operand: Word = 0 if Length == 1 else memory[PC + 1] if Length == 2 else memory[PC + 1] | (memory[PC + 2] << 8)
+                NextPC: Word = (PC + Length) & 0xFFFF
+            self.PC = NextPC
+            self.Cycles -= Length
+            Handler(self, memory, Operand)
+            count += 1
+
+        Used: s32 = self.SliceCycles - self.Cycles
+        self.Clock += Used
+        self.SliceCycles = self.Cycles
+        return RunResult(reason, Used, count)
+
+    def callHooks(self, memory: Mem, cycles: s32):
+        """Run every hook before the next instruction, return the first true result (or None)."""
+        for hook in self.Hooks:
+            stop = hook(self, memory, cycles)
+            if stop:
+                return stop
+        return None
+
+    def step(self, memory: Mem) -> s32:
+        """Execute the single instruction at PC, charging its cycles to Cycles, and return how many it took."""
+        dispatch, sizes = self.decodeTables()
+        Before: s32 = self.Cycles
+        PC: Word = self.PC
+        Ins: Byte = memory[PC]
+        Size: int = sizes[Ins]
+        Operand: Word = 0 if Size == 0 else memory[PC + 1] if Size == 1 else memory[PC + 1] | (memory[PC + 2] << 8)
+        self.PC = (PC + 1 + Size) & 0xFFFF
+        self.Cycles -= 1 + Size
+        dispatch[Ins](self, memory, Operand)
+        return Before - self.Cycles
+
+    #LDA (load into A register) instruction
+    def _op_LDA_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.A_reg = Value
+        self.ASetStatus()
+
+    def _op_LDA_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.A_reg = self.readByte( memory, ZeroPageAddress )
+        self.ASetStatus()
+
+    def _op_LDA_ZPX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZeroPageAddress = (ZeroPageAddress + self.X_reg) & 0xFF
+        self.Cycles -= 1
+        self.A_reg = self.readByte( memory, ZeroPageAddress )
+        self.ASetStatus()
+
+    def _op_LDA_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.A_reg = self.readByte( memory, Address )
+        self.ASetStatus()
+
+    def _op_LDA_ABSX(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.X_reg
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.A_reg = Value
+        self.ASetStatus()
+
+    def _op_LDA_ABSY(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.Y_reg
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.A_reg = Value
+        self.ASetStatus()
+
+    def _op_LDA_INDX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZP_Pointer: Byte = (ZeroPageAddress + self.X_reg) & 0xFF
+        self.Cycles -= 1
+        LSB_Byte: Byte = self.readByte( memory, ZP_Pointer )
+        MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF )
+        Address: Word = (MSB_Byte << 8) | LSB_Byte
+        Value: Byte = self.readByte( memory, Address )
+        self.A_reg = Value
+        self.ASetStatus()
+
+    def _op_LDA_INDY(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        LSB_Byte: Byte = self.readByte( memory, ZeroPageAddress )
+        MSB_Byte: Byte = self.readByte( memory, (ZeroPageAddress + 1) & 0xFF )
+        BaseAddress: Word = (MSB_Byte << 8) | LSB_Byte
+        Address: Word = BaseAddress + self.Y_reg
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.A_reg = Value
+        self.ASetStatus()
+
+    #LDX (load into X register) instruction
+    def _op_LDX_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.X_reg = Value
+        self.XSetStatus()
+
+    def _op_LDX_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.X_reg = self.readByte( memory, ZeroPageAddress )
+        self.XSetStatus()
+
+    def _op_LDX_ZPY(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZeroPageAddress = (ZeroPageAddress + self.Y_reg) & 0xFF
+        self.Cycles -= 1
+        self.X_reg = self.readByte( memory, ZeroPageAddress )
+        self.XSetStatus()
+
+    def _op_LDX_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.X_reg = self.readByte( memory, Address )
+        self.XSetStatus()
+
+    def _op_LDX_ABSY(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.Y_reg
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        self.X_reg = self.readByte( memory, Address )
+        self.XSetStatus()
+
+    #LDY (load into Y register) instruction
+    def _op_LDY_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.Y_reg = Value
+        self.YSetStatus()
+
+    def _op_LDY_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.Y_reg = self.readByte( memory, ZeroPageAddress )
+        self.YSetStatus()
+
+    def _op_LDY_ZPX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZeroPageAddress = (ZeroPageAddress + self.X_reg) & 0xFF
+        self.Cycles -= 1
+        self.Y_reg = self.readByte( memory, ZeroPageAddress )
+        self.YSetStatus()
+
+    def _op_LDY_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.Y_reg = self.readByte( memory, Address )
+        self.YSetStatus()
+
+    def _op_LDY_ABSX(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.X_reg
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        self.Y_reg = self.readByte( memory, Address )
+        self.YSetStatus()
+
+    #JSR (jump to subroutine) instruction
+    def _op_JSR(self, memory: Mem, operand: Word):
+        SubAddr: Word = operand
+        self.SP -= 2
+        self.writeWord( memory, self.SP, self.PC - 1 )
+        self.PC = SubAddr
+        self.Cycles -= 1
+
+    #NOP (no operation) instruction
+    def _op_NOP(self, memory: Mem, operand: Word):
+        pass
+
+    #STA store into A register instruction
+    def _op_STA_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.writeByte( memory, ZeroPageAddress & 0xFF, self.A_reg )
+
+    def _op_STA_ZPX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        Address: Byte = ZeroPageAddress + self.X_reg
+        self.Cycles -= 1
+        self.writeByte( memory, Address & 0xFF, self.A_reg )
+
+    def _op_STA_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.writeByte( memory, Address & 0xFFFF, self.A_reg )
+
+    def _op_STA_ABSX(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.X_reg
+        self.Cycles -= 1
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        self.writeByte( memory, Address, self.A_reg )
+
+    def _op_STA_ABSY(self, memory: Mem, operand: Word):
+        BaseAddress: Word = operand
+        Address: Word = BaseAddress + self.Y_reg
+        self.Cycles -= 1
+        if (BaseAddress & 0xFF00) != (Address & 0xFF00):
+            self.Cycles -= 1
+        self.writeByte( memory, Address, self.A_reg )
+
+    def _op_STA_INDX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZP_Pointer: Byte = (ZeroPageAddress + self.X_reg) & 0xFF
+        self.Cycles -= 1
+        LSB_Byte: Byte = self.readByte( memory, ZP_Pointer )
+        MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF )
+        Address: Word = (MSB_Byte << 8) | LSB_Byte
+        self.writeByte( memory, Address, self.A_reg )
+
+    def _op_STA_INDY(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        ZP_Pointer: Word = (ZeroPageAddress + self.Y_reg) & 0xFF
+        LSB_Byte: Byte = self.readByte( memory, ZP_Pointer )
+        MSB_Byte: Byte = self.readByte( memory, (ZP_Pointer + 1) & 0xFF )
+        Address: Word = (MSB_Byte << 8) | LSB_Byte
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.A_reg )
+
+    #STX store into X register instruction
+    def _op_STX_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.writeByte( memory, ZeroPageAddress & 0xFF, self.X_reg )
+
+    def _op_STX_ZPY(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        Address: Byte = ZeroPageAddress + self.Y_reg
+        self.Cycles -= 1
+        self.writeByte( memory, Address & 0xFF, self.X_reg )
+
+    def _op_STX_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.writeByte( memory, Address & 0xFFFF, self.X_reg )
+
+    #STY store into Y register instruction
+    def _op_STY_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        self.writeByte( memory, ZeroPageAddress & 0xFF, self.Y_reg )
+
+    def _op_STY_ZPX(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        Address: Byte = ZeroPageAddress + self.X_reg
+        self.Cycles -= 1
+        self.writeByte( memory, Address & 0xFF, self.Y_reg )
+
+    def _op_STY_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        self.writeByte( memory, Address & 0xFFFF, self.Y_reg )
+
+    #Transfer instructions
+    def _op_TAX_IMP(self, memory: Mem, operand: Word):
+        self.X_reg = self.A_reg
+        self.XSetStatus()
+        self.Cycles -= 1
+
+    def _op_TAY_IMP(self, memory: Mem, operand: Word):
+        self.Y_reg = self.A_reg
+        self.YSetStatus()
+        self.Cycles -= 1
+
+    def _op_TSX_IMP(self, memory: Mem, operand: Word):
+        self.X_reg = self.SP & 0xFF
+        self.XSetStatus()
+        self.Cycles -= 1
+
+    def _op_TXA_IMP(self, memory: Mem, operand: Word):
+        self.A_reg = self.X_reg
+        self.ASetStatus()
+        self.Cycles -= 1
+
+    def _op_TXS_IMP(self, memory: Mem, operand: Word):
+        self.SP = self.X_reg & 0xFF
+        self.Cycles -= 1
+
+    def _op_TYA_IMP(self, memory: Mem, operand: Word):
+        self.A_reg = self.Y_reg
+        self.ASetStatus()
+        self.Cycles -= 1
+
+    #Push instructions
+    def _op_PHA(self, memory: Mem, operand: Word):
+        self.writeByte( memory, 0x0100 + self.SP, self.A_reg )
+        self.SP = (self.SP - 1) & 0xFF
+        self.Cycles -= 1
+
+    def _op_PHP(self, memory: Mem, operand: Word):
+        Status = self.P_status | 0b00110000
+        self.writeByte( memory, 0x0100 + self.SP, Status )
+        self.SP = (self.SP - 1) & 0xFF
+        self.Cycles -= 1
+
+    #Pull instructions
+    def _op_PLA(self, memory: Mem, operand: Word):
+        self.SP = (self.SP + 1) & 0xFF
+        self.A_reg = memory[0x0100 + self.SP]
+        self.ASetStatus()
+        self.Cycles -= 3
+
+    def _op_PLP(self, memory: Mem, operand: Word):
+        self.SP = (self.SP + 1) & 0xFF
+        self.P_status = (memory[0x0100 + self.SP] & 0b11001111) | 0b00100000
+        self.Cycles -= 3
+        self.checkIRQ()
+
+    #Logical instructions
+    def _op_AND_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_ZP(self, memory: Mem, operand: Word):
+        ZeroPageAddress: Byte = operand
+        Value: Byte = self.readByte( memory, ZeroPageAddress )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    #ADC (add with carry) instruction
+    def _op_ADC_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.addWithCarry( Value )
+
+    def _op_ADC_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.addWithCarry( Value )
+
+    def _op_ADC_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.addWithCarry( Value )
+
+    def _op_ADC_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.addWithCarry( Value )
+
+    def _op_ADC_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.addWithCarry( Value )
+
+    def _op_ADC_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.addWithCarry( Value )
+
+    def _op_ADC_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.addWithCarry( Value )
+
+    def _op_ADC_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.addWithCarry( Value )
+
+    #SBC (subtract with carry) instruction
+    def _op_SBC_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.subtractWithCarry( Value )
+
+    def _op_SBC_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.subtractWithCarry( Value )
+
+    #AND (remaining addressing modes) instruction
+    def _op_AND_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    def _op_AND_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.A_reg = self.A_reg & Value
+        self.ASetStatus()
+
+    #ORA (or with a) instruction
+    def _op_ORA_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    def _op_ORA_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.A_reg = self.A_reg | Value
+        self.ASetStatus()
+
+    #EOR (exclusive or) instruction
+    def _op_EOR_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    def _op_EOR_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.A_reg = self.A_reg ^ Value
+        self.ASetStatus()
+
+    #CMP (compare a) instruction
+    def _op_CMP_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_ZPX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.zeroPageX( operand ) )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_ABSX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.X_reg ) )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_ABSY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.absoluteIndexed( operand, self.Y_reg ) )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_INDX(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectX( memory, operand ) )
+        self.compare( self.A_reg, Value )
+
+    def _op_CMP_INDY(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, self.indirectY( memory, operand ) )
+        self.compare( self.A_reg, Value )
+
+    #CPX (compare x) instruction
+    def _op_CPX_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.compare( self.X_reg, Value )
+
+    def _op_CPX_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.X_reg, Value )
+
+    def _op_CPX_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.X_reg, Value )
+
+    #CPY (compare y) instruction
+    def _op_CPY_IM(self, memory: Mem, operand: Word):
+        Value: Byte = operand
+        self.compare( self.Y_reg, Value )
+
+    def _op_CPY_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.Y_reg, Value )
+
+    def _op_CPY_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.compare( self.Y_reg, Value )
+
+    #BIT (bit test) instruction
+    def _op_BIT_ZP(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.bitTest( Value )
+
+    def _op_BIT_ABS(self, memory: Mem, operand: Word):
+        Value: Byte = self.readByte( memory, operand )
+        self.bitTest( Value )
+
+    #ASL (arithmetic shift left) instruction
+    def _op_ASL_ACC(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.A_reg = self.shiftLeft( self.A_reg )
+
+    def _op_ASL_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftLeft( Value ) )
+
+    def _op_ASL_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftLeft( Value ) )
+
+    def _op_ASL_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftLeft( Value ) )
+
+    def _op_ASL_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftLeft( Value ) )
+
+    #LSR (logical shift right) instruction
+    def _op_LSR_ACC(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.A_reg = self.shiftRight( self.A_reg )
+
+    def _op_LSR_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftRight( Value ) )
+
+    def _op_LSR_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftRight( Value ) )
+
+    def _op_LSR_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftRight( Value ) )
+
+    def _op_LSR_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.shiftRight( Value ) )
+
+    #ROL (rotate left) instruction
+    def _op_ROL_ACC(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.A_reg = self.rotateLeft( self.A_reg )
+
+    def _op_ROL_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateLeft( Value ) )
+
+    def _op_ROL_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateLeft( Value ) )
+
+    def _op_ROL_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateLeft( Value ) )
+
+    def _op_ROL_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateLeft( Value ) )
+
+    #ROR (rotate right) instruction
+    def _op_ROR_ACC(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.A_reg = self.rotateRight( self.A_reg )
+
+    def _op_ROR_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateRight( Value ) )
+
+    def _op_ROR_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateRight( Value ) )
+
+    def _op_ROR_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateRight( Value ) )
+
+    def _op_ROR_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.rotateRight( Value ) )
+
+    #INC (increment memory) instruction
+    def _op_INC_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.increment( Value ) )
+
+    def _op_INC_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.increment( Value ) )
+
+    def _op_INC_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.increment( Value ) )
+
+    def _op_INC_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.increment( Value ) )
+
+    #DEC (decrement memory) instruction
+    def _op_DEC_ZP(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.decrement( Value ) )
+
+    def _op_DEC_ZPX(self, memory: Mem, operand: Word):
+        Address: Word = self.zeroPageX( operand )
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.decrement( Value ) )
+
+    def _op_DEC_ABS(self, memory: Mem, operand: Word):
+        Address: Word = operand
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.decrement( Value ) )
+
+    def _op_DEC_ABSX(self, memory: Mem, operand: Word):
+        Address: Word = operand + self.X_reg
+        self.Cycles -= 1
+        Value: Byte = self.readByte( memory, Address )
+        self.Cycles -= 1
+        self.writeByte( memory, Address, self.decrement( Value ) )
+
+    #Register increments and flag instructions
+    def _op_INX_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.X_reg = (self.X_reg + 1) & 0xFF
+        self.XSetStatus()
+
+    def _op_INY_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.Y_reg = (self.Y_reg + 1) & 0xFF
+        self.YSetStatus()
+
+    def _op_DEX_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.X_reg = (self.X_reg - 1) & 0xFF
+        self.XSetStatus()
+
+    def _op_DEY_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.Y_reg = (self.Y_reg - 1) & 0xFF
+        self.YSetStatus()
+
+    def _op_CLC_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.C_flag = 0
+
+    def _op_SEC_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.C_flag = 1
+
+    def _op_CLD_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.D_flag = 0
+
+    def _op_SED_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.D_flag = 1
+
+    def _op_CLV_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.V_flag = 0
+
+    #Interrupt instructions
+    def _op_SEI_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.I_flag = 1
+
+    def _op_CLI_IMP(self, memory: Mem, operand: Word):
+        self.Cycles -= 1
+        self.I_flag = 0
+        self.checkIRQ()
+
+    def _op_BRK(self, memory: Mem, operand: Word):
+        self.PC = (self.PC + 1) & 0xFFFF
+        self.Cycles -= 1
+        self.pushInterrupt( memory, 0xFFFE, self.P_status | 0b00110000 )
+
+    def _op_RTI(self, memory: Mem, operand: Word):
+        self.SP = (self.SP + 1) & 0xFF
+        self.P_status = (self.readByte( memory, 0x0100 + self.SP ) & 0b11001111) | 0b00100000
+        self.SP = (self.SP + 1) & 0xFF
+        LSB_Byte: Byte = self.readByte( memory, 0x0100 + self.SP )
+        self.SP = (self.SP + 1) & 0xFF
+        MSB_Byte: Byte = self.readByte( memory, 0x0100 + self.SP )
+        self.PC = (MSB_Byte << 8) | LSB_Byte
+        self.Cycles -= 2
+        self.checkIRQ()
+
+    #JMP (jump) instruction
+    def _op_JMP_ABS(self, memory: Mem, operand: Word):
+        Origin: Word = (self.PC - 3) & 0xFFFF
+        self.PC = operand
+        if operand <= Origin and self.Slicing and self.FastForward:
+            self.idleLoop( memory, operand, Origin )
+
+    def _op_JMP_IND(self, memory: Mem, operand: Word):
+        LSB_Byte: Byte = self.readByte( memory, operand )
+        MSB_Byte: Byte = self.readByte( memory, (operand & 0xFF00) | ((operand + 1) & 0xFF) )
+        self.PC = (MSB_Byte << 8) | LSB_Byte
+
+    #Branch instructions
+    def branch(self, memory: Mem, operand: Word, taken: bool):
+        """Add the signed offset operand to PC if taken, one cycle more, two when that lands on another page."""
+        if not taken:
+            return
+        Origin: Word = (self.PC - 2) & 0xFFFF
+        Target: Word = (self.PC + operand - ((operand & 0x80) << 1)) & 0xFFFF
+        self.Cycles -= 1 if (Target & 0xFF00) == (self.PC & 0xFF00) else 2
+        self.PC = Target
+        if Target <= Origin and self.Slicing and self.FastForward:
+            self.idleLoop( memory, Target, Origin )
+
+    def _op_BPL(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, not self.P_status & 0b10000000 )
+
+    def _op_BMI(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, self.P_status & 0b10000000 )
+
+    def _op_BVC(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, not self._P & 0b01000000 )
+
+    def _op_BVS(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, self._P & 0b01000000 )
+
+    def _op_BCC(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, not self._P & 0b00000001 )
+
+    def _op_BCS(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, self._P & 0b00000001 )
+
+    def _op_BNE(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, not self.P_status & 0b00000010 )
+
+    def _op_BEQ(self, memory: Mem, operand: Word):
+        self.branch( memory, operand, self.P_status & 0b00000010 )
+
+    def _op_NotHandled(self, memory: Mem, operand: Word):
+        print(f"Instruction not handled: {memory[self.PC - 1]}")
+
+for entry in OPCODES:
+    setattr(CPU, entry.name, entry.value)
+del entry
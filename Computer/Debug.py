@@ -0,0 +1,143 @@
+from typing import NamedTuple
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+STOP_BREAKPOINT = "breakpoint"
+STOP_WATCHPOINT = "watchpoint"
+
+class Hit(NamedTuple):
+    """Why the debugger stopped a run: kind is STOP_BREAKPOINT or STOP_WATCHPOINT ("read"/"write" in access)."""
+    kind: str
+    address: Word
+    pc: Word
+    access: str = None
+    value: Byte = None
+
+def compileCondition(condition: str):
+    """Compile a condition expression once, it is evaluated with the names of Debugger.namespace."""
+    return None if condition is None else compile(condition, f"<condition {condition!r}>", "eval")
+
+class WatchPage:
+    """Page table entry installed over a page holding watchpoints, it passes accesses on to the
+    RAM (or the Rom/Device) underneath and reports the watched ones to the debugger."""
+    def __init__(self, debugger: "Debugger", inner):
+        self.Debugger = debugger
+        self.Inner = inner
+        '''The page entry this one replaced, None for plain RAM'''
+
+    def read(self, address: u32) -> Byte:
+        value = self.Debugger.Memory.Data[address] if self.Inner is None else self.Inner.read(address)
+        if self.Debugger.ReadWatches[address]:
+            self.Debugger.watched(address, "read", value)
+        return value
+
+    def write(self, address: u32, value: Byte):
+        if self.Inner is None:
+            memory = self.Debugger.Memory
+            memory.Data[address] = value
+            memory.ramWritten(address, address + 1)
+        else:
+            self.Inner.write(address, value)
+        if self.Debugger.WriteWatches[address]:
+            self.Debugger.watched(address, "write", value)
+
+class Debugger:
+    """Breakpoints on PC and read/write watchpoints on memory for one CPU and Mem.
+
+    Membership is a lookup in a 64K bitmap, so the number of breakpoints does not matter. The debugger
+    hooks into the CPU (see CPU.Hooks) only while a breakpoint or watchpoint is set, and watchpoints
+    only reroute the pages they are on, so with nothing set CPU.exec runs its normal loop. A hit stops run_until (with
+    reason STOP_BREAKPOINT or STOP_WATCHPOINT) or exec before the next instruction and is kept in Hit.
+
+    Conditions are Python expressions compiled once when set and evaluated on hits only, over A, X, Y,
+    SP, PC, P, the flags C, Z, I, D, B, V, N, memory, and value for watchpoints."""
+    def __init__(self, cpu: CPU, memory: Mem):
+        self.CPU = cpu
+        self.Memory = memory
+        self.Breakpoints = bytearray(0x10000)
+        self.ReadWatches = bytearray(0x10000)
+        self.WriteWatches = bytearray(0x10000)
+        self.Conditions = {}
+        '''Address -> compiled breakpoint condition'''
+        self.WatchConditions = {}
+        '''Address -> compiled watchpoint condition'''
+        self.BreakCount = 0
+        self.Hit: Hit = None
+        '''Last breakpoint or watchpoint that stopped a run'''
+        self.Pending: Hit = None
+        '''Watchpoint hit by the instruction being executed, stops the run before the next one'''
+        self.Resume: Word = -1
+        '''PC of the last breakpoint stop, skipped once so the run can continue from it'''
+
+    def namespace(self, value: Byte = None) -> dict:
+        cpu = self.CPU
+        return {"A": cpu.A_reg, "X": cpu.X_reg, "Y": cpu.Y_reg, "SP": cpu.SP, "PC": cpu.PC, "P": cpu.P_status,
+                "C": cpu.C_flag, "Z": cpu.Z_flag, "I": cpu.I_flag, "D": cpu.D_flag, "B": cpu.B_flag,
+                "V": cpu.V_flag, "N": cpu.N_flag, "memory": self.Memory, "value": value}
+
+    def check(self, condition, value: Byte = None) -> bool:
+        return condition is None or bool(eval(condition, {"__builtins__": {}}, self.namespace(value)))
+
+    def addBreakpoint(self, address: Word, condition: str = None):
+        address &= 0xFFFF
+        self.BreakCount += not self.Breakpoints[address]
+        self.Breakpoints[address] = 1
+        self.Conditions[address] = compileCondition(condition)
+        if self not in self.CPU.Hooks:
+            self.CPU.Hooks.append(self)
+
+    def removeBreakpoint(self, address: Word):
+        address &= 0xFFFF
+        self.BreakCount -= self.Breakpoints[address]
+        self.Breakpoints[address] = 0
+        self.Conditions.pop(address, None)
+        if not self.BreakCount and not self.WatchConditions and self in self.CPU.Hooks:
+            self.CPU.Hooks.remove(self)
+
+    def addWatchpoint(self, address: Word, read: bool = False, write: bool = True, condition: str = None):
+        """Watch reads and/or writes of address. The debugger hooks into the CPU so that a hit can stop the run."""
+        address &= 0xFFFF
+        self.ReadWatches[address] = read
+        self.WriteWatches[address] = write
+        self.WatchConditions[address] = compileCondition(condition)
+        page = self.Memory.Pages[address >> 8]
+        if not isinstance(page, WatchPage):
+            self.Memory.Pages[address >> 8] = WatchPage(self, page)
+        if self not in self.CPU.Hooks:
+            self.CPU.Hooks.append(self)
+
+    def removeWatchpoint(self, address: Word):
+        address &= 0xFFFF
+        self.ReadWatches[address] = self.WriteWatches[address] = 0
+        self.WatchConditions.pop(address, None)
+        first = address & 0xFF00
+        page = self.Memory.Pages[address >> 8]
+        if isinstance(page, WatchPage) and not any(self.ReadWatches[first:first + 0x100]) and not any(self.WriteWatches[first:first + 0x100]):
+            self.Memory.Pages[address >> 8] = page.Inner
+        if not self.BreakCount and not self.WatchConditions and self in self.CPU.Hooks:
+            self.CPU.Hooks.remove(self)
+
+    def watched(self, address: u32, access: str, value: Byte):
+        if self.Pending is None and self.check(self.WatchConditions.get(address), value):
+            self.Pending = Hit(STOP_WATCHPOINT, address, self.CPU.PC, access, value)
+
+    def __call__(self, cpu: CPU, memory: Mem, cycles: s32):
+        if self.Pending is not None:
+            self.Hit, self.Pending = self.Pending, None
+            return STOP_WATCHPOINT
+        PC: Word = cpu.PC & 0xFFFF
+        resuming: bool = cycles == 0 and PC == self.Resume
+        if cycles == 0:
+            self.Resume = -1
+        if self.Breakpoints[PC] and not resuming and self.check(self.Conditions.get(PC)):
+            self.Hit, self.Resume = Hit(STOP_BREAKPOINT, PC, PC), PC
+            return STOP_BREAKPOINT
+        return None
@@ -0,0 +1,103 @@
+import mmap
+from typing import NamedTuple
+
+from . import Cpu
+from . import Memory
+from . import Trace
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+OPERAND_FORMATS = {
+    "IMP": "", "ACC": "A", "IM": "#${:02X}", "ZP": "${:02X}", "ZPX": "${:02X},X", "ZPY": "${:02X},Y",
+    "INDX": "(${:02X},X)", "INDY": "(${:02X}),Y", "ABS": "${:04X}", "ABSX": "${:04X},X", "ABSY": "${:04X},Y",
+    "IND": "(${:04X})", "REL": "${:04X}"}
+'''Operand syntax of each addressing mode, branches (REL) show their target address'''
+
+class Line(NamedTuple):
+    address: Word
+    data: bytes
+    mnemonic: str
+    '''".byte" for an opcode CPU does not implement'''
+    operand: str
+
+    def __str__(self) -> str:
+        return f"{self.address:04X}  {self.data.hex(' ').upper():<9} {self.mnemonic} {self.operand}".rstrip()
+
+def decodeTable() -> list:
+    """256 entries of (mnemonic, addressing mode, length in bytes), None for opcodes CPU does not implement.
+
+    Lengths are those CPU decodes with (Cpu.OPERAND_BYTES), so listings stay in step with what executes."""
+    table = [None] * 256
+    for entry in Cpu.OPCODES:
+        table[entry.value] = (entry.mnemonic, entry.mode, 1 + Cpu.OPERAND_BYTES[entry.value])
+    return table
+
+TABLE = decodeTable()
+
+def decode(address: Word, data: bytes) -> Line:
+    """Disassemble the instruction whose bytes (opcode first, as many as TABLE says) are data."""
+    entry = TABLE[data[0]]
+    if entry is None:
+        return Line(address, data[:1], ".byte", f"${data[0]:02X}")
+    mnemonic, mode, length = entry
+    operand = int.from_bytes(data[1:length], "little")
+    if mode == "REL":
+        operand = (address + 2 + operand - ((operand & 0x80) << 1)) & 0xFFFF
+    return Line(address, bytes(data[:length]), mnemonic, OPERAND_FORMATS[mode].format(operand))
+
+def disassemble(read, start: u32, end: u32):
+    """Lazily disassemble read(address) from start up to end (an instruction may run past end)."""
+    address = start
+    while address < end:
+        entry = TABLE[read(address)]
+        length = 1 if entry is None else entry[2]
+        line = decode(address & 0xFFFF, bytes(read(address + offset) for offset in range(length)))
+        yield line
+        address += len(line.data)
+
+def disassembleMemory(memory: Mem, start: u32 = 0x0000, end: u32 = 0x10000):
+    """Lines for a range of a Mem, read the way the CPU sees it (addresses wrap at 64K)."""
+    return disassemble(lambda address: memory[address], start, end)
+
+def disassembleFile(path: str, address: Word = 0x0000, offset: u32 = 0, size: u32 = None):
+    """Lines for a ROM image file, memory-mapped so only the bytes being decoded are touched.
+
+    The image is taken from offset (size bytes, or to the end) and listed as if loaded at address."""
+    with open(path, "rb") as file:
+        if not file.seek(0, 2):
+            return
+        image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        end = len(image) if size is None else min(len(image), offset + size)
+        base = address - offset
+        yield from disassemble(lambda at: image[at - base] if at - base < end else 0x00, address, end + base)
+    finally:
+        image.close()
+
+def disassembleTrace(trace, memory: Mem = None):
+    """Lines for every record of a trace (a Trace.TraceFile or its path), in execution order.
+
+    Trace records hold the opcode only, operands are read from memory when one is given and shown
+    as ?? otherwise. A TraceFile opened here from a path is closed when the lines run out (or the
+    generator is closed)."""
+    opened = not isinstance(trace, Trace.TraceFile)
+    if opened:
+        trace = Trace.TraceFile(trace)
+    try:
+        for index in range(len(trace)):
+            record = trace[index]
+            entry = TABLE[record.opcode]
+            length = 1 if entry is None else entry[2]
+            if memory is not None or length == 1:
+                yield decode(record.pc, bytes([record.opcode]) + bytes(memory[record.pc + offset] for offset in range(1, length)))
+            else:
+                mnemonic, mode, length = entry
+                yield Line(record.pc, bytes([record.opcode]), mnemonic, OPERAND_FORMATS[mode].replace("{:02X}", "??").replace("{:04X}", "????"))
+    finally:
+        if opened:
+            trace.close()
@@ -0,0 +1,304 @@
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+MAX_BLOCK: int = 32
+'''Most instructions compiled into a single block'''
+
+# Operand reads per addressing mode: op -> (setup lines, value expression, static cycles of a load).
+# The arithmetic mirrors the CPU._op_* handlers exactly, page-crossing penalties go into extra.
+READS = {
+    "IM":   lambda op: ([], f"{op}", 2),
+    "ZP":   lambda op: ([], f"memory[{op}]", 3),
+    "ZPX":  lambda op: ([], f"memory[({op} + X) & 0xFF]", 4),
+    "ZPY":  lambda op: ([], f"memory[({op} + Y) & 0xFF]", 4),
+    "ABS":  lambda op: ([], f"memory[{op}]", 4),
+    "ABSX": lambda op: ([f"if X > {0xFF - (op & 0xFF)}: extra += 1"], f"memory[{op} + X]", 4),
+    "ABSY": lambda op: ([f"if Y > {0xFF - (op & 0xFF)}: extra += 1"], f"memory[{op} + Y]", 4),
+    "INDX": lambda op: ([f"p = ({op} + X) & 0xFF", "lo = memory[p]"], "memory[(memory[(p + 1) & 0xFF] << 8) | lo]", 6),
+    "INDY": lambda op: ([f"lo = memory[{op}]", f"a = (memory[{(op + 1) & 0xFF}] << 8) | lo", "if lo + Y > 0xFF: extra += 1"], "memory[a + Y]", 5),
+}
+
+# Store addresses per addressing mode: op -> (setup lines, address expression, static cycles of a store, write).
+# write is ("const", address) or ("range", lo, hi) with every address the store can hit in lo..hi-1.
+WRITES = {
+    "ZP":   lambda op: ([], f"{op & 0xFF}", 3, ("const", op & 0xFF)),
+    "ZPX":  lambda op: ([f"a = ({op} + X) & 0xFF"], "a", 4, ("range", 0x00, 0x100)),
+    "ZPY":  lambda op: ([f"a = ({op} + Y) & 0xFF"], "a", 4, ("range", 0x00, 0x100)),
+    "ABS":  lambda op: ([], f"{op}", 4, ("const", op)),
+    "ABSX": lambda op: ([f"if X > {0xFF - (op & 0xFF)}: extra += 1", f"a = ({op} + X) & 0xFFFF"], "a", 5, ("range", 0, 0x10000)),
+    "ABSY": lambda op: ([f"if Y > {0xFF - (op & 0xFF)}: extra += 1", f"a = ({op} + Y) & 0xFFFF"], "a", 5, ("range", 0, 0x10000)),
+    "INDX": lambda op: ([f"p = ({op} + X) & 0xFF", "lo = memory[p]", "a = (memory[(p + 1) & 0xFF] << 8) | lo"], "a", 6, ("range", 0, 0x10000)),
+    "INDY": lambda op: ([f"p = ({op} + Y) & 0xFF", "lo = memory[p]", "a = (memory[(p + 1) & 0xFF] << 8) | lo"], "a", 6, ("range", 0, 0x10000)),
+}
+
+def load(register: str):
+    def emit(mode: str, op: Word) -> tuple:
+        lines, value, cycles = READS[mode](op)
+        return lines + [f"{register} = {value}", f"nz = {register}"], cycles, None
+    return emit
+
+def store(register: str):
+    def emit(mode: str, op: Word) -> tuple:
+        lines, address, cycles, write = WRITES[mode](op)
+        return lines + [f"memory[{address}] = {register}"], cycles, write
+    return emit
+
+def logicAnd(mode: str, op: Word) -> tuple:
+    lines, value, cycles = READS[mode](op)
+    return lines + [f"A = A & {value}", "nz = A"], cycles, None
+
+def logic(operator: str):
+    def emit(mode: str, op: Word) -> tuple:
+        lines, value, cycles = READS[mode](op)
+        return lines + [f"A = A {operator} {value}", "nz = A"], cycles, None
+    return emit
+
+def arithmetic(table: str):
+    # N and Z come from the table too, so a pending nz is simply dropped
+    def emit(mode: str, op: Word) -> tuple:
+        lines, value, cycles = READS[mode](op)
+        return lines + ["P = cpu._P", f"e = {table}[((P & 0x08) << 14) | ((P & 0x01) << 16) | (A << 8) | {value}]",
+                        "A = e & 0xFF", "cpu._P = (P & 0b00111100) | (e >> 8)", "nz = -1"], cycles, None
+    return emit
+
+def compare(register: str):
+    def emit(mode: str, op: Word) -> tuple:
+        lines, value, cycles = READS[mode](op)
+        return lines + [f"d = {register} - {value}", "cpu._P = (cpu._P & 0xFE) | (d >= 0)", "nz = d & 0xFF"], cycles, None
+    return emit
+
+def accumulator(carry: str, result: str):
+    """Shift or rotate of A (the memory forms end the block), carry and result are expressions of A and the old carry c."""
+    def emit(mode: str, op: Word) -> tuple:
+        if mode != "ACC":
+            return None
+        return ["c = cpu._P & 1", f"cpu._P = (cpu._P & 0xFE) | {carry}", f"A = {result}", "nz = A"], 2, None
+    return emit
+
+def fixed(cycles: int, *lines: str, write: tuple = None):
+    return lambda mode, op: (list(lines), cycles, write)
+
+STACK = ("range", 0x0100, 0x0201)
+'''Addresses a push can hit, 0x0100 + SP with SP anywhere from 0x00 to 0x100 (its value after reset)'''
+
+# Code generators keyed by mnemonic, each returns (source lines, static cycles, write) for one instruction.
+# Instructions without a generator (or whose generator returns None for their addressing mode) end the
+# block and run through the interpreter (CPU.step). JSR and PLP are always the last instruction of a block.
+TEMPLATES = {
+    "LDA": load("A"),
+    "LDX": load("X"),
+    "LDY": load("Y"),
+    "STA": store("A"),
+    "STX": store("X"),
+    "STY": store("Y"),
+    "AND": logicAnd,
+    "ORA": logic("|"),
+    "EOR": logic("^"),
+    "ADC": arithmetic("ADC"),
+    "SBC": arithmetic("SBC"),
+    "CMP": compare("A"),
+    "CPX": compare("X"),
+    "CPY": compare("Y"),
+    "ASL": accumulator("(A >> 7)", "(A << 1) & 0xFF"),
+    "LSR": accumulator("(A & 1)", "A >> 1"),
+    "ROL": accumulator("(A >> 7)", "((A << 1) | c) & 0xFF"),
+    "ROR": accumulator("(A & 1)", "(A >> 1) | (c << 7)"),
+    "INX": fixed(2, "X = (X + 1) & 0xFF", "nz = X"),
+    "INY": fixed(2, "Y = (Y + 1) & 0xFF", "nz = Y"),
+    "DEX": fixed(2, "X = (X - 1) & 0xFF", "nz = X"),
+    "DEY": fixed(2, "Y = (Y - 1) & 0xFF", "nz = Y"),
+    "CLC": fixed(2, "cpu._P &= 0xFE"),
+    "SEC": fixed(2, "cpu._P |= 0x01"),
+    "CLD": fixed(2, "cpu._P &= 0xF7"),
+    "SED": fixed(2, "cpu._P |= 0x08"),
+    "CLV": fixed(2, "cpu._P &= 0xBF"),
+    "SEI": fixed(2, "cpu._P |= 0x04"),
+    "TAX": fixed(2, "X = A", "nz = X"),
+    "TAY": fixed(2, "Y = A", "nz = Y"),
+    "TSX": fixed(2, "X = SP & 0xFF", "nz = X"),
+    "TXA": fixed(2, "A = X", "nz = A"),
+    "TXS": fixed(2, "SP = X & 0xFF"),
+    "TYA": fixed(2, "A = Y", "nz = A"),
+    "NOP": fixed(2),
+    "PHA": fixed(3, "a = 0x0100 + SP", "memory[a] = A", "SP = (SP - 1) & 0xFF", write=STACK),
+    "PHP": fixed(3, "cpu._NZ = nz", "nz = -1", "a = 0x0100 + SP", "memory[a] = cpu.P_status | 0b00110000", "SP = (SP - 1) & 0xFF", write=STACK),
+    "PLA": fixed(4, "SP = (SP + 1) & 0xFF", "A = memory[0x0100 + SP]", "nz = A"),
+    "PLP": fixed(4, "SP = (SP + 1) & 0xFF", "cpu.P_status = (memory[0x0100 + SP] & 0b11001111) | 0b00100000", "nz = -1", "cpu.checkIRQ()"),
+}
+
+WRITE_BACK = "cpu.A_reg = A; cpu.X_reg = X; cpu.Y_reg = Y; cpu.SP = SP; cpu._NZ = nz"
+
+class BlockCache(dict):
+    """Compiled blocks keyed by start address, as (function, max cycles, start, end), or None where
+    the first instruction cannot be compiled.
+
+    Like Cpu.DecodeCache it registers with its Mem, so blocks are dropped when writes touch their bytes."""
+    def __init__(self, jit: "JIT", memory: Mem):
+        super().__init__()
+        self.JIT = jit
+        self.Memory = memory
+        self.PageBlocks = [set() for _ in range(256)]
+        '''Start addresses of the blocks with bytes in each page'''
+        memory.CodeWatchers.append(self.invalidate)
+
+    def decodeBlock(self, pc: Word) -> list:
+        """Decode the straight-line run of compilable instructions from pc as (pc, mnemonic, mode, operand, next pc)."""
+        cpu, memory = self.JIT.CPU, self.Memory
+        sizes = cpu.decodeTables()[1]
+        names = self.JIT.Names
+        block = []
+        while len(block) < self.JIT.MaxBlock:
+            Ins: Byte = memory[pc]
+            name = names.get(Ins)
+            if name is None or name[0] != "JSR" and (name[0] not in TEMPLATES or TEMPLATES[name[0]](name[1], 0) is None):
+                break
+            Size: int = sizes[Ins]
+            if pc + Size > 0xFFFF:
+                break
+            Operand: Word = 0 if Size == 0 else memory[pc + 1] if Size == 1 else memory[pc + 1] | (memory[pc + 2] << 8)
+            NextPC: Word = pc + 1 + Size
+            block.append((pc, name[0], name[1], Operand, NextPC))
+            if name[0] in ("JSR", "PLP") or NextPC > 0xFFFF:
+                break
+            pc = NextPC
+        # A store with a fixed address inside the block ends it, so the rest is never stale
+        while block:
+            start, end = block[0][0], min(block[-1][4], 0x10000)
+            for index, (pc, mnemonic, mode, op, _) in enumerate(block):
+                write = TEMPLATES[mnemonic](mode, op)[2] if mnemonic in TEMPLATES else None
+                if write is not None and write[0] == "const" and start <= write[1] < end and index + 1 < len(block):
+                    del block[index + 1:]
+                    break
+            else:
+                break
+        return block
+
+    def compile(self, pc: Word) -> tuple:
+        """Compile the block starting at pc and cache it (None if nothing there can be compiled)."""
+        block = self.decodeBlock(pc)
+        if not block:
+            self[pc] = None
+            self.Memory.watchCode(pc, pc + 1)
+            self.PageBlocks[pc >> 8].add(pc)
+            return None
+
+        start, end = block[0][0], min(block[-1][4], 0x10000)
+        body, resume = [], []
+        spent: int = 0
+        maximum: int = 0
+        for pc, mnemonic, mode, op, NextPC in block:
+            if mnemonic == "JSR":
+                ret = pc + 2
+                lines = ["SP = SP - 2", f"memory[SP] = {ret}", f"memory[SP + 1] = {ret >> 8}"]
+                cycles, write, NextPC = 6, None, op
+            else:
+                lines, cycles, write = TEMPLATES[mnemonic](mode, op)
+            touches = any("memory" in line for line in lines)
+            if touches:
+                body.append(f"at = {len(resume)}")
+                Size: int = Cpu.ADDRESSING_MODES[mode]
+                resume.append(((pc + 1 + Size) & 0xFFFF, spent + 1 + Size))
+            body.extend(lines)
+            spent += cycles
+            maximum += cycles + (1 if mode in ("ABSX", "ABSY", "INDY") else 0)
+            leave = f"    {WRITE_BACK}; cpu.PC = {NextPC & 0xFFFF}; cpu.Cycles -= {spent} + extra; return"
+            if write is not None and write[0] == "range" and write[1] < end and start < write[2] and pc != block[-1][0]:
+                body.append(f"if {start} <= a < {end}:")
+                body.append(leave)
+            # A device read or write that raises an interrupt (or stops the run) ends the slice, leave before the next instruction
+            if touches and pc != block[-1][0]:
+                body.append("if cpu.Cycles <= 0:")
+                body.append(leave)
+        end_pc = NextPC & 0xFFFF
+
+        source = "\n".join([
+            "def block(cpu, memory):",
+            "    A = cpu.A_reg; X = cpu.X_reg; Y = cpu.Y_reg; SP = cpu.SP; nz = cpu._NZ",
+            "    extra = 0",
+            "    at = 0",
+            "    try:",
+            *["        " + line for line in body or ["pass"]],
+            "    except BaseException:",
+            "        cpu.PC, spent = RESUME[at]",
+            f"        {WRITE_BACK}; cpu.Cycles -= spent + extra",
+            "        raise",
+            f"    {WRITE_BACK}; cpu.PC = {end_pc}; cpu.Cycles -= {spent} + extra",
+        ])
+        namespace = {"RESUME": tuple(resume) or ((end_pc, spent),), "ADC": self.JIT.AdcTable, "SBC": self.JIT.SbcTable}
+        exec(compile(source, f"<jit block {start:#06x}>", "exec"), namespace)
+        entry = (namespace["block"], maximum, start, end)
+        self[start] = entry
+        self.Memory.watchCode(start, end)
+        for page in range(start >> 8, ((end - 1) >> 8) + 1):
+            self.PageBlocks[page].add(start)
+        return entry
+
+    def invalidate(self, start: u32, end: u32):
+        """Drop every block (or None marker) with a byte in start..end-1."""
+        for page in range(start >> 8, ((end - 1) >> 8) + 1):
+            starts = self.PageBlocks[page & 0xFF]
+            for pc in list(starts):
+                entry = self.get(pc)
+                last = pc + 1 if entry is None else entry[3]
+                if pc < end and start < last:
+                    self.pop(pc, None)
+                    starts.discard(pc)
+
+    def close(self):
+        self.Memory.CodeWatchers.remove(self.invalidate)
+        self.clear()
+
+class JIT:
+    """Basic-block execution engine for a CPU, a drop-in alternative to CPU.exec.
+
+    Straight-line runs of instructions are compiled into Python functions with the registers in
+    locals and the cycle totals folded in at compile time, then cached by start address. Anything
+    without a code template (and every block that does not fit the remaining cycles) goes through
+    CPU.step, so registers, flags, memory and cycles always match the interpreter."""
+    def __init__(self, cpu: CPU, max_block: int = MAX_BLOCK):
+        self.CPU = cpu
+        self.MaxBlock = max_block
+        self.Names = {entry.value: (entry.mnemonic, entry.mode) for entry in Cpu.OPCODES}
+        '''Opcode -> (mnemonic, addressing mode) of every instruction the CPU implements'''
+        self.AdcTable, self.SbcTable = cpu.arithmeticTables()
+        self.Blocks: BlockCache = None
+
+    def blockCache(self, memory: Mem) -> BlockCache:
+        """Return the block cache for memory, replacing the one kept for a previous Mem."""
+        if self.Blocks is None or self.Blocks.Memory is not memory:
+            if self.Blocks is not None:
+                self.Blocks.close()
+            self.Blocks = BlockCache(self, memory)
+        return self.Blocks
+
+    def exec(self, memory: Mem, cycles: s32) -> s32:
+        cpu = self.CPU
+        if cpu.Hooks:
+            return cpu.exec(memory, cycles)
+        return cpu.runSliced(memory, cycles, self.execSlice)
+
+    def execSlice(self, memory: Mem, cycles: s32) -> s32:
+        """One slice of exec (see CPU.runSliced), blocks are only entered when they fit in what is left of it."""
+        cpu = self.CPU
+        blocks = self.blockCache(memory)
+        cpu.PC &= 0xFFFF
+        cpu.Cycles = cycles
+        while cpu.Cycles > 0:
+            PC: Word = cpu.PC
+            block = blocks.get(PC, blocks)
+            if block is blocks:
+                block = blocks.compile(PC)
+            if block is not None and block[1] <= cpu.Cycles:
+                block[0](cpu, memory)
+            else:
+                cpu.step(memory)
+
+        CYCLES_USED: s32 = cycles - cpu.Cycles
+        return CYCLES_USED
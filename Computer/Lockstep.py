@@ -0,0 +1,396 @@
+try:
+    import numpy as np
+except ImportError: # NumPy is only needed for lockstep execution
+    np = None
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+# Total cycles of each load/store addressing mode, matching the CPU._op_* handlers
+# (ABSX, ABSY and, for loads, INDY take one more when the indexed address crosses a page).
+LOAD_CYCLES = {"IM": 2, "ZP": 3, "ZPX": 4, "ZPY": 4, "ABS": 4, "ABSX": 4, "ABSY": 4, "INDX": 6, "INDY": 5}
+STORE_CYCLES = {"ZP": 3, "ZPX": 4, "ZPY": 4, "ABS": 4, "ABSX": 5, "ABSY": 5, "INDX": 6, "INDY": 6}
+MODIFY_CYCLES = {"ACC": 2, "ZP": 5, "ZPX": 6, "ABS": 6, "ABSX": 7}
+'''Read-modify-write instructions (shifts, rotates, INC and DEC), which always pay the ABSX page-crossing cycle'''
+ALU_READS = ("ADC", "SBC", "ORA", "EOR", "CMP", "CPX", "CPY", "BIT")
+MODIFIES = ("ASL", "LSR", "ROL", "ROR", "INC", "DEC")
+BRANCH_FLAGS = {"BPL": (0x80, 0x00), "BMI": (0x80, 0x80), "BVC": (0x40, 0x00), "BVS": (0x40, 0x40),
+                "BCC": (0x01, 0x00), "BCS": (0x01, 0x01), "BNE": (0x02, 0x00), "BEQ": (0x02, 0x02)}
+'''P_status bit tested by each branch, and the value it branches on'''
+
+class Lockstep:
+    """Many machines running in lockstep, with registers as NumPy arrays (one lane per machine) and
+    memory as a (count, 65536) uint8 array.
+
+    Every step fetches the opcode of each running lane and groups the lanes by opcode, so an
+    instruction costs a few array operations however many lanes execute it. Memory is plain RAM,
+    ROM windows and code caches of Mem are not modelled, and neither are interrupts (BRK and RTI
+    are). Unhandled opcodes behave as in CPU.exec (one cycle, nothing done) without printing."""
+    def __init__(self, count: int):
+        if np is None:
+            raise ImportError("Lockstep execution needs NumPy")
+        self.Count = count
+        self.PC = np.zeros(count, np.int64)
+        self.SP = np.zeros(count, np.int64)
+        self.A_reg = np.zeros(count, np.int64)
+        self.X_reg = np.zeros(count, np.int64)
+        self.Y_reg = np.zeros(count, np.int64)
+        self.P_status = np.full(count, 0b00100000, np.int64)
+        self.Cycles = np.zeros(count, np.int64)
+        '''Cycles left per lane in the current exec budget'''
+        self.Memory = np.zeros((count, 0x10000), np.uint8)
+        adc, sbc = CPU.arithmeticTables()
+        self.AdcTable = np.frombuffer(adc, np.uint16)
+        '''CPU._ADC_TABLE viewed as an array, so every lane's ADC is a single fancy-indexing lookup'''
+        self.SbcTable = np.frombuffer(sbc, np.uint16)
+        self.Handlers = [self.op_NotHandled] * 256
+        self.OperandBytes = np.zeros(256, np.int64)
+        for entry in Cpu.OPCODES:
+            self.Handlers[entry.value] = self.handler(entry.mnemonic, entry.mode)
+            self.OperandBytes[entry.value] = Cpu.ADDRESSING_MODES[entry.mode]
+
+    def reset(self):
+        """Reset every lane like CPU.reset, clearing all memory."""
+        self.PC[:] = 0xFFFC
+        self.SP[:] = 0x0100
+        self.A_reg[:] = self.X_reg[:] = self.Y_reg[:] = 0
+        self.P_status[:] = 0b00100000
+        self.Memory[:] = 0
+
+    def load(self, address: u32, data: bytes):
+        """Copy the same block of bytes into every lane's memory at address."""
+        self.Memory[:, address:address + len(data)] = np.frombuffer(bytes(data), np.uint8)
+
+    def setMachine(self, lane: int, cpu: CPU, memory: Mem):
+        """Copy the registers and memory of a CPU/Mem pair into a lane."""
+        self.PC[lane], self.SP[lane] = cpu.PC & 0xFFFF, cpu.SP
+        self.A_reg[lane], self.X_reg[lane], self.Y_reg[lane] = cpu.A_reg, cpu.X_reg, cpu.Y_reg
+        self.P_status[lane] = cpu.P_status
+        self.Memory[lane] = np.frombuffer(memory.dump(), np.uint8)
+
+    def machine(self, lane: int) -> tuple:
+        """Return a new (CPU, Mem) pair holding the state of a lane."""
+        cpu, memory = CPU(), Mem()
+        cpu.PC, cpu.SP = int(self.PC[lane]), int(self.SP[lane])
+        cpu.A_reg, cpu.X_reg, cpu.Y_reg = int(self.A_reg[lane]), int(self.X_reg[lane]), int(self.Y_reg[lane])
+        cpu.P_status = int(self.P_status[lane])
+        memory.load(0x0000, self.Memory[lane].tobytes())
+        return cpu, memory
+
+    def exec(self, cycles) -> "np.ndarray":
+        """Run every lane for cycles (a number, or one budget per lane) and return the cycles each used."""
+        self.Cycles[:] = cycles
+        budget = self.Cycles.copy()
+        while True:
+            lanes = np.flatnonzero(self.Cycles > 0)
+            if lanes.size == 0:
+                break
+            self.step(lanes)
+        return budget - self.Cycles
+
+    def step(self, lanes: "np.ndarray"):
+        """Execute one instruction on each of the given lanes."""
+        PC = self.PC[lanes]
+        ops = self.Memory[lanes, PC].astype(np.int64)
+        for op in np.flatnonzero(np.bincount(ops, minlength=256)):
+            match = ops == op
+            sel, pc = lanes[match], PC[match]
+            size = int(self.OperandBytes[op])
+            if size == 0:
+                operand = None
+            elif size == 1:
+                operand = self.Memory[sel, (pc + 1) & 0xFFFF].astype(np.int64)
+            else:
+                operand = self.Memory[sel, (pc + 1) & 0xFFFF].astype(np.int64) | (self.Memory[sel, (pc + 2) & 0xFFFF].astype(np.int64) << 8)
+            self.PC[sel] = (pc + 1 + size) & 0xFFFF
+            self.Cycles[sel] -= 1 + size
+            self.Handlers[op](sel, operand)
+
+    # --- Lane helpers ---
+    def read(self, sel, address) -> "np.ndarray":
+        return self.Memory[sel, address & 0xFFFF].astype(np.int64)
+
+    def write(self, sel, address, value):
+        self.Memory[sel, address & 0xFFFF] = value & 0xFF
+
+    def setNZ(self, sel, value):
+        self.P_status[sel] = (self.P_status[sel] & 0b01111101) | (value & 0b10000000) | np.where(value == 0, 0b00000010, 0)
+
+    def setC(self, sel, carry):
+        self.P_status[sel] = (self.P_status[sel] & 0xFE) | carry
+
+    def arithmetic(self, sel, table, value):
+        """ADC or SBC through a CPU arithmetic table, indexed by D, C, A and the value."""
+        P = self.P_status[sel]
+        entry = table[((P & 0x08) << 14) | ((P & 0x01) << 16) | (self.A_reg[sel] << 8) | value].astype(np.int64)
+        self.A_reg[sel] = entry & 0xFF
+        self.P_status[sel] = (P & 0b00111100) | (entry >> 8)
+
+    def compare(self, sel, register, value):
+        difference = register - value
+        self.setC(sel, difference >= 0)
+        self.setNZ(sel, difference & 0xFF)
+
+    def address(self, sel, mode: str, operand, store: bool = False):
+        """Effective address of an operand, charging page-crossing cycles the way the handlers do."""
+        if mode in ("ZP", "ABS"):
+            return operand
+        if mode == "ZPX":
+            return (operand + self.X_reg[sel]) & 0xFF
+        if mode == "ZPY":
+            return (operand + self.Y_reg[sel]) & 0xFF
+        if mode in ("ABSX", "ABSY"):
+            address = operand + (self.X_reg[sel] if mode == "ABSX" else self.Y_reg[sel])
+            self.Cycles[sel] -= (operand & 0xFF00) != (address & 0xFF00)
+            return address
+        if mode == "INDX":
+            pointer = (operand + self.X_reg[sel]) & 0xFF
+            return self.read(sel, pointer) | (self.read(sel, (pointer + 1) & 0xFF) << 8)
+        if store: # STA (zp),Y indexes the pointer, as in CPU._op_STA_INDY
+            pointer = (operand + self.Y_reg[sel]) & 0xFF
+            return self.read(sel, pointer) | (self.read(sel, (pointer + 1) & 0xFF) << 8)
+        base = self.read(sel, operand) | (self.read(sel, (operand + 1) & 0xFF) << 8)
+        address = base + self.Y_reg[sel]
+        self.Cycles[sel] -= (base & 0xFF00) != (address & 0xFF00)
+        return address
+
+    def handler(self, mnemonic: str, mode: str):
+        """Build the lane handler for one instruction, from its mnemonic and addressing mode."""
+        size = Cpu.ADDRESSING_MODES[mode]
+        registers = {"A": "A_reg", "X": "X_reg", "Y": "Y_reg"}
+        if mnemonic in ("LDA", "LDX", "LDY", "AND"):
+            target = registers["A" if mnemonic == "AND" else mnemonic[2]]
+            extra = LOAD_CYCLES[mode] - 1 - size
+            def load(sel, operand):
+                self.Cycles[sel] -= extra
+                value = operand if mode == "IM" else self.read(sel, self.address(sel, mode, operand))
+                if mnemonic == "AND":
+                    value = self.A_reg[sel] & value
+                getattr(self, target)[sel] = value
+                self.setNZ(sel, value)
+            return load
+        if mnemonic in ("STA", "STX", "STY"):
+            source = registers[mnemonic[2]]
+            extra = STORE_CYCLES[mode] - 1 - size
+            def store(sel, operand):
+                self.Cycles[sel] -= extra
+                self.write(sel, self.address(sel, mode, operand, store=True), getattr(self, source)[sel])
+            return store
+        if mnemonic in ("TAX", "TAY", "TSX", "TXA", "TXS", "TYA"):
+            source = "SP" if mnemonic[1] == "S" else registers[mnemonic[1]]
+            target = "SP" if mnemonic[2] == "S" else registers[mnemonic[2]]
+            def transfer(sel, operand):
+                self.Cycles[sel] -= 1
+                value = getattr(self, source)[sel] & 0xFF if "S" in mnemonic[1:] else getattr(self, source)[sel]
+                getattr(self, target)[sel] = value
+                if target != "SP":
+                    self.setNZ(sel, value)
+            return transfer
+        if mnemonic in ALU_READS:
+            extra = LOAD_CYCLES[mode] - 1 - size
+            operation = getattr(self, "op_" + mnemonic)
+            def alu(sel, operand):
+                self.Cycles[sel] -= extra
+                operation(sel, operand if mode == "IM" else self.read(sel, self.address(sel, mode, operand)))
+            return alu
+        if mnemonic in MODIFIES:
+            extra = MODIFY_CYCLES[mode] - 1 - size
+            operation = getattr(self, "op_" + mnemonic)
+            def modify(sel, operand):
+                self.Cycles[sel] -= extra
+                if mode == "ACC":
+                    self.A_reg[sel] = operation(sel, self.A_reg[sel])
+                    return
+                address = operand + self.X_reg[sel] if mode == "ABSX" else self.address(sel, mode, operand)
+                self.write(sel, address, operation(sel, self.read(sel, address)))
+            return modify
+        if mnemonic == "JMP":
+            def jump(sel, operand):
+                if mode == "IND": # the high byte comes from the same page, as in CPU._op_JMP_IND
+                    self.Cycles[sel] -= 2
+                    operand = self.read(sel, operand) | (self.read(sel, (operand & 0xFF00) | ((operand + 1) & 0xFF)) << 8)
+                self.PC[sel] = operand
+            return jump
+        if mnemonic in BRANCH_FLAGS:
+            flag, wanted = BRANCH_FLAGS[mnemonic]
+            def branch(sel, operand):
+                taken = (self.P_status[sel] & flag) == wanted
+                sel, operand = sel[taken], operand[taken]
+                pc = self.PC[sel]
+                target = (pc + operand - ((operand & 0x80) << 1)) & 0xFFFF
+                self.Cycles[sel] -= 1 + ((target & 0xFF00) != (pc & 0xFF00))
+                self.PC[sel] = target
+            return branch
+        return getattr(self, "op_" + mnemonic)
+
+    # --- ALU operations, on the operand value of each lane ---
+    def op_ADC(self, sel, value):
+        self.arithmetic(sel, self.AdcTable, value)
+
+    def op_SBC(self, sel, value):
+        self.arithmetic(sel, self.SbcTable, value)
+
+    def op_ORA(self, sel, value):
+        self.A_reg[sel] |= value
+        self.setNZ(sel, self.A_reg[sel])
+
+    def op_EOR(self, sel, value):
+        self.A_reg[sel] ^= value
+        self.setNZ(sel, self.A_reg[sel])
+
+    def op_CMP(self, sel, value):
+        self.compare(sel, self.A_reg[sel], value)
+
+    def op_CPX(self, sel, value):
+        self.compare(sel, self.X_reg[sel], value)
+
+    def op_CPY(self, sel, value):
+        self.compare(sel, self.Y_reg[sel], value)
+
+    def op_BIT(self, sel, value):
+        self.P_status[sel] = (self.P_status[sel] & 0b00111101) | (value & 0b11000000) | np.where(self.A_reg[sel] & value, 0, 0b00000010)
+
+    # Read-modify-write operations return the new value
+    def op_ASL(self, sel, value):
+        self.setC(sel, value >> 7)
+        result = (value << 1) & 0xFF
+        self.setNZ(sel, result)
+        return result
+
+    def op_LSR(self, sel, value):
+        self.setC(sel, value & 1)
+        result = value >> 1
+        self.setNZ(sel, result)
+        return result
+
+    def op_ROL(self, sel, value):
+        result = ((value << 1) | (self.P_status[sel] & 1)) & 0xFF
+        self.setC(sel, value >> 7)
+        self.setNZ(sel, result)
+        return result
+
+    def op_ROR(self, sel, value):
+        result = (value >> 1) | ((self.P_status[sel] & 1) << 7)
+        self.setC(sel, value & 1)
+        self.setNZ(sel, result)
+        return result
+
+    def op_INC(self, sel, value):
+        result = (value + 1) & 0xFF
+        self.setNZ(sel, result)
+        return result
+
+    def op_DEC(self, sel, value):
+        result = (value - 1) & 0xFF
+        self.setNZ(sel, result)
+        return result
+
+    def op_INX(self, sel, operand):
+        self.X_reg[sel] = (self.X_reg[sel] + 1) & 0xFF
+        self.setNZ(sel, self.X_reg[sel])
+        self.Cycles[sel] -= 1
+
+    def op_INY(self, sel, operand):
+        self.Y_reg[sel] = (self.Y_reg[sel] + 1) & 0xFF
+        self.setNZ(sel, self.Y_reg[sel])
+        self.Cycles[sel] -= 1
+
+    def op_DEX(self, sel, operand):
+        self.X_reg[sel] = (self.X_reg[sel] - 1) & 0xFF
+        self.setNZ(sel, self.X_reg[sel])
+        self.Cycles[sel] -= 1
+
+    def op_DEY(self, sel, operand):
+        self.Y_reg[sel] = (self.Y_reg[sel] - 1) & 0xFF
+        self.setNZ(sel, self.Y_reg[sel])
+        self.Cycles[sel] -= 1
+
+    def op_CLC(self, sel, operand):
+        self.P_status[sel] &= ~0b00000001
+        self.Cycles[sel] -= 1
+
+    def op_SEC(self, sel, operand):
+        self.P_status[sel] |= 0b00000001
+        self.Cycles[sel] -= 1
+
+    def op_CLD(self, sel, operand):
+        self.P_status[sel] &= ~0b00001000
+        self.Cycles[sel] -= 1
+
+    def op_SED(self, sel, operand):
+        self.P_status[sel] |= 0b00001000
+        self.Cycles[sel] -= 1
+
+    def op_CLV(self, sel, operand):
+        self.P_status[sel] &= ~0b01000000
+        self.Cycles[sel] -= 1
+
+    def op_JSR(self, sel, operand):
+        self.SP[sel] -= 2
+        Return = self.PC[sel] - 1
+        self.write(sel, self.SP[sel], Return)
+        self.write(sel, self.SP[sel] + 1, Return >> 8)
+        self.PC[sel] = operand
+        self.Cycles[sel] -= 3
+
+    def op_NOP(self, sel, operand):
+        pass
+
+    def op_PHA(self, sel, operand):
+        self.write(sel, 0x0100 + self.SP[sel], self.A_reg[sel])
+        self.SP[sel] = (self.SP[sel] - 1) & 0xFF
+        self.Cycles[sel] -= 2
+
+    def op_PHP(self, sel, operand):
+        self.write(sel, 0x0100 + self.SP[sel], self.P_status[sel] | 0b00110000)
+        self.SP[sel] = (self.SP[sel] - 1) & 0xFF
+        self.Cycles[sel] -= 2
+
+    def op_PLA(self, sel, operand):
+        self.SP[sel] = (self.SP[sel] + 1) & 0xFF
+        self.A_reg[sel] = self.read(sel, 0x0100 + self.SP[sel])
+        self.setNZ(sel, self.A_reg[sel])
+        self.Cycles[sel] -= 3
+
+    def op_PLP(self, sel, operand):
+        self.SP[sel] = (self.SP[sel] + 1) & 0xFF
+        self.P_status[sel] = (self.read(sel, 0x0100 + self.SP[sel]) & 0b11001111) | 0b00100000
+        self.Cycles[sel] -= 3
+
+    def op_SEI(self, sel, operand):
+        self.P_status[sel] |= 0b00000100
+        self.Cycles[sel] -= 1
+
+    def op_CLI(self, sel, operand):
+        self.P_status[sel] &= ~0b00000100
+        self.Cycles[sel] -= 1
+
+    def op_BRK(self, sel, operand):
+        pc = (self.PC[sel] + 1) & 0xFFFF
+        sp = self.SP[sel]
+        for value in (pc >> 8, pc & 0xFF, self.P_status[sel] | 0b00110000):
+            self.write(sel, 0x0100 + sp, value)
+            sp = (sp - 1) & 0xFF
+        self.SP[sel] = sp
+        self.P_status[sel] |= 0b00000100
+        self.PC[sel] = self.read(sel, 0xFFFE) | (self.read(sel, 0xFFFF) << 8)
+        self.Cycles[sel] -= 6
+
+    def op_RTI(self, sel, operand):
+        sp = (self.SP[sel] + 1) & 0xFF
+        self.P_status[sel] = (self.read(sel, 0x0100 + sp) & 0b11001111) | 0b00100000
+        low = self.read(sel, 0x0100 + ((sp + 1) & 0xFF))
+        sp = (sp + 2) & 0xFF
+        self.PC[sel] = low | (self.read(sel, 0x0100 + sp) << 8)
+        self.SP[sel] = sp
+        self.Cycles[sel] -= 5
+
+    def op_NotHandled(self, sel, operand):
+        pass
@@ -1,28 +1,298 @@
-Byte = int
-Word = int
-u32 = int
-s32 = int
-
-class Mem:
-    def __init__(self):
-        self.MAX_MEM: u32 = 1024 * 64
-        self.Data = [0] * self.MAX_MEM
-
-    def __getitem__(self, address: Byte) -> int:
-        return self.Data[address & 0xFFFF]
-    
-    def __setitem__(self, address: Byte, value: int):
-        self.Data[address & 0xFFFF] = value
-
-    def init(self):
-        self.Data = [0] * self.MAX_MEM
-
-    def WriteWord(self, cycles: list, address: u32, data: Word):
-        self.Data[address]     = data & 0xFF
-        self.Data[address + 1] = (data >> 8) & 0xFF
-        cycles[0] -= 2
-
-    def WriteByte(self, cycles: list, address: u32, data: Byte):
-        self.Data[address] = data & 0xFF
-        cycles[0] -= 1
-
+import mmap
+from typing import NamedTuple
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+
+class RomWriteError(Exception):
+    """Raised when something writes into a ROM window mapped with on_write="trap"."""
+
+EMPTY_RAM = bytes(0x10000)
+'''All-zero RAM image that init clears from, shared rather than allocated per clear'''
+MAX_DELTA_CHAIN = 32
+'''Incremental snapshots stacked on one full image before Mem.snapshot takes a full one again'''
+
+class MemoryDelta(NamedTuple):
+    """Incremental RAM snapshot: the 256-byte pages changed since Parent (a full bytes image or another delta)."""
+    Parent: object
+    Pages: tuple
+    '''(page number, 256 bytes) pairs'''
+    Depth: int
+
+def applyImage(buffer: bytearray, image):
+    """Copy a RAM snapshot (bytes or MemoryDelta) into buffer, replaying a delta chain from its full image."""
+    chain = []
+    while isinstance(image, MemoryDelta):
+        chain.append(image)
+        image = image.Parent
+    buffer[:] = image
+    for delta in reversed(chain):
+        for page, data in delta.Pages:
+            buffer[page << 8:(page + 1) << 8] = data
+
+def checkWindow(address: u32, size: u32):
+    if address & 0xFF or size & 0xFF or size <= 0:
+        raise ValueError("Mapped windows must start on a page boundary and span whole pages")
+    if address + size > 0x10000:
+        raise ValueError(f"Window {address:#06x}+{size:#x} does not fit the address space")
+
+class Rom:
+    """A read-only window of a ROM image, backed by mmap so the image lives in the page cache.
+
+    image is either a path to the image file or a buffer that is already mapped (for example
+    the Map of another Rom), so many machines can share one mapping."""
+    POLICIES = ("ignore", "trap")
+
+    def __init__(self, image, address: u32, offset: u32 = 0, size: u32 = None, on_write: str = "ignore"):
+        if on_write not in self.POLICIES:
+            raise ValueError(f"Unknown ROM write policy: {on_write!r}")
+        self.OwnsMap = isinstance(image, str) or hasattr(image, "__fspath__")
+        if self.OwnsMap:
+            with open(image, "rb") as file:
+                image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if size is None:
+            size = len(image) - offset
+        checkWindow(address, size)
+        if offset < 0 or offset + size > len(image):
+            raise ValueError(f"ROM window {address:#06x}+{size:#x} does not fit the image")
+        self.Map = image
+        self.Address, self.Size = address, size
+        self.Base: s32 = address - offset
+        '''Subtracted from a CPU address to get the index into Map'''
+        self.OnWrite = on_write
+
+    def read(self, address: u32) -> Byte:
+        return self.Map[address - self.Base]
+
+    def write(self, address: u32, value: Byte):
+        if self.OnWrite == "trap":
+            raise RomWriteError(f"Write of {value:#04x} to ROM at {address:#06x}")
+
+    def close(self):
+        if self.OwnsMap:
+            self.Map.close()
+
+class Device:
+    """Memory-mapped I/O on whole pages: reads and writes there call read(address) and
+    write(address, value) with the full CPU address instead of touching RAM.
+
+    Without a read callback the device reads as 0x00, without a write callback writes are dropped."""
+    def __init__(self, address: u32, size: u32 = 0x100, read=None, write=None):
+        checkWindow(address, size)
+        self.Address, self.Size = address, size
+        self.Read, self.Write = read, write
+
+    def read(self, address: u32) -> Byte:
+        return self.Read(address) & 0xFF if self.Read is not None else 0x00
+
+    def write(self, address: u32, value: Byte):
+        if self.Write is not None:
+            self.Write(address, value)
+
+class Mem:
+    def __init__(self):
+        self.MAX_MEM: u32 = 1024 * 64
+        self.Data = bytearray(self.MAX_MEM)
+        self._View = memoryview(self.Data)
+        '''Writable zero-copy view of Data, for bulk copies that do their own code and dirty page bookkeeping'''
+        self.View = self._View.toreadonly()
+        '''Read-only zero-copy view of Data, slices of it share the underlying buffer (write through the Mem,
+        so code caches and dirty pages see the change)'''
+        self.Pages = [None] * 256
+        '''Page table: the Rom or Device handling each 256-byte page, None for plain RAM (read straight from Data)'''
+        self.CodePages = bytearray(256)
+        '''Non-zero for pages holding bytes that a code cache (see Cpu.DecodeCache) has decoded'''
+        self.CodeWatchers = []
+        '''invalidate(start, end) callbacks of the code caches, told about writes to CodePages'''
+        self.DirtyPages = None
+        '''Non-zero for RAM pages written since the last snapshot, None unless trackDirty was called'''
+        self.LastImage = None
+        '''RAM image of the last snapshot (or restore), the base for the next incremental snapshot'''
+
+    def __getitem__(self, address: Byte) -> int:
+        address &= 0xFFFF
+        page = self.Pages[address >> 8]
+        if page is None:
+            return self.Data[address]
+        return page.read(address)
+
+    def __setitem__(self, address: Byte, value: int):
+        address &= 0xFFFF
+        page = self.Pages[address >> 8]
+        if page is None:
+            self.Data[address] = value & 0xFF
+            if self.DirtyPages is not None:
+                self.DirtyPages[address >> 8] = 1
+            if self.CodePages[address >> 8]:
+                self.codeWritten(address, address + 1)
+        else:
+            page.write(address, value & 0xFF)
+
+    def init(self):
+        """Clear memory in place, the buffer (and any view of it) stays valid. ROM windows and devices stay mapped."""
+        self.Data[:] = EMPTY_RAM
+        self.ramWritten(0x0000, 0x10000)
+
+    def trackDirty(self):
+        """Start tracking written pages, so every snapshot after the next full one only stores the pages that changed."""
+        self.DirtyPages = bytearray(256)
+        self.LastImage = None
+
+    def snapshot(self) -> tuple:
+        """Return (RAM, pages): an immutable image of RAM and the page table, whose ROM windows and devices are shared, not copied.
+
+        The RAM image is bytes, or a MemoryDelta against the previous snapshot while dirty pages are tracked."""
+        dirty = self.DirtyPages
+        if dirty is None:
+            return bytes(self.Data), tuple(self.Pages)
+        base = self.LastImage
+        if base is not None and not any(dirty):
+            return base, tuple(self.Pages)
+        changed = []
+        page = dirty.find(1)
+        while page >= 0:
+            changed.append(page)
+            page = dirty.find(1, page + 1)
+        if base is None or len(changed) > 128 or (isinstance(base, MemoryDelta) and base.Depth >= MAX_DELTA_CHAIN):
+            image = bytes(self.Data)
+        else:
+            view = self.View
+            image = MemoryDelta(base, tuple((page, bytes(view[page << 8:(page + 1) << 8])) for page in changed),
+                                base.Depth + 1 if isinstance(base, MemoryDelta) else 1)
+        dirty[:] = bytes(256)
+        self.LastImage = image
+        return image, tuple(self.Pages)
+
+    def restore(self, data, pages: tuple = None):
+        """Put back RAM (and the page table if given) from snapshot, copying in place so views stay valid."""
+        applyImage(self.Data, data)
+        if pages is not None:
+            self.Pages = list(pages)
+        if self.DirtyPages is not None:
+            self.DirtyPages[:] = bytes(256)
+            self.LastImage = data
+        self.codeWritten(0x0000, 0x10000)
+
+    def revert(self, image: bytes, pages: tuple = None):
+        """Put RAM back to image like restore, but copy only the pages written since image was taken or last
+        restored. That needs dirty pages tracked with no other snapshot or restore in between (image is then
+        LastImage), otherwise all of RAM is copied."""
+        dirty = self.DirtyPages
+        if dirty is None or self.LastImage is not image or isinstance(image, MemoryDelta):
+            self.restore(image, pages)
+            return
+        if pages is not None:
+            self.Pages = list(pages)
+        view, source = self._View, memoryview(image)
+        page = dirty.find(1)
+        while page >= 0:
+            view[page << 8:(page + 1) << 8] = source[page << 8:(page + 1) << 8]
+            self.codeWritten(page << 8, (page + 1) << 8)
+            page = dirty.find(1, page + 1)
+        dirty[:] = bytes(256)
+
+    def fork(self) -> "Mem":
+        """Return a new Mem with its own copy of RAM and the same ROM windows and devices mapped (and dirty page state)."""
+        child = Mem()
+        child.Data[:] = self.Data
+        child.Pages = list(self.Pages)
+        if self.DirtyPages is not None:
+            child.DirtyPages = bytearray(self.DirtyPages)
+            child.LastImage = self.LastImage
+        return child
+
+    def watchCode(self, start: u32, end: u32):
+        """Mark the pages of start..end-1 (wrapping at 64K) as holding cached code."""
+        for page in range(start >> 8, ((end - 1) >> 8) + 1):
+            self.CodePages[page & 0xFF] = 1
+
+    def ramWritten(self, start: u32, end: u32):
+        """Record a bulk write to RAM from start up to (not including) end."""
+        if self.DirtyPages is not None and end > start:
+            first, last = start >> 8, ((end - 1) >> 8) + 1
+            self.DirtyPages[first:last] = b"\x01" * (last - first)
+        self.codeWritten(start, end)
+
+    def codeWritten(self, start: u32, end: u32):
+        """Tell the code caches that start..end-1 changed, if any of it holds cached code."""
+        if self.CodeWatchers and any(self.CodePages[start >> 8:((end - 1) >> 8) + 1]):
+            for watcher in self.CodeWatchers:
+                watcher(start, end)
+
+    def WriteWord(self, cycles: list, address: u32, data: Word):
+        self[address]     = data
+        self[address + 1] = data >> 8
+        cycles[0] -= 2
+
+    def WriteByte(self, cycles: list, address: u32, data: Byte):
+        self[address] = data
+        cycles[0] -= 1
+
+    def mapRom(self, image, address: u32 = None, offset: u32 = 0, size: u32 = None, on_write: str = "ignore") -> Rom:
+        """Map a ROM image file (or an already mapped buffer, or an existing Rom) read-only at address,
+        which an existing Rom already has and may leave out.
+
+        Writes into the window are ignored or raise RomWriteError depending on on_write."""
+        if isinstance(image, Rom):
+            rom = image
+        elif address is None:
+            raise ValueError("Mapping a ROM image needs the address to map it at")
+        else:
+            rom = Rom(image, address, offset, size, on_write)
+        return self.mapPages(rom)
+
+    def mapDevice(self, device, size: u32 = 0x100, read=None, write=None) -> Device:
+        """Map a Device (or a new one at address device, with the read/write callbacks) over its pages.
+
+        Only the device's own pages pay for the callbacks, every other access still indexes Data directly."""
+        if not isinstance(device, Device):
+            device = Device(device, size, read, write)
+        return self.mapPages(device)
+
+    def mapPages(self, handler):
+        first, count = handler.Address >> 8, handler.Size >> 8
+        self.Pages[first:first + count] = [handler] * count
+        self.codeWritten(handler.Address, handler.Address + handler.Size)
+        return handler
+
+    def unmap(self, handler):
+        """Remove a ROM window or device, the RAM underneath becomes visible again."""
+        self.Pages = [None if page is handler else page for page in self.Pages]
+        self.codeWritten(handler.Address, handler.Address + handler.Size)
+
+    def unmapRom(self, rom: Rom):
+        self.unmap(rom)
+
+    def checkRange(self, start: u32, end: u32):
+        if not 0 <= start <= end <= self.MAX_MEM:
+            raise ValueError(f"Invalid memory range: {start:#06x}-{end:#06x}")
+
+    def load(self, address: u32, data: bytes):
+        """Copy a block of bytes into memory starting at address, with a single slice assignment.
+
+        Like fill and copy, this always writes RAM, including the RAM underneath a ROM window or device."""
+        self.checkRange(address, address + len(data))
+        self.Data[address:address + len(data)] = data
+        self.ramWritten(address, address + len(data))
+
+    def dump(self, start: u32 = 0x0000, end: u32 = 0x10000) -> bytes:
+        """Return a copy of memory from start up to (not including) end, as the CPU sees it (device pages are read through the device)."""
+        self.checkRange(start, end)
+        if not any(self.Pages[start >> 8:(end + 0xFF) >> 8]):
+            return bytes(self.View[start:end])
+        return bytes(self[address] for address in range(start, end))
+
+    def fill(self, start: u32, end: u32, value: Byte = 0x00):
+        """Set every byte from start up to (not including) end to value."""
+        self.checkRange(start, end)
+        self.Data[start:end] = bytes([value & 0xFF]) * (end - start)
+        self.ramWritten(start, end)
+
+    def copy(self, source: u32, destination: u32, length: u32):
+        """Copy length bytes from source to destination, overlapping ranges are handled like memmove."""
+        self.checkRange(source, source + length)
+        self.checkRange(destination, destination + length)
+        self.Data[destination:destination + length] = self.Data[source:source + length]
+        self.ramWritten(destination, destination + length)
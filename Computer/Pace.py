@@ -0,0 +1,99 @@
+import time
+from typing import NamedTuple
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+NTSC_HZ: float = 1.789773e6
+'''NES (NTSC) CPU clock'''
+PAL_HZ: float = 1.662607e6
+'''NES (PAL) CPU clock'''
+
+class PaceResult(NamedTuple):
+    """What a paced run did: cycles executed over seconds of wall-clock time, and how late it ran."""
+    cycles: int
+    seconds: float
+    lag: float
+    '''Seconds behind real time when the run ended, 0.0 when it kept up'''
+    max_lag: float
+    late_frames: int
+    '''Frames that finished after their deadline'''
+    dropped: float
+    '''Seconds of lag given up (see Pacer.MaxLag) instead of being caught up'''
+
+class Pacer:
+    """Runs a CPU (or anything with the same exec, such as Jit.JIT or Profile.Profiler) at a real clock rate.
+
+    Execution goes in frames of frequency / frame_rate cycles. After each frame the pacer compares the
+    cycles run so far with a monotonic clock and sleeps until the frame's deadline, so there is one clock
+    read and at most one sleep per frame rather than per instruction. Deadlines come from the start of the
+    run, not the previous frame, so oversleeping and instructions overshooting a frame never accumulate
+    into drift. When the host cannot keep up, the pacer runs frames back to back and reports the lag; once
+    that exceeds MaxLag the lag is dropped rather than caught up in a burst."""
+    def __init__(self, cpu: CPU, frequency: float = 1.0e6, frame_rate: float = 60.0, engine=None,
+                 max_lag: float = 0.25, clock=time.monotonic, sleep=time.sleep):
+        if frequency <= 0 or frame_rate <= 0:
+            raise ValueError("frequency and frame_rate must be positive")
+        self.CPU = cpu
+        self.Engine = engine if engine is not None else cpu
+        '''What executes the frames, engine.exec(memory, cycles)'''
+        self.Frequency = frequency
+        self.FrameCycles: s32 = max(1, round(frequency / frame_rate))
+        self.MaxLag = max_lag
+        self.Clock = clock
+        self.Sleep = sleep
+        self.Frame = None
+        '''Optional frame(cpu, memory) callback run after every frame (display refresh, input polling ...),
+        a true result ends the run'''
+        self.Lag: float = 0.0
+        '''Seconds behind real time after the last frame'''
+        self.Running = False
+
+    def stop(self):
+        """End the current run after the frame being executed, from a hook, device or Frame callback."""
+        self.Running = False
+
+    def run(self, memory: Mem, cycles: int = None, seconds: float = None) -> PaceResult:
+        """Run until cycles have been executed or seconds of emulated time have passed, a CPU hook stops
+        a frame short, or stop is called. With neither limit the run goes on until one of the latter."""
+        if seconds is not None:
+            limit = round(seconds * self.Frequency)
+            cycles = limit if cycles is None else min(cycles, limit)
+        execute, clock, sleep = self.Engine.exec, self.Clock, self.Sleep
+        frequency, frame = self.Frequency, self.Frame
+        start: float = clock()
+        base: float = start # wall-clock time of emulated cycle 0, moved forward when lag is dropped
+        done: int = 0
+        maxLag: float = 0.0
+        late: int = 0
+        dropped: float = 0.0
+        self.Lag = 0.0
+        self.Running = True
+        while self.Running and (cycles is None or done < cycles):
+            budget: s32 = self.FrameCycles if cycles is None else min(self.FrameCycles, cycles - done)
+            used: s32 = execute(memory, budget)
+            done += used
+            if used < budget or frame is not None and frame(self.CPU, memory):
+                self.Running = False # a short frame means a CPU hook (such as a breakpoint) stopped it
+            deadline: float = base + done / frequency
+            now: float = clock()
+            if now < deadline:
+                self.Lag = 0.0
+                sleep(deadline - now)
+                continue
+            self.Lag = now - deadline
+            late += 1
+            maxLag = max(maxLag, self.Lag)
+            if self.Lag > self.MaxLag:
+                dropped += self.Lag
+                base += self.Lag
+                self.Lag = 0.0
+        self.Running = False
+        return PaceResult(done, clock() - start, self.Lag, maxLag, late, dropped)
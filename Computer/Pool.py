@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+class Machine:
+    """A pooled CPU and Mem with the baseline state reset puts them back to. Unpacks as (cpu, memory)."""
+    def __init__(self, cpu: CPU, memory: Mem):
+        self.CPU = cpu
+        self.Memory = memory
+        memory.trackDirty()
+        self.Baseline: Cpu.Snapshot = cpu.snapshot(memory)
+        '''Registers, full RAM image and page table to reset to, RAM writes are tracked from here'''
+        self.Predecode: bool = cpu.Predecode
+        '''Whether the CPU was built to predecode, reset switches it back'''
+        self.Jobs: int = 0
+        '''Times the machine has been handed out'''
+
+    def __iter__(self):
+        return iter((self.CPU, self.Memory))
+
+    def reset(self):
+        """Back to the baseline, copying only the RAM pages written since (see CPU.revert)."""
+        self.CPU.revert(self.Memory, self.Baseline, self.Predecode)
+
+class MachinePool:
+    """Reusable machines for harnesses that run many short jobs, where building and clearing a fresh
+    CPU and 64K Mem per job would cost as much as running it.
+
+    Every machine starts from a reset CPU and Mem, prepared once by setup(cpu, memory) when given (loading
+    code, mapping ROMs and devices, setting registers ...), and that state becomes its baseline. Machines are
+    reset on release, in place: the registers and run state are restored and only the RAM pages the job wrote
+    are copied back, so handing out a machine again costs next to nothing.
+
+        with pool.machine() as (cpu, memory):
+            cpu.exec(memory, 500)
+
+    Jobs should leave the page table and the code caches of other engines alone, or undo them: ROM windows and
+    devices mapped by a job are dropped on reset, but a Jit.JIT (or anything else registered in CodeWatchers)
+    stays registered with the memory until closed."""
+    def __init__(self, setup=None, size: int = 0, predecode: bool = False):
+        self.Setup = setup
+        self.Predecode = predecode
+        self.Free = []
+        '''Machines ready to be handed out, all at their baseline'''
+        self.Created: int = 0
+        for _ in range(size):
+            self.Free.append(self.create())
+
+    def __len__(self) -> int:
+        return len(self.Free)
+
+    def create(self) -> Machine:
+        cpu, memory = CPU(predecode=self.Predecode), Mem()
+        cpu.reset(memory)
+        if self.Setup is not None:
+            self.Setup(cpu, memory)
+        self.Created += 1
+        return Machine(cpu, memory)
+
+    def acquire(self) -> Machine:
+        """Hand out a machine at its baseline, building a new one when none is free."""
+        machine = self.Free.pop() if self.Free else self.create()
+        machine.Jobs += 1
+        return machine
+
+    def release(self, machine: Machine):
+        """Reset a machine and take it back."""
+        machine.reset()
+        self.Free.append(machine)
+
+    @contextmanager
+    def machine(self):
+        """Acquire a machine for the duration of a with block, releasing it however the block ends."""
+        machine = self.acquire()
+        try:
+            yield machine
+        finally:
+            self.release(machine)
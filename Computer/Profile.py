@@ -0,0 +1,108 @@
+from array import array
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+class Profiler:
+    """Profiling execution engine for a CPU, a drop-in alternative to CPU.exec.
+
+    Every instruction goes through CPU.step, and its execution and cycles are counted in fixed-size
+    arrays indexed by opcode and by PC, so the bookkeeping per instruction is a handful of array
+    updates whatever the program does. Cycles are also charged to the current JSR call stack (frames
+    are dropped once SP climbs back above them), for export in the collapsed-stack format."""
+    def __init__(self, cpu: CPU, labels: dict = None):
+        self.CPU = cpu
+        self.Labels = labels or {}
+        '''Address -> name used for call stack frames, other frames are named $XXXX'''
+        self.Names = {entry.value: entry.name[4:] for entry in Cpu.OPCODES}
+        self.OpcodeCounts = array("Q", bytes(8 * 256))
+        self.OpcodeCycles = array("Q", bytes(8 * 256))
+        self.PCCounts = array("Q", bytes(8 * 0x10000))
+        self.PCCycles = array("Q", bytes(8 * 0x10000))
+        self.Stacks = {}
+        '''Collapsed call stack ("frame;frame;...") -> cycles spent with it on top'''
+        self.Frames = []
+        '''Current call stack as (SP after the JSR, collapsed stack string) pairs'''
+        self.Root: str = None
+
+    def frameName(self, address: Word) -> str:
+        return self.Labels.get(address, f"${address:04X}")
+
+    def exec(self, memory: Mem, cycles: s32) -> s32:
+        """Profile cycles of execution, idle loops included: they are executed rather than fast-forwarded."""
+        cpu = self.CPU
+        fastForward, cpu.FastForward = cpu.FastForward, False
+        try:
+            return cpu.runSliced(memory, cycles, self.execSlice)
+        finally:
+            cpu.FastForward = fastForward
+
+    def execSlice(self, memory: Mem, cycles: s32) -> s32:
+        cpu = self.CPU
+        step = cpu.step
+        opcodeCounts, opcodeCycles = self.OpcodeCounts, self.OpcodeCycles
+        pcCounts, pcCycles = self.PCCounts, self.PCCycles
+        stacks, frames = self.Stacks, self.Frames
+        if self.Root is None:
+            self.Root = self.frameName(cpu.PC & 0xFFFF)
+        jsr = cpu.INS_JSR
+        cpu.Cycles = cycles
+        while cpu.Cycles > 0:
+            PC: Word = cpu.PC & 0xFFFF
+            Ins: Byte = memory[PC]
+            while frames and cpu.SP > frames[-1][0]:
+                frames.pop()
+            Stack: str = frames[-1][1] if frames else self.Root
+            Taken: s32 = step(memory)
+            opcodeCounts[Ins] += 1
+            opcodeCycles[Ins] += Taken
+            pcCounts[PC] += 1
+            pcCycles[PC] += Taken
+            stacks[Stack] = stacks.get(Stack, 0) + Taken
+            if Ins == jsr:
+                frames.append((cpu.SP, Stack + ";" + self.frameName(cpu.PC & 0xFFFF)))
+
+        CYCLES_USED: s32 = cycles - cpu.Cycles
+        return CYCLES_USED
+
+    def reset(self):
+        """Clear all counters."""
+        for counters in (self.OpcodeCounts, self.OpcodeCycles, self.PCCounts, self.PCCycles):
+            counters[:] = array("Q", bytes(8 * len(counters)))
+        self.Stacks.clear()
+        self.Frames.clear()
+        self.Root = None
+
+    def hottestAddresses(self, count: int = 10) -> list:
+        """The count addresses with the most cycles, as (address, executions, cycles)."""
+        cycles = self.PCCycles
+        top = sorted((address for address in range(0x10000) if cycles[address]), key=cycles.__getitem__, reverse=True)[:count]
+        return [(address, self.PCCounts[address], cycles[address]) for address in top]
+
+    def hottestOpcodes(self, count: int = 10) -> list:
+        """The count opcodes with the most cycles, as (name, executions, cycles)."""
+        cycles = self.OpcodeCycles
+        top = sorted((opcode for opcode in range(256) if cycles[opcode]), key=cycles.__getitem__, reverse=True)[:count]
+        return [(self.Names.get(opcode, f"${opcode:02X}"), self.OpcodeCounts[opcode], cycles[opcode]) for opcode in top]
+
+    def report(self, count: int = 10) -> str:
+        """Text report of the hottest addresses and instructions."""
+        total = sum(self.OpcodeCycles) or 1
+        lines = [f"{'address':<10}{'count':>12}{'cycles':>12}{'%':>8}"]
+        lines += [f"{self.frameName(address):<10}{executions:>12}{cycles:>12}{100 * cycles / total:>8.2f}"
+                  for address, executions, cycles in self.hottestAddresses(count)]
+        lines += ["", f"{'opcode':<10}{'count':>12}{'cycles':>12}{'%':>8}"]
+        lines += [f"{name:<10}{executions:>12}{cycles:>12}{100 * cycles / total:>8.2f}"
+                  for name, executions, cycles in self.hottestOpcodes(count)]
+        return "\n".join(lines)
+
+    def collapsedStacks(self) -> str:
+        """Cycles per call stack in the collapsed-stack format ("frame;frame cycles" lines) read by flamegraph tools."""
+        return "".join(f"{stack} {cycles}\n" for stack, cycles in sorted(self.Stacks.items()))
@@ -0,0 +1,91 @@
+import heapq
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+
+NEVER: int = 1 << 62
+'''Timestamp of "no event scheduled"'''
+
+class Event(list):
+    """A scheduled callback, [cycle, sequence number, callback, period], as kept in the heap.
+
+    Cancelled events stay in the heap with no callback and are skipped when they come up."""
+    __slots__ = ()
+
+    @property
+    def cycle(self) -> int:
+        return self[0]
+
+class Timeline:
+    """Events keyed by absolute CPU cycle (see CPU.cycle), kept in a heap.
+
+    callback(cycle) runs once the CPU has executed up to cycle, between instructions, and gets the
+    cycle it was scheduled for (the CPU may be a few cycles past it, instructions are not split).
+    Events due at the same cycle run in the order they were scheduled. Callbacks can schedule or
+    cancel events and raise interrupts (CPU.irq, CPU.nmi).
+
+    The CPU only looks at the timeline when the cycle of the first event (Next) is reached: exec
+    runs in slices that end there, and scheduling an event earlier than the end of the running
+    slice cuts the slice short."""
+    def __init__(self, cpu=None):
+        self.CPU = cpu
+        self.Heap = []
+        self.Next: int = NEVER
+        '''Cycle of the first pending event, NEVER when there is none'''
+        self.Sequence: int = 0
+
+    def __len__(self) -> int:
+        return sum(1 for event in self.Heap if event[2] is not None)
+
+    def now(self) -> int:
+        return self.CPU.cycle() if self.CPU is not None else 0
+
+    def schedule(self, cycle: int, callback, period: int = None) -> Event:
+        """Run callback(cycle) at an absolute cycle, and every period cycles after it when period is given."""
+        if period is not None and period <= 0:
+            raise ValueError("period must be positive")
+        self.Sequence += 1
+        event = Event((cycle, self.Sequence, callback, period))
+        heapq.heappush(self.Heap, event)
+        if cycle < self.Next:
+            self.Next = cycle
+            if self.CPU is not None:
+                self.CPU.eventScheduled(cycle)
+        return event
+
+    def after(self, delay: int, callback, period: int = None) -> Event:
+        """Run callback delay cycles from now (and every period cycles after that)."""
+        return self.schedule(self.now() + delay, callback, period)
+
+    def every(self, period: int, callback) -> Event:
+        """Run callback every period cycles, starting period cycles from now."""
+        return self.schedule(self.now() + period, callback, period)
+
+    def cancel(self, event: Event):
+        event[2] = event[3] = None
+        heap = self.Heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        self.Next = heap[0][0] if heap else NEVER
+
+    def run(self, now: int):
+        """Run every event due at or before now, including those the callbacks schedule for then."""
+        heap = self.Heap
+        while heap and heap[0][0] <= now:
+            event = heap[0]
+            cycle, _, callback, period = event
+            if callback is not None and period is not None:
+                self.Sequence += 1
+                event[0], event[1] = cycle + period, self.Sequence
+                heapq.heapreplace(heap, event)
+            else:
+                heapq.heappop(heap)
+            if callback is not None:
+                callback(cycle)
+        self.Next = heap[0][0] if heap else NEVER
+
+    def clear(self):
+        self.Heap.clear()
+        self.Next = NEVER
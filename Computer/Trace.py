@@ -0,0 +1,115 @@
+import mmap
+import struct
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError: # NumPy only speeds up reading traces back
+    np = None
+
+from . import Cpu
+from . import Memory
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+Mem = Memory.Mem
+CPU = Cpu.CPU
+
+RECORD = struct.Struct("<QHHBBBBBx")
+'''One trace record: cycles used so far in the run, PC, SP, opcode, A, X, Y, P_status (18 bytes, little-endian)'''
+DTYPE = None if np is None else np.dtype([
+    ("cycles", "<u8"), ("pc", "<u2"), ("sp", "<u2"), ("opcode", "u1"),
+    ("a", "u1"), ("x", "u1"), ("y", "u1"), ("p", "u1"), ("pad", "u1")])
+'''NumPy view of RECORD, for reading a whole trace file as a structured array'''
+
+class TraceRecord(NamedTuple):
+    cycles: int
+    pc: Word
+    sp: Word
+    opcode: Byte
+    a: Byte
+    x: Byte
+    y: Byte
+    p: Byte
+
+class Trace:
+    """Execution trace, recorded as a CPU hook: one binary RECORD per instruction, taken before it runs.
+
+    Records go into a preallocated ring buffer of capacity records. With a path, the buffer is written
+    to that file in one chunk whenever it fills up (and on flush/close), so the file holds the whole run.
+    Without one, the buffer keeps the last capacity records. Nothing is recorded, and CPU.exec keeps
+    its fast loop, until the trace is attached to a CPU."""
+    def __init__(self, capacity: int = 65536, path: str = None):
+        self.Capacity = capacity
+        self.Buffer = bytearray(capacity * RECORD.size)
+        self.Next = 0
+        '''Slot the next record goes into'''
+        self.Count = 0
+        '''Records taken since the trace was created'''
+        self.File = open(path, "wb") if path is not None else None
+
+    def attach(self, cpu: CPU):
+        cpu.Hooks.append(self)
+
+    def detach(self, cpu: CPU):
+        cpu.Hooks.remove(self)
+
+    def __call__(self, cpu: CPU, memory: Mem, cycles: s32):
+        PC: Word = cpu.PC & 0xFFFF
+        RECORD.pack_into(self.Buffer, self.Next * RECORD.size, cycles, PC, cpu.SP & 0xFFFF, memory[PC],
+                         cpu.A_reg & 0xFF, cpu.X_reg & 0xFF, cpu.Y_reg & 0xFF, cpu.P_status & 0xFF)
+        self.Count += 1
+        self.Next += 1
+        if self.Next == self.Capacity:
+            if self.File is not None:
+                self.File.write(self.Buffer)
+            self.Next = 0
+
+    def records(self) -> list:
+        """The records still in the buffer (not yet written out), oldest first."""
+        if self.File is None and self.Count >= self.Capacity:
+            slots = list(range(self.Next, self.Capacity)) + list(range(self.Next))
+        else:
+            slots = range(self.Next)
+        return [TraceRecord(*RECORD.unpack_from(self.Buffer, slot * RECORD.size)) for slot in slots]
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        if self.File is not None:
+            self.File.write(memoryview(self.Buffer)[:self.Next * RECORD.size])
+            self.File.flush()
+            self.Next = 0
+
+    def close(self):
+        if self.File is not None:
+            self.flush()
+            self.File.close()
+            self.File = None
+
+class TraceFile:
+    """A trace file memory-mapped back for reading, indexable like a list of TraceRecord."""
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.Map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.seek(0, 2) else b""
+
+    def __len__(self) -> int:
+        return len(self.Map) // RECORD.size
+
+    def __getitem__(self, index: int) -> TraceRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace record index out of range")
+        return TraceRecord(*RECORD.unpack_from(self.Map, index * RECORD.size))
+
+    def array(self) -> "np.ndarray":
+        """The whole file as a NumPy structured array (DTYPE) sharing the mapping, without copying."""
+        if np is None:
+            raise ImportError("Reading a trace as an array needs NumPy")
+        return np.frombuffer(self.Map, DTYPE)
+
+    def close(self):
+        if isinstance(self.Map, mmap.mmap):
+            self.Map.close()
@@ -1,25 +1,37 @@
-# Import module testing libraries
-import logging # for module logging purposes, not necessary for computer runtime
-import datetime #
-#################
-
-from . import Cpu
-from . import Memory
-
-__all__ = ["Cpu", "Memory"]
-__author__ = 'Rayan Berrabah'
-__email__ = 'rayanexpro7@gmail.com'
-__version__ = '0.1.0'
-__date__ = 'dd-mm-yy'
-
-''' Code used for logging purposes, not needed for typical use.
-
-logging .basicConfig(
-    level=logging.INFO,
-    filename='Computer.log'
-)
-
-logger = logging.getLogger(__name__)
-
-logger.info(f"Computer has been intialized at: {datetime.datetime.now()}")
+# Import module testing libraries
+import logging # for module logging purposes, not necessary for computer runtime
+import datetime #
+#################
+
+from . import Cpu
+from . import Memory
+from . import Timeline
+from . import Jit
+from . import Lockstep
+from . import Trace
+from . import Profile
+from . import Debug
+from . import Assembler
+from . import Disassembler
+from . import Pace
+from . import Async
+from . import Pool
+# Batch is not imported here so that "python -m Computer.Batch" runs it cleanly
+
+__all__ = ["Cpu", "Memory", "Timeline", "Jit", "Lockstep", "Batch", "Trace", "Profile", "Debug", "Assembler", "Disassembler", "Pace", "Async", "Pool"]
+__author__ = 'Rayan Berrabah'
+__email__ = 'rayanexpro7@gmail.com'
+__version__ = '0.1.0'
+__date__ = 'dd-mm-yy'
+
+''' Code used for logging purposes, not needed for typical use.
+
+logging .basicConfig(
+    level=logging.INFO,
+    filename='Computer.log'
+)
+
+logger = logging.getLogger(__name__)
+
+logger.info(f"Computer has been intialized at: {datetime.datetime.now()}")
 '''
\ No newline at end of file
@@ -0,0 +1,146 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import Computer
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+
+PROGRAM_START: Word = 0x0400
+PROGRAM_END: Word = 0xFF00
+'''Workloads are code unrolled over this range (straight-line but for the idle one) and a JMP back to
+PROGRAM_START, so any --cycles keeps running the workload. Every store goes below PROGRAM_START so the
+code is never modified while it runs'''
+
+def loadStore(cpu) -> tuple:
+    return bytes([cpu.INS_LDA_IM, 0x42, cpu.INS_STA_ZP, 0x10, cpu.INS_LDX_ZP, 0x10, cpu.INS_STX_ABS, 0x00, 0x03,
+                  cpu.INS_LDY_ABS, 0x00, 0x03, cpu.INS_STY_ZPX, 0x20]), {}
+
+def stack(cpu) -> tuple:
+    return bytes([cpu.INS_LDA_IM, 0x80, cpu.INS_PHA, cpu.INS_PHP, cpu.INS_PHA, cpu.INS_TSX_IMP, cpu.INS_PLA,
+                  cpu.INS_PLP, cpu.INS_PLA, cpu.INS_TXS_IMP]), {"SP": 0xFF}
+
+def indexed(cpu) -> tuple:
+    # X and Y of 0xFF make every indexed access cross a page
+    return bytes([cpu.INS_LDA_ABSX, 0x10, 0x02, cpu.INS_LDA_ABSY, 0x80, 0x02, cpu.INS_LDA_INDY, 0x40,
+                  cpu.INS_STA_ABSX, 0x01, 0x02, cpu.INS_LDA_ABSY, 0x01, 0x02, cpu.INS_LDA_ZPX, 0x05]), {"X_reg": 0xFF, "Y_reg": 0xFF}
+
+def mixed(cpu) -> tuple:
+    return bytes([cpu.INS_LDA_IM, 0x0F, cpu.INS_AND_ZP, 0x12, cpu.INS_TAY_IMP, cpu.INS_STA_ZPX, 0x30, cpu.INS_PHA,
+                  cpu.INS_LDX_IM, 0x03, cpu.INS_LDA_INDX, 0x40, cpu.INS_STA_INDY, 0x40, cpu.INS_PLA, cpu.INS_TYA_IMP,
+                  cpu.INS_NOP, 0xEA, cpu.INS_LDY_ZPX, 0x10]), {"SP": 0xFF}
+
+def arithmetic(cpu) -> tuple:
+    # Half of the ADC/SBC run in decimal mode, which goes through the same tables as binary
+    return bytes([cpu.INS_SED_IMP, cpu.INS_ADC_IM, 0x19, cpu.INS_SBC_ZP, 0x12, cpu.INS_CLD_IMP, cpu.INS_ADC_ZP, 0x13,
+                  cpu.INS_ROL_ACC, cpu.INS_EOR_IM, 0x5A, cpu.INS_CMP_ZPX, 0x10, cpu.INS_INC_ZP, 0x20, cpu.INS_LSR_ACC]), {}
+
+def idle(cpu) -> tuple:
+    # Polls a flag nothing sets, like firmware waiting for an interrupt: exec fast-forwards the loop
+    return bytes([cpu.INS_LDA_ZP, 0x50, cpu.INS_BEQ, 0xFC]), {}
+
+WORKLOADS = {"load_store": loadStore, "stack": stack, "indexed": indexed, "mixed": mixed, "arithmetic": arithmetic, "idle": idle}
+ENGINES = ("interpreter", "predecode", "jit")
+
+def machine(workload, engine: str) -> tuple:
+    """Build (run, count) for a workload: run(cycles) executes from the start state and returns (cycles used, cycles
+    of those fast-forwarded through idle loops), count(cycles) returns how many instructions such a run executes
+    step by step."""
+    cpu = Computer.Cpu.CPU(predecode=engine == "predecode")
+    mem = Computer.Memory.Mem()
+    cpu.reset(mem)
+    pattern, registers = workload(cpu)
+    repeats = (PROGRAM_END - PROGRAM_START - 3) // len(pattern)
+    mem.load(PROGRAM_START, pattern * repeats + bytes([cpu.INS_JMP_ABS, PROGRAM_START & 0xFF, PROGRAM_START >> 8]))
+    mem.load(0x0040, bytes([0x00, 0x02, 0x00, 0x03]))
+    runner = Computer.Jit.JIT(cpu) if engine == "jit" else cpu
+    def run(cycles: s32) -> s32:
+        cpu.PC, cpu.SP, cpu.A_reg, cpu.X_reg, cpu.Y_reg = PROGRAM_START, 0x0100, 0, 0, 0
+        cpu.P_status = 0b00100000
+        for name, value in registers.items():
+            setattr(cpu, name, value)
+        cpu.IdleCycles = 0
+        return runner.exec(mem, cycles), cpu.IdleCycles
+    def count(cycles: s32) -> int:
+        run(0)
+        return cpu.run_until(mem, cycles=cycles).instructions
+    return run, count
+
+def measure(workload, engine: str, cycles: s32, warmup: int, repeat: int) -> dict:
+    run, count = machine(workload, engine)
+    instructions = count(cycles)
+    for _ in range(warmup):
+        run(cycles)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        used, skipped = run(cycles)
+        times.append(time.perf_counter() - start)
+    best, median = min(times), statistics.median(times)
+    # Fast-forwarded cycles execute no instructions, the step by step count says nothing about the timed run then
+    if skipped:
+        instructions = None
+    return {"cycles": used, "idle_cycles": skipped, "instructions": instructions, "best_seconds": best,
+            "median_seconds": median, "cycles_per_second": used / best,
+            "instructions_per_second": None if instructions is None else instructions / best, "mhz": used / best / 1e6}
+
+def compare(results: dict, baseline: dict, tolerance: float) -> tuple:
+    """Return (lines comparing each workload/engine with the baseline, whether any regressed beyond tolerance)."""
+    lines, regressed = [], False
+    for name, engines in results["results"].items():
+        for engine, result in engines.items():
+            old = baseline.get("results", {}).get(name, {}).get(engine)
+            if old is None:
+                continue
+            ratio = result["cycles_per_second"] / old["cycles_per_second"]
+            slower = ratio < 1 - tolerance
+            regressed |= slower
+            lines.append(f"{name:<12}{engine:<13}{ratio:>8.2f}x{'  REGRESSION' if slower else ''}")
+    return lines, regressed
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure emulated cycles and instructions per second.")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="JSON results file (default: benchmark.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown against the baseline (default: 0.10)")
+    parser.add_argument("--engines", default="interpreter", help=f"comma-separated, from {', '.join(ENGINES)} (default: interpreter)")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="comma-separated workload names (default: all)")
+    parser.add_argument("--cycles", type=int, default=50000, help="cycles per run (default: 50000)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs first (default: 1)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs, the best one counts (default: 5)")
+    args = parser.parse_args(argv)
+    engines = args.engines.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            parser.error(f"unknown engine {engine!r}")
+    for name in args.workloads.split(","):
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload {name!r}")
+
+    results = {"python": platform.python_version(), "platform": platform.platform(), "cycles": args.cycles,
+               "repeat": args.repeat, "results": {}}
+    print(f"{'workload':<12}{'engine':<13}{'MHz':>8}{'instr/s':>14}{'idle cycles':>13}")
+    for name in args.workloads.split(","):
+        for engine in engines:
+            result = measure(WORKLOADS[name], engine, args.cycles, args.warmup, args.repeat)
+            results["results"].setdefault(name, {})[engine] = result
+            rate = result["instructions_per_second"]
+            print(f"{name:<12}{engine:<13}{result['mhz']:>8.2f}{'-' if rate is None else f'{rate:,.0f}':>14}{result['idle_cycles']:>13,}")
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            lines, regressed = compare(results, json.load(file), args.tolerance)
+        print("\nagainst baseline:")
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,666 +1,1697 @@
-import unittest
-import Computer
-
-Byte = int
-Word = int
-u32 = int
-s32 = int
-
-class TestComputer(unittest.TestCase):
-
-    def setUp(self):
-        self.mem = Computer.Memory.Mem()
-        self.cpu = Computer.Cpu.CPU()
-        self.cpu.reset(self.mem)
-
-    def VerifyFlags_NoMod_LDA(self):
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-
-    def VerifyFlags_NoMod_LDX(self):
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-
-    def VerifyFlags_NoMod_LDY(self):
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-
-    def VerifyFlags_NoMod_STA(self):
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-        self.assertFalse(self.cpu.N_flag)
-
-    def VerifyFlags_NoMod_STX(self):
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-        self.assertFalse(self.cpu.N_flag)
-
-    def VerifyFlags_NoMod_STY(self):
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.I_flag)
-        self.assertFalse(self.cpu.D_flag)
-        self.assertFalse(self.cpu.B_flag)
-        self.assertFalse(self.cpu.V_flag)
-        self.assertFalse(self.cpu.C_flag)
-        self.assertFalse(self.cpu.N_flag)
-
-    def test_LDA_IM(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
-        self.mem[0xFFFD] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.A_reg, 0x84)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertTrue(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_IM_ZERO(self):
-        self.cpu.A_reg = 0x44
-        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
-        self.mem[0xFFFD] = 0x00
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.A_reg, 0x00)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertTrue(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ZP(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ZP
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0042] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.A_reg, 0x37)
-        self.assertEqual(CyclesUsed, 3)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ZPX(self):
-        self.cpu.X_reg = 5
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ZPX
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0047] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.A_reg, 0x37)
-        self.assertEqual(CyclesUsed, 4)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ZPX_Wrap(self):
-        self.cpu.X_reg = 0xFF
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ZPX
-        self.mem[0xFFFD] = 0x80
-        self.mem[0x007F] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.A_reg, 0x37)
-        self.assertEqual(CyclesUsed, 4)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ABS(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ABS
-        self.mem[0xFFFD] = 0x80
-        self.mem[0xFFFE] = 0x44
-        self.mem[0x4480] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.A_reg, 0x84)
-        self.assertEqual(CyclesUsed, 4)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertTrue(self.cpu.N_flag)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ABSX(self):
-        self.cpu.X_reg = 0x45
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSX
-        self.mem[0xFFFD] = 0x45
-        self.mem[0xFFFE] = 0x01
-        self.mem[0x0145 + self.cpu.X_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.A_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ABSX_Wrap(self):
-        self.cpu.X_reg = 0x0F
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSX
-        self.mem[0xFFFD] = 0xF5
-        self.mem[0xFFFE] = 0xFF
-        self.mem[0xFFF5 + self.cpu.X_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.cpu.A_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ABSY(self):
-        self.cpu.Y_reg = 0xA7
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSY
-        self.mem[0xFFFD] = 0x87
-        self.mem[0xFFFE] = 0x01
-        self.mem[0x0187 + self.cpu.Y_reg] = 0x85
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.A_reg, 0x85)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_ABSY_Wrap(self):
-        self.cpu.Y_reg = 0x0F
-        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSY
-        self.mem[0xFFFD] = 0xF5
-        self.mem[0xFFFE] = 0xFF
-        self.mem[0xFFF5 + self.cpu.Y_reg] = 0x85
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.cpu.A_reg, 0x85)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_INDX(self):
-        self.cpu.X_reg = 0x04
-        self.mem[0xFFFC] = self.cpu.INS_LDA_INDX
-        self.mem[0xFFFD] = 0x20
-        self.mem[0x0020 + self.cpu.X_reg] = 0x34
-        self.mem[(0x0020 + self.cpu.X_reg) + 0x01] = 0x12
-        self.mem[0x1234] = 0x99
-        CyclesUsed = self.cpu.exec(self.mem, 6)
-        self.assertEqual(self.cpu.A_reg, 0x99)
-        self.assertEqual(CyclesUsed, 6)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_INDX_Wrap(self):
-        self.cpu.X_reg = 0x0F
-        self.mem[0xFFFC] = self.cpu.INS_LDA_INDX
-        self.mem[0xFFFD] = 0xF1
-        self.mem[(0x00F1 + self.cpu.X_reg) & 0xFF] = 0x34
-        self.mem[((0x00F1 + self.cpu.X_reg) + 0x01) & 0xFF] = 0x12
-        self.mem[0x1234] = 0x99
-        CyclesUsed = self.cpu.exec(self.mem, 6)
-        self.assertEqual(self.cpu.A_reg, 0x99)
-        self.assertEqual(CyclesUsed, 6)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_INDY(self):
-        self.cpu.Y_reg = 0x10
-        self.mem[0xFFFC] = self.cpu.INS_LDA_INDY
-        self.mem[0xFFFD] = 0x20
-        self.mem[0x0020] = 0x00
-        self.mem[0x0021] = 0x80
-        self.mem[0x8010] = 0x99
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.cpu.A_reg, 0x99)
-        self.assertEqual(CyclesUsed, 5)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDA_INDY_Wrap(self):
-        self.cpu.Y_reg = 0xFF
-        self.mem[0xFFFC] = self.cpu.INS_LDA_INDY
-        self.mem[0xFFFD] = 0x20
-        self.mem[0x0020] = 0xF0
-        self.mem[0x0021] = 0xFF
-        self.mem[0x00EF] = 0x55
-        CyclesUsed = self.cpu.exec(self.mem, 6)
-        self.assertEqual(self.cpu.A_reg, 0x55)
-        self.assertEqual(CyclesUsed, 6)
-        self.VerifyFlags_NoMod_LDA()
-
-    def test_LDX_IM(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
-        self.mem[0xFFFD] = 0x99
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.X_reg, 0x99)
-        self.assertEqual(CyclesUsed, 2)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_IM_ZERO(self):
-        self.cpu.X_reg = 0x44
-        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
-        self.mem[0xFFFD] = 0x00
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.X_reg, 0x00)
-        self.assertEqual(CyclesUsed, 2)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ZP(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ZP
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0042] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.X_reg, 0x37)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ZPY(self):
-        self.cpu.Y_reg = 5
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ZPY
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0047] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.X_reg, 0x37)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ZPY_Wrap(self):
-        self.cpu.Y_reg = 0xFF
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ZPY
-        self.mem[0xFFFD] = 0x80
-        self.mem[0x007F] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.X_reg, 0x37)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ABS(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ABS
-        self.mem[0xFFFD] = 0x80
-        self.mem[0xFFFE] = 0x44
-        self.mem[0x4480] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.X_reg, 0x84)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ABSY(self):
-        self.cpu.Y_reg = 0x45
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ABSY
-        self.mem[0xFFFD] = 0x45
-        self.mem[0xFFFE] = 0x01
-        self.mem[0x0145 + self.cpu.Y_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.X_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDX_ABSY_Wrap(self):
-        self.cpu.Y_reg = 0x0F
-        self.mem[0xFFFC] = self.cpu.INS_LDX_ABSY
-        self.mem[0xFFFD] = 0xF5
-        self.mem[0xFFFE] = 0xFF
-        self.mem[0xFFF5 + self.cpu.Y_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.cpu.X_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDX()
-
-    def test_LDY_IM(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
-        self.mem[0xFFFD] = 0x95
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.Y_reg, 0x95)
-        self.assertEqual(CyclesUsed, 2)
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_IM_ZERO(self):
-        self.cpu.Y_reg = 0x44
-        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
-        self.mem[0xFFFD] = 0x00
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.Y_reg, 0x00)
-        self.assertEqual(CyclesUsed, 2)
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_ZP(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDY_ZP
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0042] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.Y_reg, 0x37)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_ZPX(self):
-        self.cpu.X_reg = 5
-        self.mem[0xFFFC] = self.cpu.INS_LDY_ZPX
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0047] = 0x37
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.Y_reg, 0x37)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_ABS(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDY_ABS
-        self.mem[0xFFFD] = 0x80
-        self.mem[0xFFFE] = 0x44
-        self.mem[0x4480] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.Y_reg, 0x84)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_ABSX(self):
-        self.cpu.X_reg = 0x45
-        self.mem[0xFFFC] = self.cpu.INS_LDY_ABSX
-        self.mem[0xFFFD] = 0x45
-        self.mem[0xFFFE] = 0x01
-        self.mem[0x0145 + self.cpu.X_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.Y_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_LDY_ABSX_Wrap(self):
-        self.cpu.X_reg = 0x0F
-        self.mem[0xFFFC] = self.cpu.INS_LDY_ABSX
-        self.mem[0xFFFD] = 0xF5
-        self.mem[0xFFFE] = 0xFF
-        self.mem[0xFFF5 + self.cpu.X_reg] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.cpu.Y_reg, 0x84)
-        self.assertIn(CyclesUsed, [4, 5])
-        self.VerifyFlags_NoMod_LDY()
-
-    def test_STA_ZP(self):
-        self.cpu.A_reg = 0xA4
-        self.mem[0xFFFC] = self.cpu.INS_STA_ZP
-        self.mem[0xFFFD] = 0x42
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.mem[0x42], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ZP_Wrap(self):
-        self.cpu.A_reg = 0xA4
-        self.mem[0xFFFC] = self.cpu.INS_STA_ZP
-        self.mem[0xFFFD] = 0x100
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.mem[0x0], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ZPX(self):
-        self.cpu.A_reg = 0xA4
-        self.cpu.X_reg = 0x15
-        self.mem[0xFFFC] = self.cpu.INS_STA_ZPX
-        self.mem[0xFFFD] = 0x13
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0x13 + self.cpu.X_reg], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ZPX_Wrap(self):
-        self.cpu.A_reg = 0xA4
-        self.cpu.X_reg = 0xF1
-        self.mem[0xFFFC] = self.cpu.INS_STA_ZPX
-        self.mem[0xFFFD] = 0x0F
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0x0], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ABS(self):
-        self.cpu.A_reg = 0xA5
-        self.mem[0xFFFC] = self.cpu.INS_STA_ABS
-        self.mem[0xFFFD] = 0x42
-        self.mem[0xFFFE] = 0x42
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0x4242], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ABSX(self):
-        self.cpu.X_reg = 0x14
-        self.cpu.A_reg = 0x15
-        self.mem[0xFFFC] = self.cpu.INS_STA_ABSX
-        self.mem[0xFFFD] = 0x42
-        self.mem[0xFFFE] = 0x43
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.mem[0x4342 + self.cpu.X_reg], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 5)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_ABSY(self):
-        self.cpu.Y_reg = 0x98
-        self.cpu.A_reg = 0x09
-        self.mem[0xFFFC] = self.cpu.INS_STA_ABSY
-        self.mem[0xFFFD] = 0x61
-        self.mem[0xFFFE] = 0xf6
-        CyclesUsed = self.cpu.exec(self.mem, 5)
-        self.assertEqual(self.mem[0xf661 + self.cpu.Y_reg], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 5)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_INDX(self):
-        self.cpu.X_reg = 0x42
-        self.cpu.A_reg = 0x61
-        self.mem[0xFFFC] = self.cpu.INS_STA_INDX
-        self.mem[0xFFFD] = 0x97
-        self.mem[0x0097 + self.cpu.X_reg] = 0x2A
-        self.mem[(0x0097 + self.cpu.X_reg) + 0x01] = 0x25
-        CyclesUsed = self.cpu.exec(self.mem, 6)
-        self.assertEqual(self.mem[0x252A], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 6)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STA_INDY(self):
-        self.cpu.Y_reg = 0x24
-        self.cpu.A_reg = 0xE3
-        self.mem[0xFFFC] = self.cpu.INS_STA_INDY
-        self.mem[0xFFFD] = 0x05
-        self.mem[0x0005 + self.cpu.Y_reg] = 0x06
-        self.mem[(0x0005 + self.cpu.Y_reg) + 0x01] = 0xA7
-        CyclesUsed = self.cpu.exec(self.mem, 6)
-        self.assertEqual(self.mem[0xA706], self.cpu.A_reg)
-        self.assertEqual(CyclesUsed, 6)
-        self.VerifyFlags_NoMod_STA()
-
-    def test_STX_ZP(self):
-        self.cpu.X_reg = 0xC9
-        self.mem[0xFFFC] = self.cpu.INS_STX_ZP
-        self.mem[0xFFFD] = 0xDD
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.mem[0xDD], self.cpu.X_reg)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_STX()
-
-    def test_STX_ZPY(self):
-        self.cpu.X_reg = 0xD1
-        self.cpu.Y_reg = 0x2F
-        self.mem[0xFFFC] = self.cpu.INS_STX_ZPY
-        self.mem[0xFFFD] = 0xCC
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0xCC + self.cpu.Y_reg], self.cpu.X_reg)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_STX()
-
-    def test_STX_ABS(self):
-        self.cpu.X_reg = 0xAE
-        self.mem[0xFFFC] = self.cpu.INS_STX_ABS
-        self.mem[0xFFFD] = 0x22
-        self.mem[0xFFFE] = 0xE7
-        CYclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0xE722], self.cpu.X_reg)
-        self.assertEqual(CYclesUsed, 4)
-        self.VerifyFlags_NoMod_STX()
-
-    def test_STY_ZP(self):
-        self.cpu.Y_reg = 0xBD
-        self.mem[0xFFFC] = self.cpu.INS_STY_ZP
-        self.mem[0xFFFD] = 0x7E
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.mem[0x7E], self.cpu.Y_reg)
-        self.assertEqual(CyclesUsed, 3)
-        self.VerifyFlags_NoMod_STY()
-
-    def test_STY_ZPX(self):
-        self.cpu.Y_reg = 0xD1
-        self.cpu.X_reg = 0x2F
-        self.mem[0xFFFC] = self.cpu.INS_STY_ZPX
-        self.mem[0xFFFD] = 0xCC
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0xFB], self.cpu.Y_reg)
-        self.assertEqual(CyclesUsed, 4)
-        self.VerifyFlags_NoMod_STY()
-
-    def test_STY_ABS(self):
-        self.cpu.Y_reg = 0xEA
-        self.mem[0xFFFC] = self.cpu.INS_STY_ABS
-        self.mem[0xFFFD] = 0x17
-        self.mem[0xFFFE] = 0x35
-        CYclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.mem[0x3517], self.cpu.Y_reg)
-        self.assertEqual(CYclesUsed, 4)
-        self.VerifyFlags_NoMod_STY()
-
-    def test_TAX_IMP(self):
-        self.cpu.A_reg = 0x80
-        self.mem[0xFFFC] = self.cpu.INS_TAX_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.X_reg, 0x80)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertTrue(self.cpu.N_flag)
-        self.assertFalse(self.cpu.Z_flag)
-
-    def test_TAY_IMP(self):
-        self.cpu.A_reg = 0x00
-        self.mem[0xFFFC] = self.cpu.INS_TAY_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.Y_reg, 0x00)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertFalse(self.cpu.N_flag)
-        self.assertTrue(self.cpu.Z_flag)
-
-    def test_TXA_IMP(self):
-        self.cpu.X_reg = 0x7F
-        self.mem[0xFFFC] = self.cpu.INS_TXA_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.A_reg, 0x7F)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertFalse(self.cpu.N_flag)
-        self.assertFalse(self.cpu.Z_flag)
-
-    def test_TYA_IMP(self):
-        self.cpu.A_reg = 0x00
-        self.mem[0xFFFC] = self.cpu.INS_TYA_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.A_reg, 0x00)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertFalse(self.cpu.N_flag)
-        self.assertTrue(self.cpu.Z_flag)
-
-    def test_TSX_IMP(self):
-        self.cpu.SP = 0xFE
-        self.mem[0xFFFC] = self.cpu.INS_TSX_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.X_reg, 0xFE)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertTrue(self.cpu.N_flag)
-        self.assertFalse(self.cpu.Z_flag)
-
-    def test_TXS_IMP(self):
-        self.cpu.X_reg = 0xAB
-        self.mem[0xFFFC] = self.cpu.INS_TXS_IMP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(self.cpu.SP, 0xAB)
-        self.assertEqual(CyclesUsed, 2)
-        self.assertFalse(self.cpu.N_flag)
-        self.assertFalse(self.cpu.Z_flag)
-
-    def test_PHA(self):
-        self.cpu.A_reg = 0x42
-        self.cpu.SP = 0xFD
-        self.mem[0xFFFC] = self.cpu.INS_PHA
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.SP, 0xFC)
-        self.assertEqual(self.mem[0x01FD], 0x42)
-        self.assertEqual(CyclesUsed, 3)
-
-    def test_PHP(self):
-        self.cpu.P_status = 0b10110101
-        self.cpu.SP = 0xFC
-        self.mem[0xFFFC] = self.cpu.INS_PHP
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.SP, 0xFB)
-        self.assertEqual(self.mem[0x01FC], 0b10110101 | 0b00110000)
-        self.assertEqual(CyclesUsed, 3)
-
-    def test_PLA(self):
-        self.cpu.SP = 0xFC
-        self.mem[0x01FD] = 0x7F
-        self.mem[0xFFFC] = self.cpu.INS_PLA
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.SP, 0xFD)
-        self.assertEqual(self.cpu.A_reg, 0x7F)
-        self.assertEqual(CyclesUsed, 4)
-        self.assertFalse(self.cpu.Z_flag)
-        self.assertFalse(self.cpu.N_flag)
-
-    def test_PLP(self):
-        self.cpu.SP = 0xFC
-        self.mem[0x01FD] = 0b11001101
-        self.mem[0xFFFC] = self.cpu.INS_PLP
-        CyclesUsed = self.cpu.exec(self.mem, 4)
-        self.assertEqual(self.cpu.SP, 0xFD)
-        ExpectedStatus = (0b11001101 & 0b11001111) | 0b00100000
-        self.assertEqual(self.cpu.P_status, ExpectedStatus)
-        self.assertEqual(CyclesUsed, 4)
-
-    def test_NOP(self):
-        self.mem[0xFFFC] = self.cpu.INS_NOP
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(CyclesUsed, 2)
-
-    def test_NOP_IF_CYCLES_EQ_0(self):
-        CyclesUsed = self.cpu.exec(self.mem, 0)
-        self.assertEqual(CyclesUsed, 0)
-
-    def test_LDA_IM_LT_NC(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
-        self.mem[0xFFFD] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 1)
-        self.assertEqual(CyclesUsed, 2)
-
-    def test_LDX_IM_LT_NC(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
-        self.mem[0xFFFD] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 1)
-        self.assertEqual(CyclesUsed, 2)
-
-    def test_LDY_IM_LT_NC(self):
-        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
-        self.mem[0xFFFD] = 0x84
-        CyclesUsed = self.cpu.exec(self.mem, 1)
-        self.assertEqual(CyclesUsed, 2)
-
-    def test_AND_IM(self):
-        self.cpu.A_reg = 0xF0
-        self.mem[0xFFFC] = self.cpu.INS_AND_IM
-        self.mem[0xFFFD] = 0x0F
-        CyclesUsed = self.cpu.exec( self.mem, 2 )
-        self.assertEqual(self.cpu.A_reg, 0xF0 & 0x0F)
-        self.assertEqual(CyclesUsed, 2)
-
-    def test_AND_ZP(self):
-        self.cpu.A_reg = 0xF0
-        self.mem[0xFFFC] = self.cpu.INS_AND_ZP
-        self.mem[0xFFFD] = 0x42
-        self.mem[0x0042] = 0x7F
-        CyclesUsed = self.cpu.exec(self.mem, 3)
-        self.assertEqual(self.cpu.A_reg, 0x70)
-        self.assertEqual(CyclesUsed, 3)
-
-    def test_INS_NH(self):
-        self.mem[0xFFFC] = 0x02
-        self.mem[0xFFFD] = 0x00
-        CyclesUsed = self.cpu.exec(self.mem, 2)
-        self.assertEqual(CyclesUsed, 2)
-
-if __name__ == "__main__":
-    unittest.main(verbosity=2)
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+import Computer
+import Computer.Batch
+
+Byte = int
+Word = int
+u32 = int
+s32 = int
+
+MACHINES = Computer.Pool.MachinePool()
+'''Reset machines shared by the test cases that only need a plain CPU and Mem'''
+
+class TestComputer(unittest.TestCase):
+
+    def setUp(self):
+        self.machine = MACHINES.acquire()
+        self.cpu, self.mem = self.machine
+
+    def tearDown(self):
+        MACHINES.release(self.machine)
+
+    def VerifyFlags_NoMod_LDA(self):
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+
+    def VerifyFlags_NoMod_LDX(self):
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+
+    def VerifyFlags_NoMod_LDY(self):
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+
+    def VerifyFlags_NoMod_STA(self):
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+        self.assertFalse(self.cpu.N_flag)
+
+    def VerifyFlags_NoMod_STX(self):
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+        self.assertFalse(self.cpu.N_flag)
+
+    def VerifyFlags_NoMod_STY(self):
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.I_flag)
+        self.assertFalse(self.cpu.D_flag)
+        self.assertFalse(self.cpu.B_flag)
+        self.assertFalse(self.cpu.V_flag)
+        self.assertFalse(self.cpu.C_flag)
+        self.assertFalse(self.cpu.N_flag)
+
+    def test_LDA_IM(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
+        self.mem[0xFFFD] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.A_reg, 0x84)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertTrue(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_IM_ZERO(self):
+        self.cpu.A_reg = 0x44
+        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
+        self.mem[0xFFFD] = 0x00
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.A_reg, 0x00)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertTrue(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ZP(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ZP
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0042] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.A_reg, 0x37)
+        self.assertEqual(CyclesUsed, 3)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ZPX(self):
+        self.cpu.X_reg = 5
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ZPX
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0047] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.A_reg, 0x37)
+        self.assertEqual(CyclesUsed, 4)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ZPX_Wrap(self):
+        self.cpu.X_reg = 0xFF
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ZPX
+        self.mem[0xFFFD] = 0x80
+        self.mem[0x007F] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.A_reg, 0x37)
+        self.assertEqual(CyclesUsed, 4)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ABS(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ABS
+        self.mem[0xFFFD] = 0x80
+        self.mem[0xFFFE] = 0x44
+        self.mem[0x4480] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.A_reg, 0x84)
+        self.assertEqual(CyclesUsed, 4)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertTrue(self.cpu.N_flag)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ABSX(self):
+        self.cpu.X_reg = 0x45
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSX
+        self.mem[0xFFFD] = 0x45
+        self.mem[0xFFFE] = 0x01
+        self.mem[0x0145 + self.cpu.X_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.A_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ABSX_Wrap(self):
+        self.cpu.X_reg = 0x0F
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSX
+        self.mem[0xFFFD] = 0xF5
+        self.mem[0xFFFE] = 0xFF
+        self.mem[0xFFF5 + self.cpu.X_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.cpu.A_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ABSY(self):
+        self.cpu.Y_reg = 0xA7
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSY
+        self.mem[0xFFFD] = 0x87
+        self.mem[0xFFFE] = 0x01
+        self.mem[0x0187 + self.cpu.Y_reg] = 0x85
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.A_reg, 0x85)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_ABSY_Wrap(self):
+        self.cpu.Y_reg = 0x0F
+        self.mem[0xFFFC] = self.cpu.INS_LDA_ABSY
+        self.mem[0xFFFD] = 0xF5
+        self.mem[0xFFFE] = 0xFF
+        self.mem[0xFFF5 + self.cpu.Y_reg] = 0x85
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.cpu.A_reg, 0x85)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_INDX(self):
+        self.cpu.X_reg = 0x04
+        self.mem[0xFFFC] = self.cpu.INS_LDA_INDX
+        self.mem[0xFFFD] = 0x20
+        self.mem[0x0020 + self.cpu.X_reg] = 0x34
+        self.mem[(0x0020 + self.cpu.X_reg) + 0x01] = 0x12
+        self.mem[0x1234] = 0x99
+        CyclesUsed = self.cpu.exec(self.mem, 6)
+        self.assertEqual(self.cpu.A_reg, 0x99)
+        self.assertEqual(CyclesUsed, 6)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_INDX_Wrap(self):
+        self.cpu.X_reg = 0x0F
+        self.mem[0xFFFC] = self.cpu.INS_LDA_INDX
+        self.mem[0xFFFD] = 0xF1
+        self.mem[(0x00F1 + self.cpu.X_reg) & 0xFF] = 0x34
+        self.mem[((0x00F1 + self.cpu.X_reg) + 0x01) & 0xFF] = 0x12
+        self.mem[0x1234] = 0x99
+        CyclesUsed = self.cpu.exec(self.mem, 6)
+        self.assertEqual(self.cpu.A_reg, 0x99)
+        self.assertEqual(CyclesUsed, 6)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_INDY(self):
+        self.cpu.Y_reg = 0x10
+        self.mem[0xFFFC] = self.cpu.INS_LDA_INDY
+        self.mem[0xFFFD] = 0x20
+        self.mem[0x0020] = 0x00
+        self.mem[0x0021] = 0x80
+        self.mem[0x8010] = 0x99
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.cpu.A_reg, 0x99)
+        self.assertEqual(CyclesUsed, 5)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDA_INDY_Wrap(self):
+        self.cpu.Y_reg = 0xFF
+        self.mem[0xFFFC] = self.cpu.INS_LDA_INDY
+        self.mem[0xFFFD] = 0x20
+        self.mem[0x0020] = 0xF0
+        self.mem[0x0021] = 0xFF
+        self.mem[0x00EF] = 0x55
+        CyclesUsed = self.cpu.exec(self.mem, 6)
+        self.assertEqual(self.cpu.A_reg, 0x55)
+        self.assertEqual(CyclesUsed, 6)
+        self.VerifyFlags_NoMod_LDA()
+
+    def test_LDX_IM(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
+        self.mem[0xFFFD] = 0x99
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.X_reg, 0x99)
+        self.assertEqual(CyclesUsed, 2)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_IM_ZERO(self):
+        self.cpu.X_reg = 0x44
+        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
+        self.mem[0xFFFD] = 0x00
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.X_reg, 0x00)
+        self.assertEqual(CyclesUsed, 2)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ZP(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ZP
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0042] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.X_reg, 0x37)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ZPY(self):
+        self.cpu.Y_reg = 5
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ZPY
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0047] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.X_reg, 0x37)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ZPY_Wrap(self):
+        self.cpu.Y_reg = 0xFF
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ZPY
+        self.mem[0xFFFD] = 0x80
+        self.mem[0x007F] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.X_reg, 0x37)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ABS(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ABS
+        self.mem[0xFFFD] = 0x80
+        self.mem[0xFFFE] = 0x44
+        self.mem[0x4480] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.X_reg, 0x84)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ABSY(self):
+        self.cpu.Y_reg = 0x45
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ABSY
+        self.mem[0xFFFD] = 0x45
+        self.mem[0xFFFE] = 0x01
+        self.mem[0x0145 + self.cpu.Y_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.X_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDX_ABSY_Wrap(self):
+        self.cpu.Y_reg = 0x0F
+        self.mem[0xFFFC] = self.cpu.INS_LDX_ABSY
+        self.mem[0xFFFD] = 0xF5
+        self.mem[0xFFFE] = 0xFF
+        self.mem[0xFFF5 + self.cpu.Y_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.cpu.X_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDX()
+
+    def test_LDY_IM(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
+        self.mem[0xFFFD] = 0x95
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.Y_reg, 0x95)
+        self.assertEqual(CyclesUsed, 2)
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_IM_ZERO(self):
+        self.cpu.Y_reg = 0x44
+        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
+        self.mem[0xFFFD] = 0x00
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.Y_reg, 0x00)
+        self.assertEqual(CyclesUsed, 2)
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_ZP(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDY_ZP
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0042] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.Y_reg, 0x37)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_ZPX(self):
+        self.cpu.X_reg = 5
+        self.mem[0xFFFC] = self.cpu.INS_LDY_ZPX
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0047] = 0x37
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.Y_reg, 0x37)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_ABS(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDY_ABS
+        self.mem[0xFFFD] = 0x80
+        self.mem[0xFFFE] = 0x44
+        self.mem[0x4480] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.Y_reg, 0x84)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_ABSX(self):
+        self.cpu.X_reg = 0x45
+        self.mem[0xFFFC] = self.cpu.INS_LDY_ABSX
+        self.mem[0xFFFD] = 0x45
+        self.mem[0xFFFE] = 0x01
+        self.mem[0x0145 + self.cpu.X_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.Y_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_LDY_ABSX_Wrap(self):
+        self.cpu.X_reg = 0x0F
+        self.mem[0xFFFC] = self.cpu.INS_LDY_ABSX
+        self.mem[0xFFFD] = 0xF5
+        self.mem[0xFFFE] = 0xFF
+        self.mem[0xFFF5 + self.cpu.X_reg] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.cpu.Y_reg, 0x84)
+        self.assertIn(CyclesUsed, [4, 5])
+        self.VerifyFlags_NoMod_LDY()
+
+    def test_STA_ZP(self):
+        self.cpu.A_reg = 0xA4
+        self.mem[0xFFFC] = self.cpu.INS_STA_ZP
+        self.mem[0xFFFD] = 0x42
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.mem[0x42], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ZP_Wrap(self):
+        self.cpu.A_reg = 0xA4
+        self.mem[0xFFFC] = self.cpu.INS_STA_ZP
+        self.mem[0xFFFD] = 0x100
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.mem[0x0], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ZPX(self):
+        self.cpu.A_reg = 0xA4
+        self.cpu.X_reg = 0x15
+        self.mem[0xFFFC] = self.cpu.INS_STA_ZPX
+        self.mem[0xFFFD] = 0x13
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0x13 + self.cpu.X_reg], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ZPX_Wrap(self):
+        self.cpu.A_reg = 0xA4
+        self.cpu.X_reg = 0xF1
+        self.mem[0xFFFC] = self.cpu.INS_STA_ZPX
+        self.mem[0xFFFD] = 0x0F
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0x0], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ABS(self):
+        self.cpu.A_reg = 0xA5
+        self.mem[0xFFFC] = self.cpu.INS_STA_ABS
+        self.mem[0xFFFD] = 0x42
+        self.mem[0xFFFE] = 0x42
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0x4242], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ABSX(self):
+        self.cpu.X_reg = 0x14
+        self.cpu.A_reg = 0x15
+        self.mem[0xFFFC] = self.cpu.INS_STA_ABSX
+        self.mem[0xFFFD] = 0x42
+        self.mem[0xFFFE] = 0x43
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.mem[0x4342 + self.cpu.X_reg], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 5)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_ABSY(self):
+        self.cpu.Y_reg = 0x98
+        self.cpu.A_reg = 0x09
+        self.mem[0xFFFC] = self.cpu.INS_STA_ABSY
+        self.mem[0xFFFD] = 0x61
+        self.mem[0xFFFE] = 0xf6
+        CyclesUsed = self.cpu.exec(self.mem, 5)
+        self.assertEqual(self.mem[0xf661 + self.cpu.Y_reg], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 5)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_INDX(self):
+        self.cpu.X_reg = 0x42
+        self.cpu.A_reg = 0x61
+        self.mem[0xFFFC] = self.cpu.INS_STA_INDX
+        self.mem[0xFFFD] = 0x97
+        self.mem[0x0097 + self.cpu.X_reg] = 0x2A
+        self.mem[(0x0097 + self.cpu.X_reg) + 0x01] = 0x25
+        CyclesUsed = self.cpu.exec(self.mem, 6)
+        self.assertEqual(self.mem[0x252A], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 6)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STA_INDY(self):
+        self.cpu.Y_reg = 0x24
+        self.cpu.A_reg = 0xE3
+        self.mem[0xFFFC] = self.cpu.INS_STA_INDY
+        self.mem[0xFFFD] = 0x05
+        self.mem[0x0005 + self.cpu.Y_reg] = 0x06
+        self.mem[(0x0005 + self.cpu.Y_reg) + 0x01] = 0xA7
+        CyclesUsed = self.cpu.exec(self.mem, 6)
+        self.assertEqual(self.mem[0xA706], self.cpu.A_reg)
+        self.assertEqual(CyclesUsed, 6)
+        self.VerifyFlags_NoMod_STA()
+
+    def test_STX_ZP(self):
+        self.cpu.X_reg = 0xC9
+        self.mem[0xFFFC] = self.cpu.INS_STX_ZP
+        self.mem[0xFFFD] = 0xDD
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.mem[0xDD], self.cpu.X_reg)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_STX()
+
+    def test_STX_ZPY(self):
+        self.cpu.X_reg = 0xD1
+        self.cpu.Y_reg = 0x2F
+        self.mem[0xFFFC] = self.cpu.INS_STX_ZPY
+        self.mem[0xFFFD] = 0xCC
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0xCC + self.cpu.Y_reg], self.cpu.X_reg)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_STX()
+
+    def test_STX_ABS(self):
+        self.cpu.X_reg = 0xAE
+        self.mem[0xFFFC] = self.cpu.INS_STX_ABS
+        self.mem[0xFFFD] = 0x22
+        self.mem[0xFFFE] = 0xE7
+        CYclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0xE722], self.cpu.X_reg)
+        self.assertEqual(CYclesUsed, 4)
+        self.VerifyFlags_NoMod_STX()
+
+    def test_STY_ZP(self):
+        self.cpu.Y_reg = 0xBD
+        self.mem[0xFFFC] = self.cpu.INS_STY_ZP
+        self.mem[0xFFFD] = 0x7E
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.mem[0x7E], self.cpu.Y_reg)
+        self.assertEqual(CyclesUsed, 3)
+        self.VerifyFlags_NoMod_STY()
+
+    def test_STY_ZPX(self):
+        self.cpu.Y_reg = 0xD1
+        self.cpu.X_reg = 0x2F
+        self.mem[0xFFFC] = self.cpu.INS_STY_ZPX
+        self.mem[0xFFFD] = 0xCC
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0xFB], self.cpu.Y_reg)
+        self.assertEqual(CyclesUsed, 4)
+        self.VerifyFlags_NoMod_STY()
+
+    def test_STY_ABS(self):
+        self.cpu.Y_reg = 0xEA
+        self.mem[0xFFFC] = self.cpu.INS_STY_ABS
+        self.mem[0xFFFD] = 0x17
+        self.mem[0xFFFE] = 0x35
+        CYclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.mem[0x3517], self.cpu.Y_reg)
+        self.assertEqual(CYclesUsed, 4)
+        self.VerifyFlags_NoMod_STY()
+
+    def test_TAX_IMP(self):
+        self.cpu.A_reg = 0x80
+        self.mem[0xFFFC] = self.cpu.INS_TAX_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.X_reg, 0x80)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertTrue(self.cpu.N_flag)
+        self.assertFalse(self.cpu.Z_flag)
+
+    def test_TAY_IMP(self):
+        self.cpu.A_reg = 0x00
+        self.mem[0xFFFC] = self.cpu.INS_TAY_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.Y_reg, 0x00)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertFalse(self.cpu.N_flag)
+        self.assertTrue(self.cpu.Z_flag)
+
+    def test_TXA_IMP(self):
+        self.cpu.X_reg = 0x7F
+        self.mem[0xFFFC] = self.cpu.INS_TXA_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.A_reg, 0x7F)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertFalse(self.cpu.N_flag)
+        self.assertFalse(self.cpu.Z_flag)
+
+    def test_TYA_IMP(self):
+        self.cpu.A_reg = 0x00
+        self.mem[0xFFFC] = self.cpu.INS_TYA_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.A_reg, 0x00)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertFalse(self.cpu.N_flag)
+        self.assertTrue(self.cpu.Z_flag)
+
+    def test_TSX_IMP(self):
+        self.cpu.SP = 0xFE
+        self.mem[0xFFFC] = self.cpu.INS_TSX_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.X_reg, 0xFE)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertTrue(self.cpu.N_flag)
+        self.assertFalse(self.cpu.Z_flag)
+
+    def test_TXS_IMP(self):
+        self.cpu.X_reg = 0xAB
+        self.mem[0xFFFC] = self.cpu.INS_TXS_IMP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.SP, 0xAB)
+        self.assertEqual(CyclesUsed, 2)
+        self.assertFalse(self.cpu.N_flag)
+        self.assertFalse(self.cpu.Z_flag)
+
+    def test_PHA(self):
+        self.cpu.A_reg = 0x42
+        self.cpu.SP = 0xFD
+        self.mem[0xFFFC] = self.cpu.INS_PHA
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.SP, 0xFC)
+        self.assertEqual(self.mem[0x01FD], 0x42)
+        self.assertEqual(CyclesUsed, 3)
+
+    def test_PHP(self):
+        self.cpu.P_status = 0b10110101
+        self.cpu.SP = 0xFC
+        self.mem[0xFFFC] = self.cpu.INS_PHP
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.SP, 0xFB)
+        self.assertEqual(self.mem[0x01FC], 0b10110101 | 0b00110000)
+        self.assertEqual(CyclesUsed, 3)
+
+    def test_PLA(self):
+        self.cpu.SP = 0xFC
+        self.mem[0x01FD] = 0x7F
+        self.mem[0xFFFC] = self.cpu.INS_PLA
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.SP, 0xFD)
+        self.assertEqual(self.cpu.A_reg, 0x7F)
+        self.assertEqual(CyclesUsed, 4)
+        self.assertFalse(self.cpu.Z_flag)
+        self.assertFalse(self.cpu.N_flag)
+
+    def test_PLP(self):
+        self.cpu.SP = 0xFC
+        self.mem[0x01FD] = 0b11001101
+        self.mem[0xFFFC] = self.cpu.INS_PLP
+        CyclesUsed = self.cpu.exec(self.mem, 4)
+        self.assertEqual(self.cpu.SP, 0xFD)
+        ExpectedStatus = (0b11001101 & 0b11001111) | 0b00100000
+        self.assertEqual(self.cpu.P_status, ExpectedStatus)
+        self.assertEqual(CyclesUsed, 4)
+
+    def test_NOP(self):
+        self.mem[0xFFFC] = self.cpu.INS_NOP
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_NOP_IF_CYCLES_EQ_0(self):
+        CyclesUsed = self.cpu.exec(self.mem, 0)
+        self.assertEqual(CyclesUsed, 0)
+
+    def test_LDA_IM_LT_NC(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
+        self.mem[0xFFFD] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 1)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_LDX_IM_LT_NC(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDX_IM
+        self.mem[0xFFFD] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 1)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_LDY_IM_LT_NC(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDY_IM
+        self.mem[0xFFFD] = 0x84
+        CyclesUsed = self.cpu.exec(self.mem, 1)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_AND_IM(self):
+        self.cpu.A_reg = 0xF0
+        self.mem[0xFFFC] = self.cpu.INS_AND_IM
+        self.mem[0xFFFD] = 0x0F
+        CyclesUsed = self.cpu.exec( self.mem, 2 )
+        self.assertEqual(self.cpu.A_reg, 0xF0 & 0x0F)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_AND_ZP(self):
+        self.cpu.A_reg = 0xF0
+        self.mem[0xFFFC] = self.cpu.INS_AND_ZP
+        self.mem[0xFFFD] = 0x42
+        self.mem[0x0042] = 0x7F
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(self.cpu.A_reg, 0x70)
+        self.assertEqual(CyclesUsed, 3)
+
+    def test_INS_NH(self):
+        self.mem[0xFFFC] = 0x02
+        self.mem[0xFFFD] = 0x03
+        CyclesUsed = self.cpu.exec(self.mem, 2)
+        self.assertEqual(CyclesUsed, 2)
+
+    def test_LAZY_NZ_FLAGS(self):
+        self.cpu.SP = 0xFC
+        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
+        self.mem[0xFFFD] = 0x00
+        self.mem[0xFFFE] = self.cpu.INS_LDX_IM
+        self.mem[0xFFFF] = 0x80
+        self.mem[0x0000] = self.cpu.INS_PHP
+        CyclesUsed = self.cpu.exec(self.mem, 7)
+        self.assertEqual(CyclesUsed, 7)
+        self.assertEqual(self.mem[0x01FC], 0b10110000)
+        self.assertTrue(self.cpu.N_flag)
+        self.assertFalse(self.cpu.Z_flag)
+        self.cpu.Z_flag = 1
+        self.assertEqual(self.cpu.P_status, 0b10100010)
+
+    def LoadLoadSequence(self):
+        self.mem[0xFFFC] = self.cpu.INS_LDA_IM
+        self.mem[0xFFFD] = 0x01
+        self.mem[0xFFFE] = self.cpu.INS_LDX_IM
+        self.mem[0xFFFF] = 0x02
+        self.mem[0x0000] = self.cpu.INS_LDY_IM
+        self.mem[0x0001] = 0x03
+
+    def test_RUN_UNTIL_PC(self):
+        self.LoadLoadSequence()
+        Result = self.cpu.run_until(self.mem, pc=0x0000, cycles=100)
+        self.assertEqual(Result, (Computer.Cpu.STOP_PC, 4, 2))
+        self.assertEqual(self.cpu.X_reg, 0x02)
+        self.assertEqual(self.cpu.Y_reg, 0x00)
+
+    def test_RUN_UNTIL_INSTRUCTIONS(self):
+        self.LoadLoadSequence()
+        Result = self.cpu.run_until(self.mem, instructions=1)
+        self.assertEqual(Result.reason, Computer.Cpu.STOP_INSTRUCTIONS)
+        self.assertEqual(Result.cycles, 2)
+        self.assertEqual(self.cpu.A_reg, 0x01)
+
+    def test_RUN_UNTIL_CYCLES(self):
+        self.LoadLoadSequence()
+        Result = self.cpu.run_until(self.mem, cycles=3, instructions=10)
+        self.assertEqual(Result, (Computer.Cpu.STOP_CYCLES, 4, 2))
+        with self.assertRaises(ValueError):
+            self.cpu.run_until(self.mem)
+
+    def test_DISPATCH_TABLE(self):
+        self.mem[0xFFFC] = self.cpu.INS_NOP
+        self.cpu.exec(self.mem, 2)
+        other = Computer.Cpu.CPU()
+        other.reset(Computer.Memory.Mem())
+        other.exec(self.mem, 0)
+        Table = Computer.Cpu.CPU._DISPATCH
+        self.assertEqual(len(Table), 256)
+        self.assertIs(Table[self.cpu.INS_LDA_IM], Computer.Cpu.CPU._op_LDA_IM)
+        self.assertIs(Table[0x02], Computer.Cpu.CPU._op_NotHandled)
+        self.assertIs(Computer.Cpu.CPU.buildDispatchTable(), Computer.Cpu.CPU._DISPATCH)
+
+    def test_OPCODE_TABLE(self):
+        Entry = Computer.Cpu.OPCODE_TABLE[self.cpu.INS_LDA_ABSX]
+        self.assertEqual(Entry[:5], ("INS_LDA_ABSX", 0xBD, "LDA", "ABSX", 4))
+        self.assertEqual(Computer.Cpu.CPU.INS_BEQ, 0xF0)
+        self.assertEqual(len({Entry.value for Entry in Computer.Cpu.OPCODES}), len(Computer.Cpu.OPCODES))
+        self.assertFalse(hasattr(self.cpu, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.cpu.Accumulator = 0x00
+
+class TestAlu(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+
+    def Run(self, source: str, cycles: int) -> int:
+        Computer.Assembler.assemble(source, 0x0400).load(self.mem)
+        self.cpu.PC = 0x0400
+        return self.cpu.exec(self.mem, cycles)
+
+    def test_ADC_BINARY_OVERFLOW(self):
+        CyclesUsed = self.Run("LDA #$50\nADC #$50", 4)
+        self.assertEqual(CyclesUsed, 4)
+        self.assertEqual(self.cpu.A_reg, 0xA0)
+        self.assertEqual((self.cpu.C_flag, self.cpu.Z_flag, self.cpu.V_flag, self.cpu.N_flag), (0, 0, 1, 1))
+        self.assertEqual(self.cpu.P_status & 0b00111100, 0b00100000)
+
+    def test_ADC_DECIMAL(self):
+        self.mem[0x0010] = 0x46
+        CyclesUsed = self.Run("SED\nSEC\nLDA #$58\nADC $10", 9)
+        self.assertEqual(CyclesUsed, 9)
+        self.assertEqual(self.cpu.A_reg, 0x05)
+        self.assertEqual((self.cpu.C_flag, self.cpu.D_flag), (1, 1))
+        self.assertEqual(Computer.Cpu.addWithCarry(0x99, 0x01, 0, 1), (0x00, 1, 0, 0, 1))
+
+    def test_SBC_DECIMAL_BORROW(self):
+        self.mem.load(0x0200, bytes([0x10, 0x01]))
+        CyclesUsed = self.Run("SED\nSEC\nLDX #$01\nLDA #$00\nSBC $01FF,X\nCLD", 15)
+        self.assertEqual(CyclesUsed, 15)
+        self.assertEqual(self.cpu.A_reg, 0x90)
+        self.assertEqual((self.cpu.C_flag, self.cpu.D_flag, self.cpu.N_flag), (0, 0, 1))
+
+    def test_COMPARE_AND_BIT(self):
+        self.mem[0x0020] = 0xC0
+        self.Run("LDA #$40\nCMP #$40\nBIT $20", 7)
+        self.assertEqual((self.cpu.C_flag, self.cpu.Z_flag, self.cpu.V_flag, self.cpu.N_flag), (1, 0, 1, 1))
+        self.Run("LDX #$10\nCPX #$11", 4)
+        self.assertEqual((self.cpu.C_flag, self.cpu.Z_flag, self.cpu.N_flag), (0, 0, 1))
+
+    def test_SHIFTS_AND_ROTATES(self):
+        self.mem[0x0030] = 0x81
+        CyclesUsed = self.Run("SEC\nROR $30\nLDA #$80\nASL A\nROL\nLSR A", 15)
+        self.assertEqual(CyclesUsed, 15)
+        self.assertEqual(self.mem[0x0030], 0xC0)
+        self.assertEqual(self.cpu.A_reg, 0x00)
+        self.assertEqual((self.cpu.C_flag, self.cpu.Z_flag), (1, 1))
+
+    def test_INC_DEC_CYCLES(self):
+        self.mem[0x02FF] = 0xFF
+        self.cpu.X_reg = 0xFF
+        CyclesUsed = self.Run("INC $0200,X\nDEC $02FF\nDEX\nINY", 17)
+        self.assertEqual(CyclesUsed, 17)
+        self.assertEqual(self.mem[0x02FF], 0xFF)
+        self.assertEqual((self.cpu.X_reg, self.cpu.Y_reg, self.cpu.N_flag), (0xFE, 0x01, 0))
+
+class TestMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+
+    def test_MEM_IS_BYTEARRAY(self):
+        self.assertIsInstance(self.mem.Data, bytearray)
+        self.assertEqual(len(self.mem.Data), 0x10000)
+
+    def test_MEM_WRITE_MASKS(self):
+        cycles = [3]
+        self.mem[0x10042] = 0x1FF
+        self.mem.WriteWord(cycles, 0xFFFF, 0xBEEF)
+        self.assertEqual(self.mem[0x0042], 0xFF)
+        self.assertEqual(self.mem[0xFFFF], 0xEF)
+        self.assertEqual(self.mem[0x0000], 0xBE)
+        self.assertEqual(cycles[0], 1)
+
+    def test_MEM_LOAD_DUMP(self):
+        self.mem.load(0x0200, b"\xA9\x42\xEA")
+        self.assertEqual(self.mem.dump(0x0200, 0x0203), b"\xA9\x42\xEA")
+        self.assertEqual(self.mem.View[0x0201], 0x42)
+        with self.assertRaises(TypeError):
+            self.mem.View[0x0201] = 0x00
+        with self.assertRaises(ValueError):
+            self.mem.load(0xFFFF, b"\x00\x00")
+
+    def test_MEM_FILL_COPY(self):
+        self.mem.fill(0x1000, 0x1010, 0x1AB)
+        self.assertEqual(self.mem.dump(0x1000, 0x1010), b"\xAB" * 0x10)
+        self.mem.load(0x2000, bytes(range(8)))
+        self.mem.copy(0x2000, 0x2002, 8)
+        self.assertEqual(self.mem.dump(0x2000, 0x200A), bytes([0, 1, 0, 1, 2, 3, 4, 5, 6, 7]))
+
+    def test_MEM_INIT_IN_PLACE(self):
+        View = self.mem.View
+        self.mem[0x1234] = 0x56
+        self.mem.init()
+        self.assertEqual(self.mem[0x1234], 0x00)
+        self.assertIs(self.mem.View, View)
+
+    def test_MEM_ROM_MAP(self):
+        with tempfile.TemporaryDirectory() as Dir:
+            Path = os.path.join(Dir, "test.rom")
+            with open(Path, "wb") as File:
+                File.write(bytes([0xAA]) * 0x100 + bytes([0x55]) * 0x100)
+            rom = self.mem.mapRom(Path, 0xF000, offset=0x100)
+            self.mem[0xF010] = 0x12
+            self.mem.load(0xF020, b"\x34")
+            self.assertEqual(self.mem[0xF010], 0x55)
+            self.assertEqual(self.mem[0xF020], 0x55)
+            self.assertEqual(self.mem[0xF100], 0x00)
+            Other = Computer.Memory.Mem()
+            Other.mapRom(rom)
+            self.assertEqual(Other.dump(0xF0FE, 0xF102), b"\x55\x55\x00\x00")
+            self.mem.unmapRom(rom)
+            self.assertEqual(self.mem[0xF010], 0x00)
+            self.assertEqual(self.mem[0xF020], 0x34)
+            Other.unmapRom(rom)
+            rom.close()
+
+    def test_MEM_DEVICE(self):
+        Written = []
+        Device = self.mem.mapDevice(0xD000, read=lambda Address: Address >> 4, write=lambda Address, Value: Written.append((Address, Value)))
+        self.mem[0xD012] = 0x1FF
+        self.mem[0xD100] = 0x34
+        self.assertEqual(Written, [(0xD012, 0xFF)])
+        self.assertEqual((self.mem[0xD012], self.mem[0xD100]), (0x01, 0x34))
+        self.assertEqual(self.mem.Data[0xD012], 0x00)
+        self.mem.unmap(Device)
+        self.mem[0xD012] = 0x56
+        self.assertEqual(self.mem[0xD012], 0x56)
+        self.assertEqual(len(Written), 1)
+
+    def test_MEM_ROM_TRAP(self):
+        self.mem.mapRom(bytes(0x200), 0xE000, on_write="trap")
+        cycles = [1]
+        with self.assertRaises(Computer.Memory.RomWriteError):
+            self.mem.WriteByte(cycles, 0xE1FF, 0x01)
+        with self.assertRaises(ValueError):
+            self.mem.mapRom(bytes(0x80), 0xE000)
+        with self.assertRaises(ValueError):
+            self.mem.mapRom(bytes(0x100))
+
+class TestPredecode(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU(predecode=True)
+        self.cpu.reset(self.mem)
+
+    def test_SPLIT_INSTRUCTION_NAME(self):
+        self.assertEqual(Computer.Cpu.splitInstructionName("INS_LDA_ZPX"), ("LDA", "ZPX"))
+        self.assertEqual(Computer.Cpu.splitInstructionName("INS_JSR"), ("JSR", "ABS"))
+        self.assertEqual(Computer.Cpu.splitInstructionName("INS_PHA"), ("PHA", "IMP"))
+
+    def test_PREDECODE_CACHES_BY_PC(self):
+        self.mem.load(0x0200, bytes([self.cpu.INS_LDA_ZP, 0x42]))
+        self.cpu.PC = 0x0200
+        CyclesUsed = self.cpu.exec(self.mem, 3)
+        self.assertEqual(CyclesUsed, 3)
+        Handler, Operand, NextPC, Length = self.cpu.Decoded[0x0200]
+        self.assertIs(Handler, Computer.Cpu.CPU._op_LDA_ZP)
+        self.assertEqual((Operand, NextPC, Length), (0x42, 0x0202, 2))
+
+    def test_PREDECODE_SELF_MODIFYING(self):
+        self.mem.load(0x0200, bytes([
+            self.cpu.INS_LDA_IM, 0x42,
+            self.cpu.INS_STA_ABS, 0x06, 0x02,
+            self.cpu.INS_LDX_IM, 0x00]))
+        self.cpu.PC = 0x0205
+        self.cpu.exec(self.mem, 2)
+        self.assertEqual(self.cpu.X_reg, 0x00)
+        self.cpu.PC = 0x0200
+        self.cpu.exec(self.mem, 8)
+        self.assertEqual(self.cpu.X_reg, 0x42)
+        self.mem.load(0x0200, bytes([self.cpu.INS_LDY_IM, 0x07]))
+        self.assertNotIn(0x0200, self.cpu.Decoded)
+        self.cpu.PC = 0x0200
+        self.cpu.run_until(self.mem, instructions=1)
+        self.assertEqual(self.cpu.Y_reg, 0x07)
+
+class TestJit(unittest.TestCase):
+
+    def RunBoth(self, Program: bytes, Cycles: s32, **Registers):
+        """Run Program at 0x0200 on the interpreter and the JIT, return both machine states."""
+        States = []
+        for UseJit in (False, True):
+            mem = Computer.Memory.Mem()
+            cpu = Computer.Cpu.CPU()
+            cpu.reset(mem)
+            mem.load(0x0200, Program)
+            cpu.PC = 0x0200
+            for Name, Value in Registers.items():
+                setattr(cpu, Name, Value)
+            Engine = Computer.Jit.JIT(cpu) if UseJit else cpu
+            CyclesUsed = Engine.exec(mem, Cycles)
+            States.append((CyclesUsed, cpu.PC, cpu.A_reg, cpu.X_reg, cpu.Y_reg, cpu.SP, cpu.P_status, mem.dump()))
+        return States
+
+    def test_JIT_MATCHES_INTERPRETER(self):
+        cpu = Computer.Cpu.CPU()
+        Program = bytes([
+            cpu.INS_LDA_IM, 0x80, cpu.INS_STA_ZP, 0x10, cpu.INS_LDX_ZP, 0x10, cpu.INS_TXA_IMP,
+            cpu.INS_LDA_ABSX, 0xF0, 0x12, cpu.INS_STA_ABSY, 0xFF, 0x30, cpu.INS_PHA, cpu.INS_PHP,
+            cpu.INS_LDY_IM, 0x00, cpu.INS_PLP, cpu.INS_PLA, cpu.INS_AND_IM, 0x0F, cpu.INS_NOP, 0xFF,
+            cpu.INS_STA_INDX, 0x20, cpu.INS_LDA_INDY, 0x20, cpu.INS_JSR, 0x00, 0x02])
+        for Cycles in (1, 7, 40, 200):
+            Interpreted, Compiled = self.RunBoth(Program, Cycles, SP=0xFF, Y_reg=0x21)
+            self.assertEqual(Interpreted, Compiled)
+
+    def test_JIT_IRQ(self):
+        Handler = """
+            .org $0300
+            STX $10             ; X when the interrupt was taken
+            STA $D000           ; acknowledge, the device releases IRQ
+            RTI
+            .org $FFFE
+            .word $0300
+        """
+        Programs = (
+            # PLP clears I_flag with the IRQ already asserted
+            ("""
+                .org $0200
+                LDA #$00
+                PHA
+                PLP
+                INX
+                INX
+                INX
+                INX
+                JMP $0208
+            """, True),
+            # A store to the device asserts IRQ
+            ("""
+                .org $0200
+                CLI
+                STA $D100
+                INX
+                INX
+                INX
+                INX
+                JMP $0208
+            """, False),
+        )
+        for Source, Asserted in Programs:
+            States = []
+            for UseJit in (False, True):
+                mem = Computer.Memory.Mem()
+                cpu = Computer.Cpu.CPU()
+                cpu.reset(mem)
+                Computer.Assembler.assemble(Source + Handler).load(mem)
+                mem.mapDevice(0xD000, write=lambda Address, Value, cpu=cpu: cpu.irq(Address == 0xD100))
+                cpu.PC, cpu.SP, cpu.I_flag = 0x0200, 0xFF, 1 if Asserted else 0
+                if Asserted:
+                    cpu.irq()
+                Engine = Computer.Jit.JIT(cpu) if UseJit else cpu
+                CyclesUsed = Engine.exec(mem, 60)
+                States.append((CyclesUsed, cpu.PC, cpu.A_reg, cpu.X_reg, cpu.Y_reg, cpu.SP, cpu.P_status, mem.dump()))
+            self.assertEqual(States[0], States[1])
+            self.assertEqual((mem[0x10], cpu.X_reg, cpu.IRQLines), (0, 4, 0))
+
+    def test_JIT_READ_NMI(self):
+        Source = """
+            .org $0200
+            start: LDA $D000    ; reading the device signals an NMI
+            LDX #$11
+            LDY #$22
+            STA $30
+            LDA #$01
+            JMP start
+            .org $0300
+            RTI
+            .org $FFFA
+            .word $0300
+        """
+        for Cycles in range(13, 22):
+            States = []
+            for UseJit in (False, True):
+                mem = Computer.Memory.Mem()
+                cpu = Computer.Cpu.CPU()
+                cpu.reset(mem)
+                Computer.Assembler.assemble(Source).load(mem)
+                mem.mapDevice(0xD000, read=lambda Address, cpu=cpu: cpu.nmi() or 0)
+                cpu.PC, cpu.SP = 0x0200, 0xFF
+                Engine = Computer.Jit.JIT(cpu) if UseJit else cpu
+                CyclesUsed = Engine.exec(mem, Cycles)
+                States.append((CyclesUsed, cpu.PC, cpu.A_reg, cpu.X_reg, cpu.Y_reg, cpu.SP, cpu.P_status, mem.dump()))
+            self.assertEqual(States[0], States[1], Cycles)
+            self.assertEqual((mem[0x01FE], mem[0x01FF]), (0x03, 0x02))
+
+    def test_JIT_SELF_MODIFYING(self):
+        cpu = Computer.Cpu.CPU()
+        Program = bytes([
+            cpu.INS_LDA_IM, 0x42, cpu.INS_LDX_IM, 0x00, cpu.INS_STA_ABSX, 0x0B, 0x02,
+            cpu.INS_STA_ABS, 0x0D, 0x02, cpu.INS_LDY_IM, 0x00, cpu.INS_LDX_IM, 0x00])
+        Interpreted, Compiled = self.RunBoth(Program, 21)
+        self.assertEqual(Interpreted, Compiled)
+        self.assertEqual(Compiled[3:5], (0x42, 0x42))
+
+    def test_JIT_BLOCK_CACHE(self):
+        mem = Computer.Memory.Mem()
+        cpu = Computer.Cpu.CPU()
+        cpu.reset(mem)
+        mem.load(0x0200, bytes([cpu.INS_LDA_IM, 0x01, cpu.INS_TAX_IMP, 0x02]))
+        jit = Computer.Jit.JIT(cpu)
+        cpu.PC = 0x0200
+        self.assertEqual(jit.exec(mem, 4), 4)
+        Run, MaxCycles, Start, End = jit.Blocks[0x0200]
+        self.assertEqual((MaxCycles, Start, End), (4, 0x0200, 0x0203))
+        mem[0x0201] = 0x05
+        self.assertNotIn(0x0200, jit.Blocks)
+        cpu.PC = 0x0200
+        jit.exec(mem, 4)
+        self.assertEqual(cpu.X_reg, 0x05)
+
+class TestLockstep(unittest.TestCase):
+
+    @unittest.skipUnless(Computer.Lockstep.np, "NumPy is not installed")
+    def test_LOCKSTEP_MATCHES_EXEC(self):
+        cpu = Computer.Cpu.CPU()
+        Program = bytes([
+            cpu.INS_LDA_ZPX, 0x10, cpu.INS_STA_ABSX, 0xF0, 0x30, cpu.INS_TAY_IMP, cpu.INS_LDA_INDY, 0x20,
+            cpu.INS_AND_IM, 0x8F, cpu.INS_PHA, cpu.INS_PHP, cpu.INS_PLA, cpu.INS_STA_INDX, 0x20,
+            cpu.INS_TSX_IMP, cpu.INS_PLP, cpu.INS_NOP, 0xFF, cpu.INS_JSR, 0x00, 0x02])
+        Lanes = Computer.Lockstep.Lockstep(24)
+        Machines = []
+        for Lane in range(24):
+            mem = Computer.Memory.Mem()
+            cpu = Computer.Cpu.CPU()
+            cpu.reset(mem)
+            mem.load(0x0200, Program)
+            mem.load(0x0010, bytes(range(Lane, Lane + 40)))
+            mem.load(0x0020, bytes([0xF0 + Lane % 3, 0x12]))
+            cpu.PC, cpu.SP, cpu.X_reg = 0x0200, 0xFF - Lane, Lane * 11 % 256
+            Lanes.setMachine(Lane, cpu, mem)
+            Machines.append((cpu, mem))
+        Budgets = [Lane * 7 + 1 for Lane in range(24)]
+        Used = Lanes.exec(Budgets)
+        for Lane, (cpu, mem) in enumerate(Machines):
+            self.assertEqual(Used[Lane], cpu.exec(mem, Budgets[Lane]))
+            Result, Memory = Lanes.machine(Lane)
+            self.assertEqual((Result.PC, Result.SP, Result.A_reg, Result.X_reg, Result.Y_reg, Result.P_status),
+                             (cpu.PC, cpu.SP, cpu.A_reg, cpu.X_reg, cpu.Y_reg, cpu.P_status))
+            self.assertEqual(Memory.dump(), mem.dump())
+
+    @unittest.skipUnless(Computer.Lockstep.np, "NumPy is not installed")
+    def test_LOCKSTEP_ALU(self):
+        Program = Computer.Assembler.assemble("""
+            ADC $10,X
+            SBC ($20),Y
+            EOR #$5A
+            ROL $11
+            CMP $12
+            ORA $0300,Y
+            LSR A
+            DEC $0280,X
+            BIT $13
+            INX
+            CPY #$80
+            SED
+            ADC #$19
+        """, 0x0200)
+        Lanes = Computer.Lockstep.Lockstep(16)
+        Machines = []
+        for Lane in range(16):
+            mem = Computer.Memory.Mem()
+            cpu = Computer.Cpu.CPU()
+            cpu.reset(mem)
+            Program.load(mem)
+            mem.load(0x0010, bytes((Lane * 37 + i * 11) & 0xFF for i in range(32)))
+            mem.load(0x0020, bytes([0xF0 + Lane, 0x02]))
+            cpu.PC, cpu.A_reg, cpu.X_reg, cpu.Y_reg = 0x0200, Lane * 29 % 256, Lane * 3, Lane * 17
+            cpu.P_status = 0b00100000 | (Lane & 0b00001001)
+            Lanes.setMachine(Lane, cpu, mem)
+            Machines.append((cpu, mem))
+        Used = Lanes.exec(60)
+        for Lane, (cpu, mem) in enumerate(Machines):
+            self.assertEqual(Used[Lane], cpu.exec(mem, 60))
+            Result, Memory = Lanes.machine(Lane)
+            self.assertEqual((Result.PC, Result.A_reg, Result.X_reg, Result.P_status), (cpu.PC, cpu.A_reg, cpu.X_reg, cpu.P_status))
+            self.assertEqual(Memory.dump(), mem.dump())
+
+class TestBatch(unittest.TestCase):
+
+    def test_BATCH_MANIFEST(self):
+        cpu = Computer.Cpu.CPU()
+        Program = bytes([cpu.INS_LDA_IM, 0x42, cpu.INS_STA_ZP, 0x10, cpu.INS_LDX_ZP, 0x11, cpu.INS_NOP, 0xEA])
+        with tempfile.TemporaryDirectory() as Dir:
+            with open(os.path.join(Dir, "test.rom"), "wb") as File:
+                File.write(Program + bytes(0x100 - len(Program)))
+            with open(os.path.join(Dir, "jobs.jsonl"), "w") as File:
+                for Id, X in (("a", 1), ("b", 2)):
+                    File.write(json.dumps({"id": Id, "rom": "test.rom", "address": "0x0200",
+                                           "registers": {"PC": 0x0200, "X_reg": X}, "stop": {"pc": "0x0206"},
+                                           "dump": [[0x10, 0x12]]}) + "\n")
+                File.write(json.dumps({"id": "c", "rom": "missing.rom", "address": 0x0200}) + "\n")
+            Jobs = Computer.Batch.loadManifest(os.path.join(Dir, "jobs.jsonl"))
+            Output = io.StringIO()
+            self.assertEqual(Computer.Batch.runBatch(Jobs, Output, workers=2), 1)
+        Results = {Result["id"]: Result for Result in map(json.loads, Output.getvalue().splitlines())}
+        self.assertEqual(sorted(Results), ["a", "b", "c"])
+        self.assertEqual((Results["a"]["reason"], Results["a"]["cycles"], Results["a"]["instructions"]), ("pc", 8, 3))
+        self.assertEqual(Results["b"]["registers"]["A_reg"], 0x42)
+        self.assertEqual(Results["b"]["memory"], [{"start": 0x10, "end": 0x12, "data": "4200"}])
+        self.assertIn("error", Results["c"])
+
+    def test_BATCH_CYCLE_LIMIT(self):
+        cpu = Computer.Cpu.CPU()
+        with tempfile.TemporaryDirectory() as Dir:
+            Path = os.path.join(Dir, "loop.rom")
+            with open(Path, "wb") as File:
+                File.write(bytes([cpu.INS_JMP_ABS, 0x00, 0x02]) + bytes(0xFD))
+            Limit = Computer.Batch.MAX_CYCLES
+            Computer.Batch.MAX_CYCLES = 300
+            try:
+                Result = Computer.Batch.runJob({"id": "loop", "rom": Path, "address": 0x0200,
+                                                "registers": {"PC": 0x0200}, "stop": {"pc": "0x0300"}})
+            finally:
+                Computer.Batch.MAX_CYCLES = Limit
+        self.assertEqual((Result["reason"], Result["cycles"], Result["registers"]["PC"]), ("cycles", 300, 0x0200))
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+        self.mem.load(0x0200, bytes([self.cpu.INS_LDA_IM, 0x80, self.cpu.INS_STA_ZP, 0x10, self.cpu.INS_LDX_IM, 0x00]))
+        self.cpu.PC = 0x0200
+
+    def test_SNAPSHOT_RESTORE(self):
+        self.cpu.exec(self.mem, 2)
+        Snapshot = self.cpu.snapshot(self.mem)
+        self.cpu.exec(self.mem, 5)
+        self.assertEqual((self.cpu.PC, self.mem[0x10], self.cpu.Z_flag), (0x0206, 0x80, 1))
+        self.cpu.restore(self.mem, Snapshot)
+        self.assertEqual((self.cpu.PC, self.cpu.A_reg, self.cpu.N_flag, self.cpu.Z_flag), (0x0202, 0x80, 1, 0))
+        self.assertEqual(self.mem[0x10], 0x00)
+        self.assertEqual(self.cpu.snapshot(self.mem), Snapshot)
+
+    def test_INCREMENTAL_SNAPSHOT(self):
+        self.mem.trackDirty()
+        Full = self.cpu.snapshot(self.mem)
+        self.assertIsInstance(Full.Memory, bytes)
+        self.cpu.exec(self.mem, 5)
+        First = self.cpu.snapshot(self.mem)
+        self.assertEqual([Page for Page, Data in First.Memory.Pages], [0x00])
+        self.mem.WriteWord([2], 0x30FF, 0x1234)
+        Second = self.cpu.snapshot(self.mem)
+        self.assertEqual([Page for Page, Data in Second.Memory.Pages], [0x30, 0x31])
+        self.assertIs(self.cpu.snapshot(self.mem).Memory, Second.Memory)
+        self.cpu.restore(self.mem, First)
+        self.assertEqual((self.mem[0x10], self.mem[0x30FF], self.mem[0x3100]), (0x80, 0x00, 0x00))
+        self.cpu.restore(self.mem, Second)
+        self.assertEqual((self.mem[0x30FF], self.mem[0x3100]), (0x34, 0x12))
+        self.cpu.restore(self.mem, Full)
+        self.assertEqual(self.mem.dump(0x0000, 0x0100), bytes(0x100))
+
+    def test_FORK(self):
+        rom = self.mem.mapRom(bytes([0x99]) * 0x100, 0xF000)
+        self.cpu.exec(self.mem, 2)
+        cpu, mem = self.cpu.fork(self.mem)
+        cpu.exec(mem, 5)
+        self.assertEqual((mem[0x10], self.mem[0x10]), (0x80, 0x00))
+        self.assertEqual((cpu.PC, self.cpu.PC), (0x0206, 0x0202))
+        self.assertIs(mem.Pages[0xF0], rom)
+        self.assertEqual(mem[0xF000], 0x99)
+
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+        self.mem.load(0x0200, bytes([self.cpu.INS_LDA_IM, 0x80, self.cpu.INS_TAX_IMP, self.cpu.INS_STA_ZP, 0x10, self.cpu.INS_LDY_ZP, 0x10]))
+        self.cpu.PC = 0x0200
+
+    def test_TRACE_FILE(self):
+        with tempfile.TemporaryDirectory() as Dir:
+            Path = os.path.join(Dir, "run.trace")
+            Trace = Computer.Trace.Trace(capacity=3, path=Path)
+            Trace.attach(self.cpu)
+            self.assertEqual(self.cpu.exec(self.mem, 10), 10)
+            Trace.detach(self.cpu)
+            Trace.close()
+            File = Computer.Trace.TraceFile(Path)
+            self.assertEqual(len(File), 4)
+            self.assertEqual(File[0], (0, 0x0200, 0x0100, self.cpu.INS_LDA_IM, 0x00, 0x00, 0x00, 0b00100000))
+            self.assertEqual(File[-1], (7, 0x0205, 0x0100, self.cpu.INS_LDY_ZP, 0x80, 0x80, 0x00, 0b10100000))
+            if Computer.Trace.np is not None:
+                Array = File.array()
+                self.assertEqual(list(Array["pc"]), [0x0200, 0x0202, 0x0203, 0x0205])
+                del Array
+            File.close()
+
+    def test_TRACE_RING(self):
+        Trace = Computer.Trace.Trace(capacity=2)
+        Trace.attach(self.cpu)
+        self.cpu.exec(self.mem, 10)
+        self.assertEqual(Trace.Count, 4)
+        self.assertEqual([Record.pc for Record in Trace.records()], [0x0203, 0x0205])
+        Trace.detach(self.cpu)
+        # Exactly capacity records fill the ring without wrapping
+        Trace = Computer.Trace.Trace(capacity=4)
+        Trace.attach(self.cpu)
+        self.cpu.PC = 0x0200
+        self.cpu.run_until(self.mem, instructions=4)
+        self.assertEqual([Record.pc for Record in Trace.records()], [0x0200, 0x0202, 0x0203, 0x0205])
+
+class TestProfile(unittest.TestCase):
+
+    def test_PROFILE_COUNTERS(self):
+        mem = Computer.Memory.Mem()
+        cpu = Computer.Cpu.CPU()
+        cpu.reset(mem)
+        mem.load(0x0200, bytes([cpu.INS_LDA_IM, 0x01, cpu.INS_JSR, 0x00, 0x03]))
+        mem.load(0x0300, bytes([cpu.INS_LDA_IM, 0x02, cpu.INS_TAX_IMP, cpu.INS_LDA_IM, 0x03]))
+        cpu.PC = 0x0200
+        Profiler = Computer.Profile.Profiler(cpu, labels={0x0300: "sub"})
+        self.assertEqual(Profiler.exec(mem, 14), 14)
+        self.assertEqual((cpu.A_reg, cpu.X_reg), (0x03, 0x02))
+        self.assertEqual(Profiler.hottestOpcodes(2), [("JSR", 1, 6), ("LDA_IM", 3, 6)])
+        self.assertEqual(Profiler.hottestAddresses(1), [(0x0202, 1, 6)])
+        self.assertEqual(Profiler.PCCounts[0x0300], 1)
+        self.assertEqual(Profiler.collapsedStacks(), "$0200 8\n$0200;sub 6\n")
+        self.assertIn("JSR", Profiler.report())
+
+class TestDebug(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+        self.mem.load(0x0200, bytes([self.cpu.INS_LDA_IM, 0x80, self.cpu.INS_TAX_IMP, self.cpu.INS_STA_ZP, 0x10,
+                                     self.cpu.INS_LDY_ZP, 0x10, self.cpu.INS_LDA_IM, 0x00]))
+        self.cpu.PC = 0x0200
+        self.debugger = Computer.Debug.Debugger(self.cpu, self.mem)
+
+    def test_BREAKPOINT(self):
+        self.debugger.addBreakpoint(0x0202)
+        self.debugger.addBreakpoint(0x0205, condition="X == 0x80 and N")
+        self.debugger.addBreakpoint(0x0207, condition="A == 0x00")
+        Result = self.cpu.run_until(self.mem, cycles=100)
+        self.assertEqual((Result.reason, self.cpu.PC), ("breakpoint", 0x0202))
+        Result = self.cpu.run_until(self.mem, cycles=100)
+        self.assertEqual((Result.reason, Result.cycles, self.cpu.PC), ("breakpoint", 5, 0x0205))
+        self.assertEqual(self.debugger.Hit, ("breakpoint", 0x0205, 0x0205, None, None))
+        self.assertEqual(self.cpu.exec(self.mem, 5), 5)
+        self.assertEqual(self.cpu.A_reg, 0x00)
+        for Address in (0x0202, 0x0205, 0x0207):
+            self.debugger.removeBreakpoint(Address)
+        self.assertEqual(self.cpu.Hooks, [])
+
+    def test_WATCHPOINT(self):
+        self.debugger.addWatchpoint(0x0010, read=True, write=True, condition="value & 0x80")
+        Result = self.cpu.run_until(self.mem, cycles=100)
+        self.assertEqual((Result.reason, self.cpu.PC), ("watchpoint", 0x0205))
+        self.assertEqual(self.debugger.Hit, ("watchpoint", 0x0010, 0x0205, "write", 0x80))
+        self.assertEqual(self.mem.Data[0x10], 0x80)
+        Result = self.cpu.run_until(self.mem, cycles=100)
+        self.assertEqual((self.debugger.Hit.access, self.cpu.PC, self.cpu.Y_reg), ("read", 0x0207, 0x80))
+        self.debugger.removeWatchpoint(0x0010)
+        self.assertIsNone(self.mem.Pages[0x00])
+        self.assertEqual(self.cpu.Hooks, [])
+
+class TestAssembler(unittest.TestCase):
+
+    def test_ASSEMBLE_AND_RUN(self):
+        Program = Computer.Assembler.assemble("""
+            value = $42
+            start:  LDA #value      ; immediate
+                    STA $10
+                    LDX table+1
+                    LDY table,X
+                    LDA ($20),Y
+                    JSR done
+            done:   NOP
+            table:  .byte 1, 2, "AB"
+                    .word start
+        """, 0x0200)
+        cpu = Computer.Cpu.CPU()
+        self.assertEqual(Program.segments, ((0x0200, bytes([
+            cpu.INS_LDA_IM, 0x42, cpu.INS_STA_ZP, 0x10, cpu.INS_LDX_ABS, 0x12, 0x02, cpu.INS_LDY_ABSX, 0x11, 0x02,
+            cpu.INS_LDA_INDY, 0x20, cpu.INS_JSR, 0x0F, 0x02, cpu.INS_NOP, 0xEA, 0x01, 0x02, 0x41, 0x42, 0x00, 0x02])),))
+        self.assertEqual(Program.symbols, {"value": 0x42, "start": 0x0200, "done": 0x020F, "table": 0x0211})
+        mem = Computer.Memory.Mem()
+        cpu.reset(mem)
+        Program.load(mem)
+        cpu.PC = 0x0200
+        cpu.run_until(mem, pc=0x020F)
+        self.assertEqual((cpu.A_reg, cpu.X_reg, cpu.Y_reg, mem[0x10]), (0x00, 0x02, 0x41, 0x42))
+        with self.assertRaises(Computer.Assembler.AssemblyError):
+            Computer.Assembler.assemble("LDA #$100")
+
+    def test_ASSEMBLE_NOP_AND_RUN(self):
+        Program = Computer.Assembler.assemble("NOP\nLDA #$42\nLDX #$01", 0x0400)
+        self.assertEqual(Program.segments[0][1][:2], bytes([0xEA, 0xEA]))
+        mem = Computer.Memory.Mem()
+        cpu = Computer.Cpu.CPU()
+        cpu.reset(mem)
+        Program.load(mem)
+        cpu.PC = 0x0400
+        self.assertEqual(cpu.exec(mem, 6), 6)
+        self.assertEqual((cpu.A_reg, cpu.X_reg, cpu.PC), (0x42, 0x01, 0x0406))
+
+    def test_ASSEMBLE_CACHE(self):
+        with tempfile.TemporaryDirectory() as Dir:
+            def Write(Name, Text):
+                with open(os.path.join(Dir, Name), "w") as File:
+                    File.write(Text)
+            Write("defs.inc", "value = 1\n")
+            Write("a.s", '.include "defs.inc"\nLDA #value\n')
+            Write("b.s", "LDX #2\n")
+            Assembler = Computer.Assembler.Assembler(cache_dir=os.path.join(Dir, "cache"))
+            A, B = Assembler.assembleFile(os.path.join(Dir, "a.s")), Assembler.assembleFile(os.path.join(Dir, "b.s"))
+            self.assertIs(Assembler.assembleFile(os.path.join(Dir, "a.s")), A)
+            Write("defs.inc", "value = 3\n")
+            self.assertEqual(Assembler.assembleFile(os.path.join(Dir, "a.s")).segments[0][1], bytes([0xA9, 0x03]))
+            self.assertIs(Assembler.assembleFile(os.path.join(Dir, "b.s")), B)
+            Fresh = Computer.Assembler.Assembler(cache_dir=os.path.join(Dir, "cache"))
+            self.assertEqual(Fresh.assembleFile(os.path.join(Dir, "a.s")).segments[0][1], bytes([0xA9, 0x03]))
+            self.assertEqual(Fresh.Units, {})
+
+class TestDisassembler(unittest.TestCase):
+
+    def test_DISASSEMBLE_MEMORY(self):
+        Program = Computer.Assembler.assemble("LDA #$42\nSTA $10,X\nLDA ($20),Y\nJSR $1234\n.byte $02\nTAX", 0x0200)
+        mem = Computer.Memory.Mem()
+        Program.load(mem)
+        Lines = list(map(str, Computer.Disassembler.disassembleMemory(mem, 0x0200, 0x020B)))
+        self.assertEqual(Lines, ["0200  A9 42     LDA #$42", "0202  95 10     STA $10,X", "0204  B1 20     LDA ($20),Y",
+                                 "0206  20 34 12  JSR $1234", "0209  02        .byte $02", "020A  AA        TAX"])
+
+    def test_DISASSEMBLE_NOP(self):
+        mem = Computer.Memory.Mem()
+        mem.load(0x0200, bytes([0xEA, 0xA9, 0x42, 0xA2, 0x01]))
+        Lines = list(map(str, Computer.Disassembler.disassembleMemory(mem, 0x0200, 0x0205)))
+        self.assertEqual(Lines, ["0200  EA A9     NOP #$A9", "0202  42        .byte $42", "0203  A2 01     LDX #$01"])
+
+    def test_DISASSEMBLE_FILE_AND_TRACE(self):
+        cpu = Computer.Cpu.CPU()
+        with tempfile.TemporaryDirectory() as Dir:
+            Path = os.path.join(Dir, "test.rom")
+            with open(Path, "wb") as File:
+                File.write(bytes([0xFF, cpu.INS_LDX_ABSY, 0x00, 0xF0, cpu.INS_TXA_IMP]))
+            Lines = list(Computer.Disassembler.disassembleFile(Path, 0xF000, offset=1))
+            self.assertEqual([(Line.address, Line.mnemonic, Line.operand) for Line in Lines], [(0xF000, "LDX", "$F000,Y"), (0xF003, "TXA", "")])
+            mem = Computer.Memory.Mem()
+            cpu.reset(mem)
+            mem.load(0x0200, bytes([cpu.INS_LDA_IM, 0x01, cpu.INS_TAY_IMP]))
+            cpu.PC = 0x0200
+            Trace = Computer.Trace.Trace(path=os.path.join(Dir, "run.trace"))
+            Trace.attach(cpu)
+            cpu.exec(mem, 4)
+            Trace.close()
+            File = Computer.Trace.TraceFile(os.path.join(Dir, "run.trace"))
+            self.assertEqual([str(Line) for Line in Computer.Disassembler.disassembleTrace(File)], ["0200  A9        LDA #$??", "0202  A8        TAY"])
+            self.assertEqual(next(Computer.Disassembler.disassembleTrace(File, mem)).operand, "#$01")
+            File.close()
+            self.assertEqual(len(list(Computer.Disassembler.disassembleTrace(os.path.join(Dir, "run.trace"), mem))), 2)
+
+class TestPace(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+        self.mem.fill(0x0000, 0x10000, 0xA9) # LDA #$A9 everywhere, 2 cycles each
+        self.Time = 0.0
+        self.Sleeps = []
+
+    def Clock(self) -> float:
+        return self.Time
+
+    def Sleep(self, seconds: float):
+        self.Sleeps.append(seconds)
+        self.Time += seconds
+
+    def test_PACE_SLEEPS_TO_DEADLINES(self):
+        Pacer = Computer.Pace.Pacer(self.cpu, 1.0e6, 100, clock=self.Clock, sleep=self.Sleep)
+        Result = Pacer.run(self.mem, seconds=0.05)
+        self.assertEqual(Result.cycles, 50000)
+        self.assertEqual(len(self.Sleeps), 5)
+        self.assertAlmostEqual(self.Time, 0.05)
+        self.assertEqual((Result.lag, Result.late_frames, Result.dropped), (0.0, 0, 0.0))
+        Pacer.Frame = lambda cpu, memory: len(self.Sleeps) == 6
+        self.assertEqual(Pacer.run(self.mem).cycles, 20000)
+
+    def test_PACE_REPORTS_LAG(self):
+        def SlowFrame(cpu, memory):
+            self.Time += 0.015
+        Pacer = Computer.Pace.Pacer(self.cpu, 1.0e6, 100, max_lag=0.012, clock=self.Clock, sleep=self.Sleep)
+        Pacer.Frame = SlowFrame
+        Result = Pacer.run(self.mem, cycles=40000)
+        self.assertEqual(self.Sleeps, [])
+        self.assertEqual(Result.late_frames, 4)
+        self.assertAlmostEqual(Result.max_lag, 0.015)
+        self.assertAlmostEqual(Result.dropped, 0.015)
+        self.assertAlmostEqual(Result.lag, 0.005)
+        self.assertAlmostEqual(Pacer.Lag, 0.005)
+
+class TestAsync(unittest.TestCase):
+
+    def Machine(self, program: bytes) -> tuple:
+        mem = Computer.Memory.Mem()
+        cpu = Computer.Cpu.CPU()
+        cpu.reset(mem)
+        mem.fill(0x0000, 0x10000, cpu.INS_LDA_IM)
+        mem.load(0x0200, program)
+        cpu.PC = 0x0200
+        return cpu, mem
+
+    def test_ASYNC_INTERLEAVES_MACHINES(self):
+        Order = []
+        class Recorder:
+            def __init__(self, cpu, name):
+                self.CPU, self.Name = cpu, name
+            def exec(self, memory, cycles):
+                Order.append(self.Name)
+                return self.CPU.exec(memory, cycles)
+        Runners = []
+        for Name in "ab":
+            cpu, mem = self.Machine(b"")
+            Runners.append(Computer.Async.AsyncRunner(cpu, mem, quantum=1000, engine=Recorder(cpu, Name)))
+        Used = asyncio.run(Computer.Async.runAll(Runners, 3000))
+        self.assertEqual(Used, [3000, 3000])
+        self.assertEqual("".join(Order), "ababab")
+        self.assertEqual(Runners[0].CPU.PC, (0x0200 + 3000) & 0xFFFF)
+
+    def test_ASYNC_DEVICE_WAIT(self):
+        cpu = Computer.Cpu.CPU()
+        cpu, mem = self.Machine(bytes([cpu.INS_LDA_ABS, 0x00, 0xD0, cpu.INS_LDX_ABS, 0x00, 0xD0]))
+        Runner = Computer.Async.AsyncRunner(cpu, mem, quantum=100)
+        Buffer = []
+        async def Main():
+            Ready = asyncio.Event()
+            async def Input():
+                await Ready.wait()
+                Buffer.append(0x41)
+            def Read(address):
+                if not Buffer:
+                    Runner.wait(Input())
+                    return 0x00
+                return Buffer.pop()
+            mem.mapDevice(Computer.Memory.Device(0xD000, read=Read))
+            Task = asyncio.create_task(Runner.exec(8))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(cpu.PC, 0x0203)
+            Ready.set()
+            return await Task
+        self.assertEqual(asyncio.run(Main()), 8)
+        self.assertEqual((cpu.A_reg, cpu.X_reg, cpu.PC), (0x00, 0x41, 0x0206))
+
+class TestTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.mem = Computer.Memory.Mem()
+        self.cpu = Computer.Cpu.CPU()
+        self.cpu.reset(self.mem)
+        self.mem.fill(0x0000, 0x10000, self.cpu.INS_LDA_IM)
+        self.cpu.PC, self.cpu.SP = 0x0200, 0xFF
+
+    def test_EVENTS_FIRE_ON_TIME(self):
+        Fired = []
+        self.cpu.Timeline.after(75, lambda cycle: Fired.append(("late", cycle, self.cpu.cycle())))
+        self.cpu.Timeline.after(50, lambda cycle: Fired.append(("early", cycle, self.cpu.cycle())))
+        Cancelled = self.cpu.Timeline.after(60, lambda cycle: Fired.append(("cancelled", cycle)))
+        self.cpu.Timeline.cancel(Cancelled)
+        self.assertEqual(self.cpu.exec(self.mem, 70), 70)
+        self.assertEqual(Fired, [("early", 50, 50)])
+        self.assertEqual((len(self.cpu.Timeline), self.cpu.Timeline.Next), (1, 75))
+        self.cpu.exec(self.mem, 10)
+        self.assertEqual(Fired[1], ("late", 75, 76))
+        self.assertEqual((self.cpu.cycle(), len(self.cpu.Timeline)), (80, 0))
+
+    def test_TIMER_IRQ(self):
+        Computer.Assembler.assemble("""
+            .org $0200
+            CLI
+            .org $0300
+            INX
+            STA $D000           ; acknowledge, the device releases IRQ
+            RTI
+            .org $FFFE
+            .word $0300
+        """).load(self.mem)
+        self.mem.mapDevice(Computer.Memory.Device(0xD000, write=lambda address, value: self.cpu.irq(False)))
+        self.cpu.Timeline.every(100, lambda cycle: self.cpu.irq())
+        self.assertEqual(self.cpu.exec(self.mem, 1000), 1001)
+        self.assertEqual((self.cpu.X_reg, self.cpu.I_flag, self.cpu.IRQLines), (9, 0, 0))
+        self.cpu.I_flag = 1
+        self.cpu.exec(self.mem, 1000)
+        self.assertEqual((self.cpu.X_reg, self.cpu.IRQLines), (9, 1))
+
+    def test_BRK_AND_NMI(self):
+        Computer.Assembler.assemble("""
+            .org $0200
+            BRK
+            .byte $EA
+            LDA #$01
+            .org $0300
+            RTI
+            .org $0310
+            LDY #$55
+            RTI
+            .org $FFFA
+            .word $0310
+            .word $0000
+            .word $0300
+        """).load(self.mem)
+        self.cpu.I_flag = 1
+        self.assertEqual(self.cpu.exec(self.mem, 15), 15)
+        self.assertEqual((self.cpu.A_reg, self.cpu.PC, self.cpu.I_flag), (0x01, 0x0204, 1))
+        self.assertEqual(self.mem.dump(0x01FD, 0x0200), bytes([0b00110100, 0x02, 0x02]))
+        self.cpu.Timeline.after(3, lambda cycle: self.cpu.nmi())
+        self.assertEqual(self.cpu.exec(self.mem, 17), 19)
+        self.assertEqual((self.cpu.Y_reg, self.cpu.PC), (0x55, 0x0208))
+
+class TestIdle(unittest.TestCase):
+
+    def setUp(self):
+        self.machine = MACHINES.acquire()
+        self.cpu, self.mem = self.machine
+        self.cpu.PC, self.cpu.SP = 0x0200, 0xFF
+
+    def tearDown(self):
+        MACHINES.release(self.machine)
+
+    def NextMachine(self):
+        """Swap the test's machine for one back at the baseline."""
+        self.tearDown()
+        self.setUp()
+
+    def test_BRANCHES_AND_JMP(self):
+        Computer.Assembler.assemble("""
+            .org $02F8
+            LDA #$00
+            BNE next            ; not taken
+            BEQ next            ; taken, to the next page
+            .org $0300
+            next: JMP ($03FF)   ; the high byte comes from $0300
+            .org $03FF
+            .byte $10
+        """).load(self.mem)
+        self.cpu.PC = 0x02F8
+        self.assertEqual(self.cpu.exec(self.mem, 2 + 2 + 4 + 5), 13)
+        self.assertEqual(self.cpu.PC, 0x6C10)
+        Lines = list(map(str, Computer.Disassembler.disassembleMemory(self.mem, 0x02FA, 0x02FE)))
+        self.assertEqual(Lines, ["02FA  D0 04     BNE $0300", "02FC  F0 02     BEQ $0300"])
+        with self.assertRaises(Computer.Assembler.AssemblyError):
+            Computer.Assembler.assemble("BNE $0100", 0x0200)
+
+    def test_IDLE_LOOP_FAST_FORWARD(self):
+        Source = """
+            .org $0200
+            wait: LDA $10
+            BEQ wait
+            INC $11
+            LDA #$00
+            STA $10
+            JMP wait
+            nmi: INC $10        ; the NMI handler sets the flag the main loop polls
+            RTI
+            .org $FFFA
+            .word nmi
+        """
+        Results = []
+        for FastForward in (False, True):
+            self.NextMachine()
+            Computer.Assembler.assemble(Source).load(self.mem)
+            self.cpu.FastForward = FastForward
+            self.cpu.Timeline.every(1000, lambda cycle: self.cpu.nmi())
+            Used = self.cpu.exec(self.mem, 20000)
+            Results.append((Used, self.cpu.PC, self.cpu.A_reg, self.cpu.P_status, self.cpu.cycle(), self.mem.dump()))
+        self.assertEqual(Results[0], Results[1])
+        self.assertEqual(self.mem[0x11], 19)
+        self.assertGreater(self.cpu.IdleCycles, 18000)
+
+    def test_IDLE_LOOP_BUDGET(self):
+        Source = """
+            .org $0200
+            wait: LDA $10
+            AND #$01
+            TAX
+            BEQ wait
+        """
+        for Cycles in range(1, 120):
+            Results = []
+            for FastForward in (False, True):
+                self.NextMachine()
+                Computer.Assembler.assemble(Source).load(self.mem)
+                self.cpu.FastForward = FastForward
+                Used = self.cpu.exec(self.mem, Cycles)
+                Results.append((Used, self.cpu.PC, self.cpu.A_reg, self.cpu.X_reg, self.cpu.P_status, self.cpu.cycle()))
+            self.assertEqual(Results[0], Results[1], Cycles)
+        self.assertGreater(self.cpu.IdleCycles, 0)
+
+    def test_IDLE_LOOP_POLLING_DEVICE(self):
+        Reads = []
+        self.mem.mapDevice(Computer.Memory.Device(0xD000, read=lambda address: Reads.append(address) or 0))
+        Computer.Assembler.assemble("wait: LDA $D000\nBEQ wait", 0x0200).load(self.mem)
+        self.assertEqual(self.cpu.exec(self.mem, 700), 700)
+        self.assertEqual((len(Reads), self.cpu.IdleCycles), (100, 0))
+        Computer.Assembler.assemble("JMP *", 0x0200).load(self.mem)
+        self.cpu.PC = 0x0200
+        self.cpu.exec(self.mem, 3000)
+        self.assertEqual((self.cpu.PC, self.cpu.cycle() - 700), (0x0200, 3000))
+        self.assertGreater(self.cpu.IdleCycles, 2900)
+
+    def test_IDLE_LOOP_INDEX_CHANGES(self):
+        Reads = []
+        self.mem.mapDevice(Computer.Memory.Device(0xD000, read=lambda address: Reads.append(address) or 0))
+        # X is 0 at the jump, but 1 when the loop reads $CFFF,X: every iteration reads the device
+        Computer.Assembler.assemble("wait: INX\nLDA $CFFF,X\nDEX\nJMP wait", 0x0200).load(self.mem)
+        self.assertEqual(self.cpu.exec(self.mem, 3000), 3000)
+        self.assertEqual((len(Reads), self.cpu.IdleCycles), (250, 0))
+
+class TestPool(unittest.TestCase):
+
+    def test_RESET_IN_PLACE(self):
+        def Setup(cpu, mem):
+            mem.load(0x0200, bytes([cpu.INS_LDA_IM, 0x42, cpu.INS_STA_ABS, 0x00, 0x30, cpu.INS_INC_ZP, 0x10]))
+            cpu.PC, cpu.SP = 0x0200, 0xFF
+        Pool = Computer.Pool.MachinePool(Setup, size=1)
+        with Pool.machine() as (cpu, mem):
+            Data = mem.Data
+            self.assertEqual(cpu.exec(mem, 11), 11)
+            self.assertEqual((mem[0x3000], mem[0x10], cpu.A_reg), (0x42, 0x01, 0x42))
+            cpu.Timeline.after(100, lambda cycle: None)
+            cpu.irq()
+            mem.mapDevice(Computer.Memory.Device(0xD000))
+            cpu.FastForward, cpu.Predecode = False, True
+            self.assertEqual(bytes(mem.DirtyPages[:0x31]).count(1), 2)
+        self.assertEqual((len(Pool), Pool.Created), (1, 1))
+        with Pool.machine() as (cpu, mem):
+            self.assertIs(mem.Data, Data)
+            self.assertEqual((mem[0x3000], mem[0x10], mem[0x0200], cpu.PC, cpu.SP, cpu.A_reg), (0x00, 0x00, 0xA9, 0x0200, 0xFF, 0x00))
+            self.assertEqual((cpu.cycle(), len(cpu.Timeline), cpu.IRQLines, mem.Pages[0xD0]), (0, 0, 0, None))
+            self.assertEqual((cpu.FastForward, cpu.Predecode), (True, False))
+            self.assertEqual(cpu.exec(mem, 11), 11)
+        self.assertEqual(Pool.acquire().Jobs, 3)
+        with Computer.Pool.MachinePool(predecode=True).machine() as (cpu, mem):
+            cpu.Predecode = False
+        self.assertTrue(cpu.Predecode)
+
+    def test_REVERT_AFTER_SNAPSHOT(self):
+        Machine = Computer.Pool.MachinePool().acquire()
+        cpu, mem = Machine
+        mem[0x1234] = 0x01
+        Snapshot = cpu.snapshot(mem)
+        mem[0x4321] = 0x02
+        Machine.reset()
+        self.assertEqual((mem[0x1234], mem[0x4321]), (0x00, 0x00))
+        cpu.restore(mem, Snapshot)
+        self.assertEqual(mem[0x1234], 0x01)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)